@@ -0,0 +1,159 @@
+"""
+This script demonstrates how to fetch several hardware metrics of a ProActive node in a single REST round trip. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway and retrieval of the monitoring client.
+- Definition of a `get_metrics()` helper that accepts any mix of `CPUMetric` and `MemoryMetric` values and queries all the underlying MBeans at once through an object name pattern, instead of issuing one `get_cpu_metrics()` or `get_memory_metrics()` call per metric.
+- Retrieval and display of a full current CPU and memory snapshot (9 metrics) with a single call.
+- Retrieval of the historical CPU and memory series for the last 5 minutes with a single call.
+- A small benchmark comparing the per-metric approach used by demo_hardware_metrics.py (9 round trips per sample) with the batched approach (1 round trip per sample).
+- Implementation of proper error handling and gateway connection management.
+
+This script is useful for tools that sample node metrics frequently, where the number of REST round trips dominates the cost of each sample.
+"""
+
+import os
+import json
+import time
+import urllib3
+import requests
+import humanize
+
+from proactive import getProActiveGateway
+from proactive.monitoring.ProactiveNodeMBeanClient import TimeRange, CPUMetric, MemoryMetric, MBeanObjectNames
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Object name pattern matching both the sigar:Type=CpuUsage and sigar:Type=Mem MBeans
+SIGAR_MBEANS_PATTERN = "sigar:Type=*"
+
+# Number of samples taken by the benchmark
+BENCHMARK_SAMPLES = 5
+
+# Helper function to format bytes to human readable format
+def format_bytes(bytes_value):
+    """Format bytes to human readable format"""
+    return humanize.naturalsize(bytes_value, binary=True)
+
+def get_metric_source(metric):
+    """Return the MBean name, the historical key suffix and the scale factor of a metric."""
+    if isinstance(metric, CPUMetric):
+        return MBeanObjectNames.CPU_USAGE, "CpuUsage", 100
+    if isinstance(metric, MemoryMetric):
+        return MBeanObjectNames.MEMORY_USAGE, "Mem", 1
+    raise ValueError(f"Unsupported metric: {metric}")
+
+def get_metrics(monitoring_client, metrics, historical=False, time_range=TimeRange.MINUTE_5):
+    """
+    Get several CPU and memory metrics of the current node with a single REST request.
+
+    Args:
+        monitoring_client: The monitoring client returned by gateway.getProactiveMonitoringClient()
+        metrics (list): CPUMetric and/or MemoryMetric values to collect
+        historical (bool): Return the historical series instead of the current values
+        time_range (TimeRange): Time range of the historical series
+
+    Returns:
+        dict: Maps each requested metric to its current value (float), or to its
+        historical series (list of floats) when historical is True. Metrics missing
+        from the response are set to 0.0 (or to an empty list).
+    """
+    gateway = monitoring_client.gateway
+    endpoint = "/rm/node/mbeans/history" if historical else "/rm/node/mbeans"
+    params = {
+        "nodejmxurl": monitoring_client.node_url,
+        "objectname": SIGAR_MBEANS_PATTERN,
+        "attrs": ",".join(sorted({metric.value for metric in metrics}))
+    }
+    if historical:
+        params["range"] = time_range.value
+
+    response = requests.get(
+        f"{gateway.getBaseURL()}/rest{endpoint}",
+        headers={"sessionid": gateway.getSession()},
+        params=params,
+        verify=False
+    )
+    response.raise_for_status()
+    response = response.json()
+
+    results = {}
+    for metric in metrics:
+        mbean_name, key_suffix, scale = get_metric_source(metric)
+        data = response.get(mbean_name)
+        if historical:
+            # The history of each MBean is returned as a JSON document keyed by <attribute><type>
+            series = json.loads(data).get(f"{metric.value}{key_suffix}", []) if data else []
+            results[metric] = [float(value) * scale for value in series]
+        else:
+            values = {item['name']: item['value'] for item in data} if isinstance(data, list) else {}
+            results[metric] = float(values.get(metric.value, 0.0)) * scale
+    return results
+
+# Metrics of a full monitoring sample, as displayed by demo_hardware_metrics.py
+CPU_METRICS = [CPUMetric.COMBINED, CPUMetric.USER, CPUMetric.SYSTEM, CPUMetric.IDLE, CPUMetric.WAIT]
+MEMORY_METRICS = [MemoryMetric.USED_PERCENT, MemoryMetric.TOTAL, MemoryMetric.ACTUAL_USED, MemoryMetric.ACTUAL_FREE]
+
+# Initialize gateway and client
+gateway = getProActiveGateway()
+monitoring_client = gateway.getProactiveMonitoringClient()
+
+print("\nCurrent ProActive JMX URL:")
+print(f"JMX URL: {monitoring_client.node_url}")
+
+try:
+    # Get the full current sample in one round trip
+    print("\nCurrent Hardware Metrics (1 request):")
+    print("-" * 40)
+    sample = get_metrics(monitoring_client, CPU_METRICS + MEMORY_METRICS)
+    print(f"Combined CPU.... {sample[CPUMetric.COMBINED]:.1f}%")
+    print(f"User CPU........ {sample[CPUMetric.USER]:.1f}%")
+    print(f"System CPU...... {sample[CPUMetric.SYSTEM]:.1f}%")
+    print(f"Idle CPU........ {sample[CPUMetric.IDLE]:.1f}%")
+    print(f"Wait CPU........ {sample[CPUMetric.WAIT]:.1f}%")
+    print(f"Memory Usage.... {sample[MemoryMetric.USED_PERCENT]:.1f}%")
+    print(f"Total Memory.... {format_bytes(sample[MemoryMetric.TOTAL])}")
+    print(f"Used Memory..... {format_bytes(sample[MemoryMetric.ACTUAL_USED])}")
+    print(f"Free Memory..... {format_bytes(sample[MemoryMetric.ACTUAL_FREE])}")
+
+    # Get the historical CPU and memory series in one round trip
+    print("\nHistorical Usage (last 5 minutes, 1 request):")
+    print("-" * 40)
+    history = get_metrics(
+        monitoring_client,
+        [CPUMetric.COMBINED, MemoryMetric.USED_PERCENT],
+        historical=True,
+        time_range=TimeRange.MINUTE_5
+    )
+    for label, metric in [("CPU", CPUMetric.COMBINED), ("Memory", MemoryMetric.USED_PERCENT)]:
+        values = [v for v in history[metric] if v > 0]  # Filter out zero values
+        if values:
+            print(f"{label} Usage: avg {sum(values) / len(values):.1f}%, peak {max(values):.1f}%, min {min(values):.1f}%")
+
+    # Benchmark the per-metric approach against the batched one
+    print(f"\nBenchmark ({BENCHMARK_SAMPLES} samples of {len(CPU_METRICS) + len(MEMORY_METRICS)} metrics):")
+    print("-" * 40)
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_SAMPLES):
+        for metric in CPU_METRICS:
+            monitoring_client.get_cpu_metrics(metric)
+        for metric in MEMORY_METRICS:
+            monitoring_client.get_memory_metrics(metric)
+    per_metric_ms = (time.perf_counter() - start) * 1000 / BENCHMARK_SAMPLES
+
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_SAMPLES):
+        get_metrics(monitoring_client, CPU_METRICS + MEMORY_METRICS)
+    batched_ms = (time.perf_counter() - start) * 1000 / BENCHMARK_SAMPLES
+
+    print(f"Per-metric calls... {len(CPU_METRICS) + len(MEMORY_METRICS)} requests/sample, {per_metric_ms:.1f} ms/sample")
+    print(f"Batched call....... 1 request/sample, {batched_ms:.1f} ms/sample")
+    if batched_ms > 0:
+        print(f"Speedup............ x{per_metric_ms / batched_ms:.1f}")
+
+except Exception as e:
+    print(f"\nError during monitoring: {str(e)}")
+finally:
+    gateway.close()
+    print("\nDisconnected and finished.")
@@ -0,0 +1,225 @@
+"""
+This script demonstrates how to sample hardware metrics of every node of a ProActive cluster concurrently and store them in a bounded time-series store. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway and discovery of all nodes with `list_proactive_jmx_urls()`.
+- Concurrent polling of all nodes through a thread pool, each node being sampled with a single REST request for all its CPU and memory metrics, instead of reading one `monitoring_client.node_url` at a time.
+- Storage of the samples and of their timestamps in a fixed-size, memory-mapped ring buffer holding one series per node and metric, in a new temporary directory for each run. The file sizes are fixed when the store is created, so memory usage stays bounded however long the sampler runs.
+- Computation of cluster-wide aggregates (average and peak CPU, average memory usage, number of responding nodes) over the most recent samples.
+- Implementation of proper error handling and gateway connection management.
+
+Nodes that do not answer within one sampling interval are recorded as missing (NaN) for that tick, so a slow node never delays the sampling of the rest of the cluster. Requests that have not started by then are cancelled, and a node whose previous request is still in flight is not sampled again until it answers, so slow nodes cannot pile up requests in the thread pool.
+
+This script requires NumPy on the client side (`python3 -m pip install numpy`).
+"""
+
+import os
+import time
+import logging
+import tempfile
+import urllib3
+import requests
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from proactive import getProActiveGateway
+from proactive.monitoring.ProactiveNodeMBeanClient import CPUMetric, MemoryMetric, MBeanObjectNames
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_cluster_metrics_sampler")
+
+# Sampling configuration
+SAMPLING_INTERVAL = 1.0      # seconds between two samples of the cluster
+SAMPLING_DURATION = 30       # seconds the demo runs the sampler
+RING_CAPACITY = 3600         # samples kept per node and metric (1 hour at 1 s resolution)
+MAX_WORKERS = 64             # concurrent REST requests
+AGGREGATE_WINDOW = 10        # samples used to compute the cluster aggregates
+
+# Metrics collected on every node: (metric, MBean name, scale factor)
+SAMPLED_METRICS = [
+    (CPUMetric.COMBINED, MBeanObjectNames.CPU_USAGE, 100),
+    (MemoryMetric.USED_PERCENT, MBeanObjectNames.MEMORY_USAGE, 1),
+]
+
+class RingBufferStore:
+    """
+    Fixed-size time-series store backed by memory-mapped files.
+
+    Samples are stored in a float32 array of shape (nodes, metrics, capacity) in
+    "values.dat", and the timestamps of the sampling ticks in a float64 array of shape
+    (capacity,) in "timestamps.dat", both in the given directory. Once the capacity is
+    reached, the oldest tick is overwritten.
+    """
+
+    def __init__(self, directory, node_urls, metrics, capacity):
+        self.directory = directory
+        self.node_urls = list(node_urls)
+        self.metrics = list(metrics)
+        self.capacity = capacity
+        self.values = np.memmap(os.path.join(directory, "values.dat"), dtype=np.float32, mode="w+",
+                                shape=(len(self.node_urls), len(self.metrics), capacity))
+        self.values[:] = np.nan
+        self.timestamps = np.memmap(os.path.join(directory, "timestamps.dat"), dtype=np.float64, mode="w+",
+                                    shape=(capacity,))
+        self.timestamps[:] = np.nan
+        self.count = 0
+
+    def nbytes(self):
+        """Return the size of the store in bytes."""
+        return self.values.nbytes + self.timestamps.nbytes
+
+    def append(self, timestamp, sample):
+        """Append one tick, sample being an array of shape (nodes, metrics)."""
+        index = self.count % self.capacity
+        self.values[:, :, index] = sample
+        self.timestamps[index] = timestamp
+        self.count += 1
+
+    def window(self, n):
+        """Return the timestamps and values of the last n ticks, oldest first."""
+        n = min(n, self.count, self.capacity)
+        indices = (np.arange(self.count - n, self.count)) % self.capacity
+        return self.timestamps[indices], self.values[:, :, indices]
+
+    def series(self, node_url, metric, n=None):
+        """Return the last n samples of one node and metric, oldest first."""
+        _, values = self.window(n or self.capacity)
+        return values[self.node_urls.index(node_url), self.metrics.index(metric)]
+
+    def cluster_aggregates(self, n):
+        """Compute cluster-wide aggregates over the last n ticks."""
+        _, values = self.window(n)
+        if values.shape[2] == 0:
+            return None
+        latest = values[:, :, -1]
+        with np.errstate(all="ignore"):
+            cpu = values[:, self.metrics.index(CPUMetric.COMBINED), :]
+            mem = values[:, self.metrics.index(MemoryMetric.USED_PERCENT), :]
+            return {
+                "nodes_responding": int(np.count_nonzero(~np.isnan(latest).any(axis=1))),
+                "cpu_avg": float(np.nanmean(cpu)) if np.isfinite(cpu).any() else 0.0,
+                "cpu_peak": float(np.nanmax(cpu)) if np.isfinite(cpu).any() else 0.0,
+                "mem_avg": float(np.nanmean(mem)) if np.isfinite(mem).any() else 0.0,
+            }
+
+def sample_node(session, gateway, node_url):
+    """Read all the sampled metrics of one node with a single REST request."""
+    response = session.get(
+        f"{gateway.getBaseURL()}/rest/rm/node/mbeans",
+        headers={"sessionid": gateway.getSession()},
+        params={
+            "nodejmxurl": node_url,
+            "objectname": "sigar:Type=*",
+            "attrs": ",".join(metric.value for metric, _, _ in SAMPLED_METRICS),
+        },
+        verify=False,
+        timeout=SAMPLING_INTERVAL
+    )
+    response.raise_for_status()
+    response = response.json()
+    sample = np.full(len(SAMPLED_METRICS), np.nan, dtype=np.float32)
+    for i, (metric, mbean_name, scale) in enumerate(SAMPLED_METRICS):
+        data = response.get(mbean_name)
+        if isinstance(data, list):
+            for item in data:
+                if item['name'] == metric.value:
+                    sample[i] = item['value'] * scale
+    return sample
+
+def run_sampler(gateway, store, duration):
+    """
+    Sample all nodes of the store every SAMPLING_INTERVAL seconds during duration seconds.
+
+    The requests not started at the end of a tick are cancelled. A node whose request is still
+    running is skipped (recorded as missing) until that request returns.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Requests of previous ticks still running, by node index
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        next_tick = time.monotonic()
+        end = next_tick + duration
+        while next_tick < end:
+            timestamp = time.time()
+            futures = {}
+            for i, url in enumerate(store.node_urls):
+                if i not in in_flight:
+                    futures[i] = executor.submit(sample_node, session, gateway, url)
+            wait(futures.values(), timeout=SAMPLING_INTERVAL)
+
+            sample = np.full((len(store.node_urls), len(store.metrics)), np.nan, dtype=np.float32)
+            for i, future in futures.items():
+                if not future.done() and not future.cancel():
+                    in_flight[i] = future
+                elif not future.cancelled() and future.exception() is None:
+                    sample[i] = future.result()
+            for i, future in list(in_flight.items()):
+                if future.done():
+                    del in_flight[i]
+            store.append(timestamp, sample)
+
+            if store.count % AGGREGATE_WINDOW == 0:
+                aggregates = store.cluster_aggregates(AGGREGATE_WINDOW)
+                logger.info(f"Nodes: {aggregates['nodes_responding']}/{len(store.node_urls)}, "
+                            f"CPU avg: {aggregates['cpu_avg']:.1f}%, CPU peak: {aggregates['cpu_peak']:.1f}%, "
+                            f"RAM avg: {aggregates['mem_avg']:.1f}%")
+
+            next_tick += SAMPLING_INTERVAL
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+        for future in in_flight.values():
+            future.cancel()
+    session.close()
+
+# Initialize gateway and client
+gateway = getProActiveGateway()
+monitoring_client = gateway.getProactiveMonitoringClient()
+
+try:
+    # Discover all the nodes of the cluster
+    nodes_info = monitoring_client.list_proactive_jmx_urls()
+    if not nodes_info:
+        raise RuntimeError("No ProActive node was found.")
+    node_urls = sorted({node['proactiveJMXUrl'] for node in nodes_info})
+    print(f"\nSampling {len(node_urls)} node(s) every {SAMPLING_INTERVAL:.0f}s for {SAMPLING_DURATION}s:")
+    for node in nodes_info:
+        print(f"JMX URL: {node['proactiveJMXUrl']}, Node Source: {node['nodeSource']}, Host Name: {node['hostName']}")
+
+    # Create the ring buffer store
+    store_path = tempfile.mkdtemp(prefix="proactive_cluster_metrics_")
+    store = RingBufferStore(store_path, node_urls, [metric for metric, _, _ in SAMPLED_METRICS], RING_CAPACITY)
+    print(f"\nRing buffer: {store_path} ({store.nbytes() / 1024:.1f} KiB, {RING_CAPACITY} samples per node and metric)")
+
+    # Run the sampler
+    run_sampler(gateway, store, SAMPLING_DURATION)
+
+    # Display the per-node and cluster-wide results
+    print(f"\nPer-node usage (last {store.count} samples):")
+    print("-" * 40)
+    for node_url in node_urls:
+        with np.errstate(all="ignore"):
+            cpu = store.series(node_url, CPUMetric.COMBINED, store.count)
+            mem = store.series(node_url, MemoryMetric.USED_PERCENT, store.count)
+            missing = int(np.count_nonzero(np.isnan(cpu)))
+            cpu_avg = np.nanmean(cpu) if missing < len(cpu) else 0.0
+            mem_avg = np.nanmean(mem) if missing < len(mem) else 0.0
+        print(f"{node_url}: CPU avg {cpu_avg:.1f}%, RAM avg {mem_avg:.1f}%, missing samples: {missing}")
+
+    aggregates = store.cluster_aggregates(store.count)
+    print("\nCluster Aggregates:")
+    print("-" * 40)
+    print(f"Average CPU Usage.. {aggregates['cpu_avg']:.1f}%")
+    print(f"Peak CPU Usage..... {aggregates['cpu_peak']:.1f}%")
+    print(f"Average RAM Usage.. {aggregates['mem_avg']:.1f}%")
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway.close()
+    print("\nDisconnected and finished.")
@@ -0,0 +1,139 @@
+"""
+This script demonstrates how to compress the files transferred with the data spaces and the large job variables adaptively with zstd or lz4, instead of the hand-written `bz2.compress()` of a JSON frame in notebooks/02_ML_Example.ipynb. The workflow includes:
+
+1. A local benchmark of bz2, lz4, zstd at several levels and of the `AdaptiveCompressor` of the 'demo_compression' module for several link throughputs, on a JSON frame, a CSV file, a float array and random (incompressible) data. It reports the CPU time spent compressing and decompressing, the bytes saved, the bytes saved per CPU second and the estimated time to compress and send each payload.
+2. Initialization of the ProActive gateway.
+3. Upload of the JSON frame to the user space with `CompressedDataSpace.upload()`, which measures the link throughput and uses it for the next uploads, and comparison with an uncompressed upload.
+4. Creation of a job whose Python task reads:
+   - a job variable holding a JSON frame compressed with `compress_variable()`, decoded with `decompress_variable()`;
+   - the compressed file uploaded at step 3, pulled with `userspaceapi.pullFile()` and decoded with `decompress_file()`.
+   The codecs are restricted with `negotiate()` to TASK_CODECS, the codecs known to be installed in the virtual environment of the task: this list is not exchanged with the task, and must match its environment.
+5. Submission of the job, retrieval of its output, and removal of the uploaded file.
+6. Disconnection from the gateway.
+"""
+import bz2
+import time
+import numpy as np
+import pandas as pd
+
+from proactive import getProActiveGateway
+from demo_compression.compression import (AdaptiveCompressor, CompressedDataSpace, LinkEstimator, CODEC_NAMES,
+                                          compress_variable, decompress, frame_codec, negotiate)
+
+# Number of rows of the benchmark payloads
+ROWS = 200_000
+
+# Link throughputs of the adaptive benchmark (in bytes per second)
+LINK_THROUGHPUTS = [10 * 2 ** 20, 100 * 2 ** 20, 1000 * 2 ** 20]
+
+# Codecs installed in the virtual environment of the task
+TASK_CODECS = ["lz4", "zstd"]
+
+DATASPACE_PATH = "demo_compression/frame.json"
+
+def benchmark_payloads():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "id": np.arange(ROWS),
+        "value": rng.random(ROWS).round(6),
+        "label": rng.choice(["low", "medium", "high"], ROWS),
+    })
+    return {
+        "JSON frame": frame.to_json(orient="split").encode(),
+        "CSV": frame.to_csv(index=False).encode(),
+        "float array": rng.normal(size=ROWS).tobytes(),
+        "random": rng.bytes(4 * 2 ** 20),
+    }
+
+def measure(data, compress, decompress_function):
+    start = time.process_time()
+    compressed = compress(data)
+    compress_time = time.process_time() - start
+    start = time.process_time()
+    restored = decompress_function(compressed)
+    decompress_time = time.process_time() - start
+    assert restored == data
+    return len(compressed), compress_time, decompress_time
+
+def print_row(label, size, compressed_size, compress_time, decompress_time, link):
+    saved = size - compressed_size
+    transfer = compress_time + compressed_size / link
+    print(f"  {label:<26} {compressed_size / 2 ** 20:8.2f} MB {saved / 2 ** 20:8.2f} MB "
+          f"{compress_time * 1000:8.1f} ms {decompress_time * 1000:8.1f} ms "
+          f"{saved / 2 ** 20 / max(compress_time, 1e-6):9.1f} MB/s {transfer:8.3f} s")
+
+def run_benchmark():
+    link = LINK_THROUGHPUTS[1]
+    for name, data in benchmark_payloads().items():
+        print(f"\n{name} ({len(data) / 2 ** 20:.2f} MB), transfer time at {link / 2 ** 20:.0f} MB/s:")
+        print(f"  {'Codec':<26} {'Sent':>11} {'Saved':>11} {'Compress':>11} {'Decompress':>11} "
+              f"{'Saved/CPU':>14} {'Transfer':>10}")
+        print_row("none", len(data), len(data), 0.0, 0.0, link)
+        print_row("bz2", len(data), *measure(data, bz2.compress, bz2.decompress), link)
+        for codec, level in negotiate(TASK_CODECS):
+            label = f"{CODEC_NAMES[codec]} {level}" if level else CODEC_NAMES[codec]
+            compress = lambda data, choice=(codec, level): AdaptiveCompressor().compress(data, choice)
+            print_row(label, len(data), *measure(data, compress, decompress), link)
+        for throughput in LINK_THROUGHPUTS:
+            compressor = AdaptiveCompressor(LinkEstimator(throughput), negotiate(TASK_CODECS))
+            size, compress_time, decompress_time = measure(data, compressor.compress, decompress)
+            label = f"adaptive {throughput / 2 ** 20:.0f} MB/s: {frame_codec(compressor.compress(data))}"
+            print_row(label, len(data), size, compress_time, decompress_time, throughput)
+
+# Local benchmark of the codecs
+run_benchmark()
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    payloads = benchmark_payloads()
+    dataspace = CompressedDataSpace(gateway, compressor=AdaptiveCompressor(candidates=negotiate(TASK_CODECS)))
+
+    print("\nUploads of the JSON frame to the user space:")
+    print("-" * 80)
+    raw = CompressedDataSpace(gateway, compressor=AdaptiveCompressor(candidates=[]))
+    for label, transfer in [("Uncompressed", raw), ("Adaptive, first upload", dataspace),
+                            ("Adaptive, measured link", dataspace)]:
+        result = transfer.upload(payloads["JSON frame"], DATASPACE_PATH)
+        print(f"{label:<26} {result['codec']:<5} {result['sent'] / 2 ** 20:8.2f} MB sent in {result['seconds']:6.2f} s, "
+              f"{result['cpu_seconds'] * 1000:6.1f} ms of CPU, link {transfer.compressor.link.throughput / 2 ** 20:8.1f} MB/s")
+
+    print("\nCreating a proactive job...")
+    job = gateway.createJob("demo_compression_job")
+    variable = compress_variable(payloads["JSON frame"], dataspace.compressor)
+    print(f"Job variable: {len(payloads['JSON frame'])} bytes compressed into {len(variable)} characters")
+    job.addVariable("DATAFRAME_JSON", variable)
+
+    task = gateway.createPythonTask("Decompress")
+    task.setTaskImplementation(f"""
+import io, os, sys
+sys.path.append(os.getcwd())
+import pandas as pd
+from demo_compression.compression import available_codecs, decompress_variable, decompress_file
+
+print("Codecs:", available_codecs())
+frame = pd.read_json(io.StringIO(decompress_variable(variables.get("DATAFRAME_JSON"))), orient="split")
+print("Frame from the job variable:", frame.shape)
+
+userspaceapi.connect()
+local_path = os.path.join(os.getcwd(), "frame.json")
+userspaceapi.pullFile("{DATASPACE_PATH}", gateway.jvm.java.io.File(local_path))
+with open(decompress_file(local_path)) as f:
+    print("Frame from the user space:", pd.read_json(f, orient="split").shape)
+""")
+    task.addInputFile('demo_compression/**')
+    task.setVirtualEnv(requirements=['pandas', 'zstandard', 'lz4'])
+    job.addTask(task)
+
+    print("Submitting the job to the proactive scheduler...")
+    job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+    print("job_id: " + str(job_id))
+    print(gateway.getJobOutput(job_id))
+    dataspace.delete(DATASPACE_PATH)
+
+except Exception as e:
+    print(f"Error during the compression demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
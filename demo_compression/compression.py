@@ -0,0 +1,272 @@
+# compression.py
+"""
+Adaptive zstd/lz4 compression of the files transferred with the data spaces and of large job variables.
+
+Data is split into blocks, and each block is stored with the codec chosen for it, or raw when it
+does not compress. The codec and its level are chosen from a sample of the data: the compression
+speed and ratio of each candidate are measured on the sample, and the candidate which minimizes
+the time to compress and send the data over a link of the measured throughput is used. A fast
+link favours lz4 or no compression, a slow link the higher zstd levels.
+
+The frames are self-describing, so the readers only need the codecs the writer used. A writer
+restricts its candidates to the codecs accepted by the reader with negotiate(). Nothing is
+exchanged with the reader: the accepted codecs are a list given by the caller, such as the
+codecs known to be installed in the environment of the tasks, which must be kept up to date.
+Data which is not a valid frame, even if it starts with MAGIC, is returned as is by decompress().
+"""
+import io
+import os
+import time
+import struct
+import base64
+
+import requests
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+# Header of the compressed frames, used to recognize them among plain files
+MAGIC = b"PAZ1"
+
+# Prefix of the compressed variables
+VARIABLE_PREFIX = "pa-z:"
+
+BLOCK_SIZE = 4 * 2 ** 20
+SAMPLE_SIZE = 256 * 1024
+
+# Blocks whose compressed size is above this ratio of their size are stored raw
+INCOMPRESSIBLE_RATIO = 0.95
+
+# Link throughput assumed before the first measure (in bytes per second)
+DEFAULT_LINK_THROUGHPUT = 100 * 2 ** 20
+
+RAW, LZ4, ZSTD = 0, 1, 2
+CODEC_NAMES = {RAW: "raw", LZ4: "lz4", ZSTD: "zstd"}
+
+# Candidates of the adaptive choice, as (codec, level)
+CANDIDATES = [(LZ4, 0), (ZSTD, 1), (ZSTD, 3), (ZSTD, 9), (ZSTD, 19)]
+
+BLOCK_HEADER = struct.Struct(">BII")
+
+
+def available_codecs():
+    """Return the names of the codecs installed in this environment."""
+    return ["raw"] + [name for name, module in [("lz4", lz4), ("zstd", zstandard)] if module is not None]
+
+
+def negotiate(accepted):
+    """
+    Return the candidates usable by a writer for a reader accepting the given codec names.
+
+    The codecs accepted by the reader are not discovered: they must be given by the caller.
+    """
+    usable = set(available_codecs()) & set(accepted)
+    return [(codec, level) for codec, level in CANDIDATES if CODEC_NAMES[codec] in usable]
+
+
+def compress_block(data, codec, level):
+    if codec == LZ4:
+        return lz4.block.compress(data, store_size=False)
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+
+def decompress_block(data, codec, size):
+    if codec == LZ4:
+        return lz4.block.decompress(data, uncompressed_size=size)
+    if codec == ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+    return data
+
+
+class LinkEstimator:
+    """Exponentially weighted moving average of the measured link throughput."""
+
+    def __init__(self, throughput=DEFAULT_LINK_THROUGHPUT, weight=0.3):
+        self.throughput = throughput
+        self.weight = weight
+
+    def update(self, size, seconds):
+        if seconds > 0 and size > 0:
+            self.throughput += self.weight * (size / seconds - self.throughput)
+
+
+class AdaptiveCompressor:
+    """
+    Compressor choosing the codec and the level of each payload from the link throughput.
+
+    Args:
+        link (LinkEstimator): Estimator of the link throughput, shared by the transfers
+        candidates (list): (codec, level) candidates, from negotiate()
+    """
+
+    def __init__(self, link=None, candidates=None):
+        self.link = link or LinkEstimator()
+        self.candidates = negotiate(["lz4", "zstd"]) if candidates is None else candidates
+
+    def choose(self, data):
+        """Return the (codec, level) minimizing the estimated time to compress and send the data."""
+        sample = bytes(data[:SAMPLE_SIZE])
+        best, best_time = (RAW, 0), len(sample) / self.link.throughput
+        for codec, level in self.candidates:
+            start = time.perf_counter()
+            compressed = compress_block(sample, codec, level)
+            elapsed = time.perf_counter() - start
+            if len(compressed) > INCOMPRESSIBLE_RATIO * len(sample) or elapsed >= best_time:
+                # Incompressible data, or too slow already: the next candidates would not do better
+                break
+            estimate = elapsed + len(compressed) / self.link.throughput
+            if estimate < best_time:
+                best, best_time = (codec, level), estimate
+        return best
+
+    def compress(self, data, choice=None, block_size=BLOCK_SIZE):
+        """
+        Return the frame of data, compressing each block with the chosen codec or storing it raw.
+
+        Args:
+            choice (tuple): (codec, level) to use instead of the adaptive choice
+        """
+        data = memoryview(data)
+        codec, level = choice or self.choose(data)
+        frame = io.BytesIO()
+        frame.write(MAGIC)
+        for offset in range(0, len(data), block_size):
+            block = data[offset:offset + block_size]
+            payload = compress_block(block, codec, level) if codec != RAW else block
+            block_codec = codec
+            if len(payload) > INCOMPRESSIBLE_RATIO * len(block):
+                payload, block_codec = block, RAW
+            frame.write(BLOCK_HEADER.pack(block_codec, len(block), len(payload)))
+            frame.write(payload)
+        return frame.getvalue()
+
+
+def is_compressed(data):
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def frame_blocks(frame):
+    """Return the (codec, size, payload) blocks of a frame, or None if the data is not a valid frame."""
+    if not is_compressed(frame):
+        return None
+    frame = memoryview(frame)
+    offset, blocks = len(MAGIC), []
+    while offset < len(frame):
+        if offset + BLOCK_HEADER.size > len(frame):
+            return None
+        codec, size, length = BLOCK_HEADER.unpack_from(frame, offset)
+        offset += BLOCK_HEADER.size
+        if codec not in CODEC_NAMES or offset + length > len(frame) or (codec == RAW and length != size):
+            return None
+        blocks.append((codec, size, frame[offset:offset + length]))
+        offset += length
+    return blocks
+
+
+def frame_codec(frame):
+    """Return the name of the codec of the first block of a frame."""
+    blocks = frame_blocks(frame)
+    return CODEC_NAMES[blocks[0][0]] if blocks else CODEC_NAMES[RAW]
+
+
+def decompress_blocks(blocks):
+    return b"".join(decompress_block(payload, codec, size) for codec, size, payload in blocks)
+
+
+def decompress(frame):
+    """Return the data of a frame, or the data itself if it is not a valid frame."""
+    blocks = frame_blocks(frame)
+    return frame if blocks is None else decompress_blocks(blocks)
+
+
+def compress_variable(value, compressor=None):
+    """Return a string holding the compressed value, for the job or task variables."""
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    frame = (compressor or AdaptiveCompressor()).compress(data)
+    return VARIABLE_PREFIX + base64.b64encode(frame).decode("ascii")
+
+
+def decompress_variable(value, text=True):
+    """Return the value of a variable compressed with compress_variable(), or the value itself."""
+    if not isinstance(value, str) or not value.startswith(VARIABLE_PREFIX):
+        return value
+    data = decompress(base64.b64decode(value[len(VARIABLE_PREFIX):]))
+    return data.decode("utf-8") if text else data
+
+
+def decompress_file(path):
+    """Decompress a file in place if it is a valid frame, and return its path."""
+    with open(path, "rb") as f:
+        data = f.read()
+    blocks = frame_blocks(data)
+    if blocks is not None:
+        with open(path + ".tmp", "wb") as f:
+            f.write(decompress_blocks(blocks))
+        os.replace(path + ".tmp", path)
+    return path
+
+
+class CompressedDataSpace:
+    """
+    Transfers of compressed files with the user or global data space, measuring the link throughput.
+
+    Args:
+        gateway: A connected ProActive gateway
+        space (str): "user" or "global"
+        compressor (AdaptiveCompressor): Compressor of the uploads
+    """
+
+    def __init__(self, gateway, space="user", compressor=None):
+        if space not in ("user", "global"):
+            raise ValueError(f"Unknown data space: {space}")
+        self.base_url = f"{gateway.getBaseURL()}/rest/data/{space}"
+        self.compressor = compressor or AdaptiveCompressor()
+        self.session = requests.Session()
+        self.session.headers["sessionid"] = gateway.getSession()
+        self.session.verify = False
+
+    def _url(self, remote_path):
+        return f"{self.base_url}/{remote_path.lstrip('/')}"
+
+    def upload(self, data, remote_path):
+        """
+        Compress and upload data.
+
+        Returns:
+            dict: {'bytes', 'sent', 'codec', 'cpu_seconds', 'seconds'}
+        """
+        start = time.process_time()
+        frame = self.compressor.compress(data)
+        cpu_seconds = time.process_time() - start
+        start = time.perf_counter()
+        response = self.session.put(self._url(remote_path), data=frame,
+                                    headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+        seconds = time.perf_counter() - start
+        self.compressor.link.update(len(frame), seconds)
+        return {"bytes": len(data), "sent": len(frame), "codec": frame_codec(frame),
+                "cpu_seconds": cpu_seconds, "seconds": seconds}
+
+    def upload_file(self, local_path, remote_path):
+        with open(local_path, "rb") as f:
+            return self.upload(f.read(), remote_path)
+
+    def download(self, remote_path):
+        """Download and decompress data."""
+        start = time.perf_counter()
+        response = self.session.get(self._url(remote_path))
+        response.raise_for_status()
+        self.compressor.link.update(len(response.content), time.perf_counter() - start)
+        return decompress(response.content)
+
+    def delete(self, remote_path):
+        self.session.delete(self._url(remote_path))
@@ -0,0 +1,274 @@
+"""
+This script demonstrates how to transfer large files between the client and the ProActive data spaces in parallel chunks, with per-chunk checksums and resumption after a failure, instead of the single `userspaceapi.pushFile` / `pullFile` streams of demo_dataspace_api.py. The workflow includes:
+
+1. Connecting to the ProActive server using the ProActive gateway.
+2. Creating a local test file of TEST_FILE_SIZE_MB megabytes in a temporary directory.
+3. Uploading it with a single stream to the user space (`PUT /rest/data/user/<path>`), as a baseline.
+4. Uploading it with `ChunkedTransfer.upload()`, which splits it into chunks of CHUNK_SIZE_MB, uploads them with PARALLEL_STREAMS concurrent streams, and writes a manifest with the SHA-256 of each chunk once all the chunks are stored. The upload is interrupted halfway, then resumed: the chunks already recorded in the local journal and present in the data space are skipped.
+5. Downloading it back with `ChunkedTransfer.download()`, which fetches the chunks in parallel into a preallocated file, checks each one against the manifest, and can resume in the same way.
+6. Doing the same against the global space, and displaying the throughput of each transfer.
+7. Removing the test files and closing the connection.
+
+A chunked file is stored in the data space as a directory "<path>.chunks/" holding the chunks and a "manifest.json" file. This layout is only readable with `ChunkedTransfer.download()`: a task getting "<path>" with `userspaceapi.pullFile()` or `addInputFile()` would not find it, and getting "<path>.chunks" would give it the chunks instead of the file.
+"""
+import os
+import json
+import time
+import shutil
+import tempfile
+import hashlib
+import urllib3
+import requests
+
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Size of the test file, size of the chunks and number of concurrent streams
+TEST_FILE_SIZE_MB = 64
+CHUNK_SIZE_MB = 4
+PARALLEL_STREAMS = 8
+
+# Location of the test file in the data spaces
+DATASPACE_PATH = "demo_dataspace_transfer/test_file.bin"
+
+class TransferInterrupted(Exception):
+    """Raised by a progress callback to stop a transfer, which can be resumed later."""
+
+class ChunkedTransfer:
+    """
+    Parallel, chunked and resumable transfers with the user or global data space.
+
+    Args:
+        gateway: A connected ProActive gateway
+        space (str): "user" or "global"
+        chunk_size (int): Size of the chunks in bytes
+        streams (int): Number of concurrent streams
+    """
+
+    def __init__(self, gateway, space="user", chunk_size=CHUNK_SIZE_MB * 2 ** 20, streams=PARALLEL_STREAMS):
+        if space not in ("user", "global"):
+            raise ValueError(f"Unknown data space: {space}")
+        self.base_url = f"{gateway.getBaseURL()}/rest/data/{space}"
+        self.space = space
+        self.chunk_size = chunk_size
+        self.streams = streams
+        self.session = requests.Session()
+        self.session.headers["sessionid"] = gateway.getSession()
+        self.session.verify = False
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=streams))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=streams))
+
+    def _url(self, remote_path):
+        return f"{self.base_url}/{remote_path.lstrip('/')}"
+
+    @staticmethod
+    def _read_chunk(path, offset, size):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    @staticmethod
+    def _load_journal(journal_path, key):
+        try:
+            with open(journal_path) as f:
+                journal = json.load(f)
+            return journal if journal.get("key") == key else {"key": key, "done": {}}
+        except (OSError, ValueError):
+            return {"key": key, "done": {}}
+
+    @staticmethod
+    def _save_journal(journal_path, journal):
+        with open(journal_path + ".tmp", "w") as f:
+            json.dump(journal, f)
+        os.replace(journal_path + ".tmp", journal_path)
+
+    def _run_chunks(self, function, indexes, on_chunk, journal, journal_path):
+        """Run function(index) -> sha256 for the chunks in parallel, recording each finished chunk."""
+        transferred = 0
+        with ThreadPoolExecutor(max_workers=self.streams) as executor:
+            futures = {executor.submit(function, index): index for index in indexes}
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    digest, size = future.result()
+                    journal["done"][str(index)] = digest
+                    self._save_journal(journal_path, journal)
+                    transferred += size
+                    if on_chunk:
+                        on_chunk(index, len(journal["done"]))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return transferred
+
+    def upload(self, local_path, remote_path, on_chunk=None):
+        """
+        Upload a file in parallel chunks, resuming a previous interrupted upload.
+
+        Returns:
+            dict: {'bytes', 'seconds', 'throughput'} of the data actually transferred
+        """
+        size = os.path.getsize(local_path)
+        count = max(1, -(-size // self.chunk_size))
+        chunks_path = remote_path.rstrip("/") + ".chunks"
+        journal_path = local_path + f".{self.space}.upload.json"
+        journal = self._load_journal(journal_path, f"{self.base_url}|{remote_path}|{size}|{self.chunk_size}")
+
+        def upload_chunk(index):
+            data = self._read_chunk(local_path, index * self.chunk_size, self.chunk_size)
+            digest = hashlib.sha256(data).hexdigest()
+            response = self.session.put(self._url(f"{chunks_path}/{index:06d}"), data=data,
+                                        headers={"Content-Type": "application/octet-stream"})
+            response.raise_for_status()
+            return digest, len(data)
+
+        def is_uploaded(index):
+            digest = journal["done"].get(str(index))
+            if digest is None:
+                return False
+            data = self._read_chunk(local_path, index * self.chunk_size, self.chunk_size)
+            return (hashlib.sha256(data).hexdigest() == digest
+                    and self.session.head(self._url(f"{chunks_path}/{index:06d}")).status_code == 200)
+
+        with ThreadPoolExecutor(max_workers=self.streams) as executor:
+            uploaded = set(index for index, done in zip(range(count), executor.map(is_uploaded, range(count))) if done)
+        for index in set(range(count)) - uploaded:
+            journal["done"].pop(str(index), None)
+
+        start = time.perf_counter()
+        transferred = self._run_chunks(upload_chunk, sorted(set(range(count)) - uploaded), on_chunk, journal, journal_path)
+        manifest = {
+            "size": size,
+            "chunk_size": self.chunk_size,
+            "chunks": [journal["done"][str(index)] for index in range(count)],
+        }
+        response = self.session.put(self._url(f"{chunks_path}/manifest.json"), data=json.dumps(manifest).encode("utf-8"),
+                                    headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+        elapsed = time.perf_counter() - start
+        os.remove(journal_path)
+        return {"bytes": transferred, "seconds": elapsed, "throughput": transferred / elapsed if elapsed else 0.0}
+
+    def download(self, remote_path, local_path, on_chunk=None):
+        """
+        Download a chunked file in parallel, checking each chunk and resuming a previous interrupted download.
+
+        Returns:
+            dict: {'bytes', 'seconds', 'throughput'} of the data actually transferred
+        """
+        chunks_path = remote_path.rstrip("/") + ".chunks"
+        response = self.session.get(self._url(f"{chunks_path}/manifest.json"))
+        response.raise_for_status()
+        manifest = response.json()
+        partial_path = local_path + ".partial"
+        journal_path = local_path + f".{self.space}.download.json"
+        journal = self._load_journal(journal_path, f"{self.base_url}|{remote_path}|{'|'.join(manifest['chunks'])}")
+        if (not journal["done"] or not os.path.exists(partial_path)
+                or os.path.getsize(partial_path) != manifest["size"]):
+            # New download, or partial file of another version of the remote file: start from an empty file
+            journal["done"] = {}
+            with open(partial_path, "wb") as f:
+                f.truncate(manifest["size"])
+
+        def download_chunk(index):
+            response = self.session.get(self._url(f"{chunks_path}/{index:06d}"))
+            response.raise_for_status()
+            data = response.content
+            digest = hashlib.sha256(data).hexdigest()
+            if digest != manifest["chunks"][index]:
+                raise IOError(f"Checksum mismatch on chunk {index} of {remote_path}")
+            with open(partial_path, "r+b") as f:
+                f.seek(index * manifest["chunk_size"])
+                f.write(data)
+            return digest, len(data)
+
+        pending = [index for index in range(len(manifest["chunks"])) if str(index) not in journal["done"]]
+        start = time.perf_counter()
+        transferred = self._run_chunks(download_chunk, pending, on_chunk, journal, journal_path)
+        elapsed = time.perf_counter() - start
+        os.replace(partial_path, local_path)
+        os.remove(journal_path)
+        return {"bytes": transferred, "seconds": elapsed, "throughput": transferred / elapsed if elapsed else 0.0}
+
+    def delete(self, remote_path):
+        """Delete a chunked file from the data space."""
+        self.session.delete(self._url(remote_path.rstrip("/") + ".chunks"))
+
+    def close(self):
+        self.session.close()
+
+def single_stream_upload(gateway, space, local_path, remote_path):
+    """Baseline: upload the whole file with a single stream."""
+    start = time.perf_counter()
+    with open(local_path, "rb") as f:
+        response = requests.put(f"{gateway.getBaseURL()}/rest/data/{space}/{remote_path}", data=f,
+                                headers={"sessionid": gateway.getSession(), "Content-Type": "application/octet-stream"},
+                                verify=False)
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(local_path)
+    requests.delete(f"{gateway.getBaseURL()}/rest/data/{space}/{remote_path}",
+                    headers={"sessionid": gateway.getSession()}, verify=False)
+    return {"bytes": size, "seconds": elapsed, "throughput": size / elapsed}
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2 ** 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def print_result(label, result):
+    print(f"{label:<36} {result['bytes'] / 2 ** 20:8.0f} MB in {result['seconds']:6.1f} s   "
+          f"{result['throughput'] / 2 ** 20:8.1f} MB/s")
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+local_dir = tempfile.mkdtemp(prefix="demo_dataspace_transfer_")
+local_file = os.path.join(local_dir, "test_file.bin")
+downloaded_file = local_file + ".downloaded"
+transfers = []
+
+try:
+    print(f"Creating a {TEST_FILE_SIZE_MB} MB test file...")
+    with open(local_file, "wb") as f:
+        for _ in range(TEST_FILE_SIZE_MB):
+            f.write(os.urandom(2 ** 20))
+
+    for space in ["user", "global"]:
+        print(f"\n{space.capitalize()} space:")
+        print("-" * 80)
+        print_result("Single stream upload", single_stream_upload(gateway, space, local_file, DATASPACE_PATH))
+
+        transfer = ChunkedTransfer(gateway, space)
+        transfers.append(transfer)
+        total_chunks = -(-TEST_FILE_SIZE_MB // CHUNK_SIZE_MB)
+
+        def interrupt_halfway(index, done):
+            if done >= total_chunks // 2:
+                raise TransferInterrupted(f"Interrupted after {done} chunks")
+
+        try:
+            transfer.upload(local_file, DATASPACE_PATH, on_chunk=interrupt_halfway)
+        except TransferInterrupted as e:
+            print(f"Upload: {e}, resuming...")
+        print_result(f"Chunked upload, resumed ({PARALLEL_STREAMS} streams)", transfer.upload(local_file, DATASPACE_PATH))
+        print_result(f"Chunked download ({PARALLEL_STREAMS} streams)", transfer.download(DATASPACE_PATH, downloaded_file))
+        print("Checksums match:", file_sha256(local_file) == file_sha256(downloaded_file))
+        transfer.delete(DATASPACE_PATH)
+        os.remove(downloaded_file)
+
+except Exception as e:
+    print(f"Error during the transfer demo: {e}")
+finally:
+    for transfer in transfers:
+        transfer.close()
+    shutil.rmtree(local_dir, ignore_errors=True)
+    gateway.close()
+    print("Disconnected and finished.")
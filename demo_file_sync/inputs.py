@@ -0,0 +1,259 @@
+# inputs.py
+"""
+Incremental transfer of the input files of a job through a content-addressed store.
+
+build_manifest() expands the input file patterns of a task into a manifest mapping each
+relative path to the SHA-256 digest and the size of the file. The digests of the files whose
+size and modification time did not change are taken from a local index, so that unchanged
+trees are not read again. InputStore.sync_job() uploads to the user data space only the files
+whose digest is not already stored there, uploads the manifest of each task, and replaces the
+input file patterns of the task by a pre-script which copies the files of the manifest into the
+local space of the task, through a cache directory shared by the tasks of the node. The objects
+are only trusted by name on the client side: the pre-script checks the digest of each object it
+pulls, and deletes a corrupted object from the store, such as one left by an interrupted upload,
+so that the next sync_job() uploads it again.
+"""
+import os
+import glob
+import json
+import hashlib
+import requests
+
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from proactive import ProactivePreScript, ProactiveScriptLanguage
+
+# Location of the store in the user data space
+STORE_DIR = "input_store"
+
+# Local index of the digests, keyed by path, size and modification time
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "proactive_input_index")
+
+# Number of concurrent uploads
+UPLOAD_STREAMS = 8
+
+MATERIALIZE_TEMPLATE = """
+import groovy.json.JsonSlurper
+import java.nio.file.Files
+import java.nio.file.StandardCopyOption
+import java.util.concurrent.Executors
+
+def cacheDir = new File(System.getProperty("java.io.tmpdir"), "proactive_input_cache")
+cacheDir.mkdirs()
+userspaceapi.connect()
+
+def sha256 = {{ File file ->
+    def digest = java.security.MessageDigest.getInstance("SHA-256")
+    file.eachByte(1 << 20) {{ buffer, length -> digest.update(buffer, 0, length) }}
+    digest.digest().encodeHex().toString()
+}}
+
+// Pull a file of the user space into the cache, checking its digest before moving it into place
+def pullChecked = {{ String remotePath, String digest, File target ->
+    def temp = new File(cacheDir, target.name + "." + UUID.randomUUID() + ".tmp")
+    try {{
+        userspaceapi.pullFile(remotePath, temp)
+        if (sha256(temp) != digest) {{
+            userspaceapi.deleteFile(remotePath)
+            throw new IllegalStateException("Corrupted input object " + remotePath + ", removed from the user space")
+        }}
+        Files.move(temp.toPath(), target.toPath(), StandardCopyOption.REPLACE_EXISTING)
+    }} finally {{
+        temp.delete()
+    }}
+}}
+
+def manifestFile = new File(cacheDir, "{manifest_name}")
+if (!manifestFile.exists()) {{
+    pullChecked("{manifest_path}", "{manifest_digest}", manifestFile)
+}}
+def files = new JsonSlurper().parse(manifestFile).files
+
+// Pull the objects missing from the node cache
+def missing = files.values().collect {{ it.sha256 }}.unique().findAll {{ !new File(cacheDir, it).exists() }}
+def pool = Executors.newFixedThreadPool({streams})
+try {{
+    missing.collect {{ digest ->
+        pool.submit({{
+            pullChecked("{objects_dir}/" + digest, digest, new File(cacheDir, digest))
+        }} as Runnable)
+    }}.each {{ it.get() }}
+}} finally {{
+    pool.shutdown()
+}}
+
+// Copy the files into the local space
+files.each {{ path, entry ->
+    def target = new File(localspace, path)
+    target.parentFile.mkdirs()
+    Files.copy(new File(cacheDir, entry.sha256).toPath(), target.toPath(), StandardCopyOption.REPLACE_EXISTING)
+}}
+variables.put("PA_INPUT_MANIFEST", "{manifest_path}")
+println "Input files: " + files.size() + " files, " + missing.size() + " pulled from the user space"
+"""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2 ** 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def expand_patterns(root, patterns):
+    """Return the sorted relative paths of the files matching the input file patterns."""
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(glob.escape(root), pattern), recursive=True):
+            if os.path.isfile(path):
+                paths.add(os.path.relpath(path, root).replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def build_manifest(root, patterns, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Build the manifest of the files matching the patterns under root.
+
+    Returns:
+        tuple: ({relative path: {'sha256', 'size'}}, number of files hashed)
+    """
+    root = os.path.abspath(root)
+    os.makedirs(index_dir, exist_ok=True)
+    index_path = os.path.join(index_dir, hashlib.sha1(root.encode("utf-8")).hexdigest() + ".json")
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    manifest, hashed = {}, 0
+    for path in expand_patterns(root, patterns):
+        stat = os.stat(os.path.join(root, path))
+        key = f"{stat.st_size}:{stat.st_mtime_ns}"
+        entry = index.get(path)
+        if entry is None or entry["key"] != key:
+            entry = {"key": key, "sha256": file_sha256(os.path.join(root, path))}
+            index[path] = entry
+            hashed += 1
+        manifest[path] = {"sha256": entry["sha256"], "size": stat.st_size}
+
+    with open(index_path + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+    return manifest, hashed
+
+
+class InputStore:
+    """
+    Content-addressed store of input files in the user data space.
+
+    Args:
+        gateway: A connected ProActive gateway
+        store_dir (str): Location of the store in the user data space
+        streams (int): Number of concurrent uploads
+    """
+
+    def __init__(self, gateway, store_dir=STORE_DIR, streams=UPLOAD_STREAMS):
+        self.base_url = f"{gateway.getBaseURL()}/rest/data/user"
+        self.store_dir = store_dir
+        self.streams = streams
+        self.session = requests.Session()
+        self.session.headers["sessionid"] = gateway.getSession()
+        self.session.verify = False
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=streams))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=streams))
+        self._stored = None
+
+    def _url(self, remote_path):
+        return f"{self.base_url}/{remote_path}"
+
+    def _put(self, remote_path, data):
+        response = self.session.put(self._url(remote_path), data=data,
+                                    headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+
+    def stored_digests(self):
+        """Return the digests already present in the store, listed once per InputStore."""
+        if self._stored is None:
+            response = self.session.get(self._url(f"{self.store_dir}/objects"), params={"comp": "list"})
+            if response.status_code == 404:
+                self._stored = set()
+            else:
+                response.raise_for_status()
+                self._stored = set(name.rsplit("/", 1)[-1] for name in response.json().get("files", []))
+        return self._stored
+
+    def upload(self, root, manifest):
+        """
+        Upload the files of a manifest whose digest is not stored yet.
+
+        Returns:
+            tuple: (number of files uploaded, number of bytes uploaded)
+        """
+        stored = self.stored_digests()
+        missing = {}
+        for path, entry in manifest.items():
+            if entry["sha256"] not in stored:
+                missing.setdefault(entry["sha256"], (path, entry["size"]))
+
+        def upload_object(item):
+            digest, (path, _) = item
+            remote_path = f"{self.store_dir}/objects/{digest}"
+            try:
+                with open(os.path.join(root, path), "rb") as f:
+                    self._put(remote_path, f)
+            except BaseException:
+                # Do not leave a truncated object behind, it would be taken as stored by the next syncs
+                self.session.delete(self._url(remote_path))
+                raise
+            stored.add(digest)
+
+        with ThreadPoolExecutor(max_workers=self.streams) as executor:
+            list(executor.map(upload_object, missing.items()))
+        return len(missing), sum(size for _, size in missing.values())
+
+    def upload_manifest(self, manifest):
+        """Upload a manifest, named after its own digest, and return its location in the user space."""
+        data = json.dumps({"files": manifest}, sort_keys=True).encode("utf-8")
+        remote_path = f"{self.store_dir}/manifests/{hashlib.sha256(data).hexdigest()}.json"
+        self._put(remote_path, data)
+        return remote_path
+
+    def attach(self, task, manifest_path):
+        """Replace the input file patterns of a task by the materialization of a manifest."""
+        if task.hasPreScript():
+            raise ValueError(f"Task {task.getTaskName()} already has a pre-script")
+        pre_script = ProactivePreScript(ProactiveScriptLanguage().groovy())
+        pre_script.setImplementation(MATERIALIZE_TEMPLATE.format(
+            manifest_name=manifest_path.rsplit("/", 1)[-1],
+            manifest_digest=manifest_path.rsplit("/", 1)[-1][:-len(".json")],
+            manifest_path=manifest_path,
+            objects_dir=f"{self.store_dir}/objects",
+            streams=self.streams
+        ))
+        task.setPreScript(pre_script)
+        task.clearInputFiles()
+
+    def sync_job(self, job, root="."):
+        """
+        Upload the input files of all the tasks of a job incrementally and attach them to the tasks.
+
+        The job can then be submitted with gateway.submitJob(), without transferring input files.
+
+        Returns:
+            dict: {'files', 'bytes', 'hashed', 'uploaded_files', 'uploaded_bytes'}
+        """
+        stats = {"files": 0, "bytes": 0, "hashed": 0, "uploaded_files": 0, "uploaded_bytes": 0}
+        for task in job.getTasks():
+            if not task.getInputFiles():
+                continue
+            manifest, hashed = build_manifest(root, task.getInputFiles())
+            uploaded_files, uploaded_bytes = self.upload(root, manifest)
+            self.attach(task, self.upload_manifest(manifest))
+            stats["files"] += len(manifest)
+            stats["bytes"] += sum(entry["size"] for entry in manifest.values())
+            stats["hashed"] += hashed
+            stats["uploaded_files"] += uploaded_files
+            stats["uploaded_bytes"] += uploaded_bytes
+        return stats
@@ -0,0 +1,165 @@
+# outputs.py
+"""
+Transfer of the output files of a job limited to the files new or modified by the tasks.
+
+OutputStore.attach() replaces the output file patterns of a task by a post-script which hashes
+the matching files of the local space and compares them with the input manifest of the task
+(see inputs.py). Only the files which are new or whose digest changed are pushed to the
+content-addressed store of the user data space. The post-script then pushes the output manifest
+of the task and logs the transfer sizes. OutputStore.fetch_job() reads the output manifests
+of a finished job and downloads only the files modified by the tasks which differ from the local ones.
+"""
+import os
+import glob
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from proactive import ProactivePostScript, ProactiveScriptLanguage
+from demo_file_sync.inputs import InputStore, build_manifest
+
+COLLECT_TEMPLATE = """
+import groovy.json.JsonOutput
+import groovy.json.JsonSlurper
+import java.nio.file.FileSystems
+import java.nio.file.Files
+import java.security.MessageDigest
+
+def matchers = {patterns}.collect {{ FileSystems.default.getPathMatcher("glob:" + it) }}
+def root = new File(localspace).toPath()
+def cacheDir = new File(System.getProperty("java.io.tmpdir"), "proactive_input_cache")
+userspaceapi.connect()
+
+// Input manifest of the task, left in the node cache by the input pre-script
+def inputs = [:]
+def inputManifest = variables.get("PA_INPUT_MANIFEST")
+if (inputManifest) {{
+    def manifestFile = new File(cacheDir, inputManifest.tokenize("/")[-1])
+    if (!manifestFile.exists()) {{
+        cacheDir.mkdirs()
+        userspaceapi.pullFile(inputManifest, manifestFile)
+    }}
+    inputs = new JsonSlurper().parse(manifestFile).files
+}}
+
+def sha256 = {{ File file ->
+    def digest = MessageDigest.getInstance("SHA-256")
+    file.eachByte(1 << 20) {{ buffer, length -> digest.update(buffer, 0, length) }}
+    digest.digest().encodeHex().toString()
+}}
+
+def files = [:]
+def changed = []
+def pushed = [] as Set
+long totalBytes = 0, pushedBytes = 0
+Files.walk(root).withCloseable {{ stream ->
+    stream.filter {{ Files.isRegularFile(it) }}.forEach {{ path ->
+        def relative = root.relativize(path)
+        if (!matchers.any {{ it.matches(relative) }}) return
+        def name = relative.toString().replace(File.separator, "/")
+        def file = path.toFile()
+        def digest = sha256(file)
+        files[name] = [sha256: digest, size: file.length()]
+        totalBytes += file.length()
+        if (inputs[name]?.sha256 == digest) return
+        changed << name
+        if (pushed.add(digest)) {{
+            userspaceapi.pushFile(file, "{objects_dir}/" + digest)
+            pushedBytes += file.length()
+        }}
+    }}
+}}
+
+def manifest = File.createTempFile("output_manifest", ".json")
+manifest.text = JsonOutput.toJson([files: files, changed: changed, pushed_bytes: pushedBytes])
+userspaceapi.pushFile(manifest, "{outputs_dir}/" + variables.get("PA_JOB_ID") + "/" + variables.get("PA_TASK_NAME") + ".json")
+manifest.delete()
+println "Output files: " + changed.size() + " of " + files.size() + " new or modified, " + pushedBytes + " of " + totalBytes + " bytes pushed"
+"""
+
+
+class OutputStore(InputStore):
+    """
+    Content-addressed store of output files in the user data space, sharing the objects of the input store.
+
+    Args:
+        gateway: A connected ProActive gateway
+        store_dir (str): Location of the store in the user data space
+        streams (int): Number of concurrent downloads
+    """
+
+    def attach(self, task, patterns=None):
+        """Replace the output file patterns of a task by the push of its new or modified files."""
+        patterns = list(patterns or task.getOutputFiles())
+        if task.hasPostScript():
+            raise ValueError(f"Task {task.getTaskName()} already has a post-script")
+        post_script = ProactivePostScript(ProactiveScriptLanguage().groovy())
+        post_script.setImplementation(COLLECT_TEMPLATE.format(
+            patterns=json.dumps(patterns).replace("$", "\\$"),
+            objects_dir=f"{self.store_dir}/objects",
+            outputs_dir=f"{self.store_dir}/outputs"
+        ))
+        task.setPostScript(post_script)
+        task.clearOutputFiles()
+
+    def attach_job(self, job):
+        """Attach the output file patterns of all the tasks of a job."""
+        for task in job.getTasks():
+            if task.getOutputFiles():
+                self.attach(task)
+
+    def output_manifest(self, job_id, task_name):
+        """Return the output manifest of a task, or None if the task did not push one."""
+        response = self.session.get(self._url(f"{self.store_dir}/outputs/{job_id}/{task_name}.json"))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def fetch(self, manifest, root="."):
+        """
+        Download the files modified by the task, as listed in the "changed" entry of its output manifest,
+        which differ from the local files.
+
+        Returns:
+            tuple: (number of files downloaded, number of bytes downloaded)
+        """
+        changed = {path: manifest["files"][path] for path in manifest["changed"]}
+        local, _ = build_manifest(root, [glob.escape(path) for path in changed])
+        missing = [(path, entry) for path, entry in changed.items()
+                   if local.get(path, {}).get("sha256") != entry["sha256"]]
+
+        def download(item):
+            path, entry = item
+            response = self.session.get(self._url(f"{self.store_dir}/objects/{entry['sha256']}"))
+            response.raise_for_status()
+            target = os.path.join(root, path)
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            with open(target + ".tmp", "wb") as f:
+                f.write(response.content)
+            os.replace(target + ".tmp", target)
+            return len(response.content)
+
+        with ThreadPoolExecutor(max_workers=self.streams) as executor:
+            return len(missing), sum(executor.map(download, missing))
+
+    def fetch_job(self, job_id, job, root="."):
+        """
+        Download the new or modified output files of the tasks of a finished job.
+
+        Returns:
+            dict: {task name: {'files', 'changed', 'pushed_bytes', 'fetched_files', 'fetched_bytes'}}
+        """
+        report = {}
+        for task in job.getTasks():
+            manifest = self.output_manifest(job_id, task.getTaskName())
+            if manifest is None:
+                continue
+            fetched_files, fetched_bytes = self.fetch(manifest, root)
+            report[task.getTaskName()] = {
+                "files": len(manifest["files"]),
+                "changed": len(manifest["changed"]),
+                "pushed_bytes": manifest["pushed_bytes"],
+                "fetched_files": fetched_files,
+                "fetched_bytes": fetched_bytes,
+            }
+        return report
@@ -0,0 +1,301 @@
+"""
+This script demonstrates how to instrument the ProActive gateway of a client process and expose its operation metrics on a local Prometheus/OpenMetrics endpoint. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway.
+- Instrumentation of the gateway with `instrument_gateway()`, which wraps operations such as `submitJob`, `getJobStatus`, `getJobOutput`, `getJobResultMap` or `submitJobWithInputsAndOutputsPaths` and records, per operation, a latency histogram, the number of calls, the number of errors, the number of bytes returned and the number of bytes sent (the input files uploaded by `submitJobWithInputsAndOutputsPaths`).
+- Instrumentation of the data space transfers made through the REST API with `instrument_dataspace()`, which wraps a `requests.Session` and records the uploads (`pushFile`), downloads (`pullFile`), listings and deletions of `/rest/data/` with the same metrics and their transferred sizes.
+- Exposure of the collected metrics in the OpenMetrics text format on `http://localhost:9464/metrics` through a background HTTP server, ready to be scraped by Prometheus.
+- Execution of the workload of demo_multi_job_node_source.py (4 jobs distributed across node sources) with the instrumented gateway, so that the polling done by `executeJobsAcrossNodeSources` is recorded as well.
+- Upload and download of a 1 MiB file to and from the user space through the instrumented session.
+- Scraping of the endpoint at the end of the run and display of the exposed metrics.
+- Handling of exceptions and clean disconnection from the gateway.
+
+The instrumentation only adds a clock read and a short locked update per call, and it is optional: a gateway that is not passed to `instrument_gateway()` is left untouched.
+"""
+import os
+import glob
+import bisect
+import logging
+import threading
+import time
+import urllib.request
+import urllib3
+import requests
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_gateway_metrics_exporter")
+
+# Address of the local metrics endpoint
+METRICS_HOST = "localhost"
+METRICS_PORT = 9464
+
+# Gateway operations instrumented by default
+INSTRUMENTED_OPERATIONS = [
+    "submitJob", "submitJobWithInputsAndOutputsPaths", "getJobStatus", "getJobState", "getJobInfo",
+    "isJobFinished", "getJobOutput", "getJobResult", "getJobResultMap", "getTaskResult",
+    "getTaskPreciousResult", "getJobPreciousResults", "waitForJob", "killJob", "sendSignal",
+    "startService", "finishService",
+]
+
+# Gateway operations uploading files, with the function returning the number of bytes they send
+SENT_BYTES = {
+    "submitJobWithInputsAndOutputsPaths": lambda job_model, input_folder_path=".", *args, **kwargs:
+        input_files_size(job_model, input_folder_path),
+}
+
+# Names of the data space operations, by HTTP method
+DATASPACE_OPERATIONS = {"PUT": "pushFile", "GET": "pullFile", "DELETE": "deleteFile", "HEAD": "statFile"}
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class GatewayMetrics:
+    """Thread-safe registry of the per-operation counters and latency histograms."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def observe(self, operation, duration, error=False, nbytes=0, sent_bytes=0):
+        """Record one call of an operation, nbytes being the size of its response and sent_bytes the size of its request."""
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = {
+                    "count": 0, "errors": 0, "bytes": 0, "sent_bytes": 0, "sum": 0.0,
+                    "buckets": [0] * len(self.buckets),
+                }
+            stats["count"] += 1
+            stats["sum"] += duration
+            stats["bytes"] += nbytes
+            stats["sent_bytes"] += sent_bytes
+            if error:
+                stats["errors"] += 1
+            index = bisect.bisect_left(self.buckets, duration)
+            if index < len(self.buckets):
+                stats["buckets"][index] += 1
+
+    def render(self):
+        """Render the metrics in the OpenMetrics text format."""
+        with self._lock:
+            operations = {name: dict(stats, buckets=list(stats["buckets"])) for name, stats in self._operations.items()}
+
+        lines = [
+            "# TYPE proactive_gateway_request_duration_seconds histogram",
+            "# UNIT proactive_gateway_request_duration_seconds seconds",
+            "# HELP proactive_gateway_request_duration_seconds Latency of the gateway operations.",
+        ]
+        for name, stats in sorted(operations.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats["buckets"]):
+                cumulative += count
+                lines.append(f'proactive_gateway_request_duration_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'proactive_gateway_request_duration_seconds_bucket{{operation="{name}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'proactive_gateway_request_duration_seconds_count{{operation="{name}"}} {stats["count"]}')
+            lines.append(f'proactive_gateway_request_duration_seconds_sum{{operation="{name}"}} {stats["sum"]:.6f}')
+
+        for metric, key, help_text in [
+            ("proactive_gateway_requests", "count", "Number of calls of the gateway operations."),
+            ("proactive_gateway_errors", "errors", "Number of failed calls of the gateway operations."),
+            ("proactive_gateway_response_bytes", "bytes", "Number of bytes returned by the gateway operations."),
+            ("proactive_gateway_request_bytes", "sent_bytes", "Number of bytes sent by the gateway operations."),
+        ]:
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"# HELP {metric} {help_text}")
+            for name, stats in sorted(operations.items()):
+                lines.append(f'{metric}_total{{operation="{name}"}} {stats[key]}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+def response_size(value):
+    """
+    Return the size in bytes of a response.
+
+    Text and binary values are counted exactly, containers as the sum of their items, and other
+    objects (e.g. the Java result maps and task results) as the size of their text representation.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(response_size(k) + response_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(response_size(item) for item in value)
+    return len(str(value).encode("utf-8"))
+
+def input_files_size(job_model, input_folder_path="."):
+    """Return the total size of the input files of the tasks of a job model, found in input_folder_path."""
+    paths = set()
+    for task in job_model.getTasks():
+        for pattern in task.getInputFiles():
+            for path in glob.glob(os.path.join(glob.escape(input_folder_path), pattern), recursive=True):
+                if os.path.isfile(path):
+                    paths.add(os.path.abspath(path))
+    return sum(os.path.getsize(path) for path in paths)
+
+def request_size(data):
+    """Return the size in bytes of a request body: bytes, text or a file object."""
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, bytearray, str)):
+        return response_size(data)
+    if hasattr(data, "fileno"):
+        return os.fstat(data.fileno()).st_size - data.tell()
+    return 0
+
+def instrument_gateway(gateway, metrics, operations=INSTRUMENTED_OPERATIONS):
+    """
+    Record the latency, count, errors and response size of the given gateway operations.
+
+    The wrappers are set on the gateway instance, so the calls made internally by the
+    gateway itself (e.g. the getJobStatus polling of executeJobsAcrossNodeSources) are recorded too.
+    """
+    def wrap(name, method):
+        def instrumented(*args, **kwargs):
+            sent_bytes = SENT_BYTES[name](*args, **kwargs) if name in SENT_BYTES else 0
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                metrics.observe(name, time.perf_counter() - start, error=True)
+                raise
+            metrics.observe(name, time.perf_counter() - start, nbytes=response_size(result), sent_bytes=sent_bytes)
+            return result
+        instrumented.__name__ = name
+        instrumented.__doc__ = method.__doc__
+        return instrumented
+
+    for name in operations:
+        method = getattr(gateway, name, None)
+        if callable(method):
+            setattr(gateway, name, wrap(name, method))
+    return gateway
+
+def instrument_dataspace(session, metrics):
+    """
+    Record the latency, count, errors and transferred bytes of the data space requests of a requests.Session.
+
+    The requests to "/rest/data/" are recorded under the pushFile (PUT), pullFile (GET), deleteFile (DELETE)
+    and statFile (HEAD) operations, and the listings ("?comp=list") under listFiles. The other requests of
+    the session are not recorded.
+    """
+    request = session.request
+
+    def instrumented(method, url, *args, **kwargs):
+        if "/rest/data/" not in url:
+            return request(method, url, *args, **kwargs)
+        params = kwargs.get("params") or {}
+        if "comp=list" in url or (isinstance(params, dict) and params.get("comp") == "list"):
+            name = "listFiles"
+        else:
+            name = DATASPACE_OPERATIONS.get(method.upper(), method.upper())
+        sent_bytes = request_size(kwargs.get("data"))
+        start = time.perf_counter()
+        try:
+            response = request(method, url, *args, **kwargs)
+        except Exception:
+            metrics.observe(name, time.perf_counter() - start, error=True)
+            raise
+        if kwargs.get("stream"):
+            nbytes = int(response.headers.get("Content-Length", 0))
+        else:
+            nbytes = len(response.content)
+        metrics.observe(name, time.perf_counter() - start, error=not response.ok, nbytes=nbytes,
+                        sent_bytes=sent_bytes)
+        return response
+
+    session.request = instrumented
+    return session
+
+def start_metrics_server(metrics, host=METRICS_HOST, port=METRICS_PORT):
+    """Serve the metrics on http://host:port/metrics from a daemon thread."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving gateway metrics on http://{host}:{port}/metrics")
+    return server
+
+# Initialize the ProActive gateway and its instrumentation
+gateway = getProActiveGateway()
+metrics = GatewayMetrics()
+instrument_gateway(gateway, metrics)
+server = start_metrics_server(metrics)
+
+try:
+    # Specify which node sources to use for distributing the jobs (None to use all of them)
+    node_sources = None
+
+    # Create multiple jobs with Python tasks
+    jobs = []
+    for i in range(4):
+        job = gateway.createJob(f"NodeJob_{i}")
+        task = gateway.createPythonTask(f"Task_{i}")
+        task.setTaskImplementation(f'''
+import time
+print("Starting task {i}...")
+time.sleep(15)
+print("Finished task {i}")
+''')
+        job.addTask(task)
+        jobs.append(job)
+
+    # Submit and execute the jobs across selected node sources
+    job_results = gateway.executeJobsAcrossNodeSources(jobs, node_sources)
+
+    # Fetch the output of each job
+    for result in job_results:
+        logger.info(f"Job ID: {result['job_id']}, State: {result['job_state']}")
+        gateway.getJobOutput(result['job_id'])
+
+    # Transfer a file to and from the user space through the instrumented session
+    session = instrument_dataspace(requests.Session(), metrics)
+    session.headers["sessionid"] = gateway.getSession()
+    session.verify = False
+    file_url = f"{gateway.getBaseURL()}/rest/data/user/demo_gateway_metrics_exporter.bin"
+    session.put(file_url, data=os.urandom(1024 * 1024),
+                headers={"Content-Type": "application/octet-stream"}).raise_for_status()
+    session.get(file_url).raise_for_status()
+    session.delete(file_url)
+    session.close()
+
+    # Scrape the metrics endpoint, as Prometheus would do
+    print(f"\nScraping http://{METRICS_HOST}:{METRICS_PORT}/metrics:")
+    print("-" * 40)
+    with urllib.request.urlopen(f"http://{METRICS_HOST}:{METRICS_PORT}/metrics") as response:
+        for line in response.read().decode("utf-8").splitlines():
+            if not line.startswith("proactive_gateway_request_duration_seconds_bucket"):
+                print(line)
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    server.shutdown()
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,264 @@
+"""
+This script demonstrates how to trace the ProActive gateway calls of a client process and export them as a Chrome-trace/Perfetto JSON file for offline flame-chart analysis. The workflow includes:
+
+- Definition of a small `Tracer` that records nested spans per thread and forwards each finished span to pluggable hooks. The `ChromeTraceExporter` hook writes them in the Chrome trace event format.
+- Instrumentation of the gateway with `trace_gateway()`, which emits a span for each `getBucket`, each `create_*_task` of the returned buckets, each `addTask` of the created jobs, each `buildJob` (job serialization), `submitJob` and result fetch.
+- Optional instrumentation of the lower layers: the REST calls made through `requests` and the JVM bridge calls made through py4j, which appear as child spans of the gateway operation that triggered them.
+- Execution of the machine learning workflow of demo_ai_workflow.py with tracing enabled, and export of the trace to `gateway_trace.json` in the temporary directory. The `requests` and py4j patches are removed at the end of the run.
+- Display of the time spent per span name, from the slowest to the fastest.
+
+Open the generated file with https://ui.perfetto.dev or chrome://tracing to browse the flame chart and find whether the time goes to catalog fetches, JVM bridge calls, job serialization or network.
+"""
+import os
+import json
+import tempfile
+import time
+import threading
+import requests
+import py4j.java_gateway
+
+from contextlib import contextmanager
+from proactive import getProActiveGateway
+
+# File receiving the exported trace
+TRACE_FILE = os.path.join(tempfile.gettempdir(), "gateway_trace.json")
+
+# Trace the REST calls made through requests and the py4j JVM bridge calls
+TRACE_REST_CALLS = True
+TRACE_JVM_CALLS = True
+
+# Gateway operations traced by default
+TRACED_OPERATIONS = [
+    "getBucket", "createJob", "createPythonTask", "createTask", "buildJob", "submitJob",
+    "submitJobWithInputsAndOutputsPaths", "getJobStatus", "isJobFinished", "getJobOutput",
+    "getJobResult", "getJobResultMap", "getTaskResult", "getTaskPreciousResult", "getJobPreciousResults",
+]
+
+class Tracer:
+    """Record nested spans per thread and forward the finished spans to hooks."""
+
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def add_hook(self, hook):
+        """Register a callable receiving each finished span as a dict."""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def span(self, name, category="gateway", **args):
+        """Record a span around the enclosed block. Spans opened inside it become its children."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        if stack and stack[-1] == (name, category):
+            # Do not record a call re-entering the same operation (e.g. bound method wrappers)
+            yield
+            return
+        stack.append((name, category))
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            span = {
+                "name": name,
+                "category": category,
+                "start_us": (start - self._origin) * 1e6,
+                "duration_us": (end - start) * 1e6,
+                "thread_id": threading.get_ident(),
+                "depth": len(stack),
+                "args": dict(args, error=error) if error else args,
+            }
+            for hook in self.hooks:
+                hook(span)
+
+    def wrap(self, function, name, category="gateway"):
+        """Return function wrapped in a span."""
+        def traced(*args, **kwargs):
+            with self.span(name, category):
+                return function(*args, **kwargs)
+        traced.__name__ = getattr(function, "__name__", name)
+        traced.__doc__ = getattr(function, "__doc__", None)
+        return traced
+
+class ChromeTraceExporter:
+    """Hook collecting spans and writing them in the Chrome trace event format."""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        event = {
+            "name": span["name"],
+            "cat": span["category"],
+            "ph": "X",
+            "ts": round(span["start_us"], 3),
+            "dur": round(span["duration_us"], 3),
+            "pid": os.getpid(),
+            "tid": span["thread_id"],
+            "args": {k: str(v) for k, v in span["args"].items()},
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def export(self, path):
+        """Write the collected spans to path."""
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+class SpanSummary:
+    """Hook aggregating the total time and the number of calls per span name."""
+
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        with self._lock:
+            count, total = self.totals.get(span["name"], (0, 0.0))
+            self.totals[span["name"]] = (count + 1, total + span["duration_us"] / 1000)
+
+def trace_gateway(gateway, tracer, operations=TRACED_OPERATIONS):
+    """
+    Emit spans for the gateway operations, the create_*_task methods of the buckets
+    returned by getBucket and the addTask method of the jobs returned by createJob.
+
+    The wrappers are set on the instances, so calls made internally by the gateway
+    (e.g. buildJob from submitJob) are recorded as nested spans.
+    """
+    def trace_bucket(bucket):
+        for attribute in dir(bucket):
+            if attribute.startswith("create_") and attribute.endswith("_task"):
+                setattr(bucket, attribute, tracer.wrap(getattr(bucket, attribute), attribute, "catalog"))
+        return bucket
+
+    def trace_job(job):
+        job.addTask = tracer.wrap(job.addTask, "addTask", "model")
+        return job
+
+    def then(function, post_processor):
+        return lambda *args, **kwargs: post_processor(function(*args, **kwargs))
+
+    post_processors = {"getBucket": trace_bucket, "createJob": trace_job}
+    for name in operations:
+        method = getattr(gateway, name, None)
+        if not callable(method):
+            continue
+        traced = tracer.wrap(method, name)
+        if name in post_processors:
+            traced = then(traced, post_processors[name])
+        setattr(gateway, name, traced)
+    return gateway
+
+def trace_rest_calls(tracer):
+    """Emit a span for every HTTP request made through requests. Return a function removing the patch."""
+    original_request = requests.Session.request
+
+    def traced_request(session, method, url, *args, **kwargs):
+        path = requests.utils.urlparse(url).path
+        with tracer.span(f"{method} {path}", "rest", url=url):
+            return original_request(session, method, url, *args, **kwargs)
+
+    requests.Session.request = traced_request
+
+    def restore():
+        requests.Session.request = original_request
+    return restore
+
+def trace_jvm_calls(tracer):
+    """Emit a span for every py4j call made to the JVM bridge. Return a function removing the patch."""
+    original_call = py4j.java_gateway.JavaMember.__call__
+
+    def traced_call(member, *args):
+        with tracer.span(f"jvm:{member.name}", "jvm"):
+            return original_call(member, *args)
+
+    py4j.java_gateway.JavaMember.__call__ = traced_call
+
+    def restore():
+        py4j.java_gateway.JavaMember.__call__ = original_call
+    return restore
+
+# Initialize the tracer and its hooks
+exporter = ChromeTraceExporter()
+summary = SpanSummary()
+tracer = Tracer(hooks=[exporter, summary])
+restore_patches = []
+if TRACE_REST_CALLS:
+    restore_patches.append(trace_rest_calls(tracer))
+if TRACE_JVM_CALLS:
+    restore_patches.append(trace_jvm_calls(tracer))
+
+gateway = None
+try:
+    # Initialize the ProActive gateway
+    with tracer.span("getProActiveGateway"):
+        gateway = getProActiveGateway()
+    trace_gateway(gateway, tracer)
+
+    with tracer.span("demo_ai_workflow", "workflow"):
+        print("Creating a proactive job...")
+        job = gateway.createJob("demo_gateway_tracing")
+
+        print("Getting the ai-machine-learning bucket")
+        bucket = gateway.getBucket("ai-machine-learning")
+
+        print("Creating the workflow tasks...")
+        load_iris_dataset_task = bucket.create_Load_Iris_Dataset_task()
+        job.addTask(load_iris_dataset_task)
+
+        split_data_task = bucket.create_Split_Data_task()
+        split_data_task.addDependency(load_iris_dataset_task)
+        job.addTask(split_data_task)
+
+        logistic_regression_task = bucket.create_Logistic_Regression_task()
+        job.addTask(logistic_regression_task)
+
+        train_model_task = bucket.create_Train_Model_task()
+        train_model_task.addDependency(split_data_task)
+        train_model_task.addDependency(logistic_regression_task)
+        job.addTask(train_model_task)
+
+        predict_model_task = bucket.create_Predict_Model_task()
+        predict_model_task.addDependency(split_data_task)
+        predict_model_task.addDependency(train_model_task)
+        job.addTask(predict_model_task)
+
+        preview_results_task = bucket.create_Preview_Results_task()
+        preview_results_task.addDependency(predict_model_task)
+        job.addTask(preview_results_task)
+
+        print("Submitting the job to the proactive scheduler...")
+        job_id = gateway.submitJob(job)
+        print("job_id: " + str(job_id))
+
+        print("Getting job output...")
+        job_output = gateway.getJobOutput(job_id)
+        print(job_output)
+
+except Exception as e:
+    print(f"Error during the traced workflow: {e}")
+finally:
+    if gateway is not None:
+        gateway.close()
+    for restore in restore_patches:
+        restore()
+
+    n_events = exporter.export(TRACE_FILE)
+    print(f"\nExported {n_events} spans to {TRACE_FILE}")
+    print("Open it with https://ui.perfetto.dev or chrome://tracing")
+
+    print("\nTime per span (slowest first):")
+    print("-" * 60)
+    for name, (count, total_ms) in sorted(summary.totals.items(), key=lambda item: -item[1][1])[:20]:
+        print(f"{name[:40]:<40} {count:>5} calls {total_ms:>10.1f} ms")
+    print("Disconnected and finished.")
@@ -0,0 +1,84 @@
+"""
+This script demonstrates how to submit jobs whose input files are uploaded incrementally, instead of `addInputFile('dir/**')` with `submitJobWithInputsAndOutputsPaths()` as in demo_transf_file.py, demo_exec_file.py, demo_python_module.py and demo_dockerfile.py, which upload the whole tree at every submission. The workflow includes:
+
+1. Creation of a local test tree of NUMBER_OF_FILES small files.
+2. Initialization of the ProActive gateway.
+3. Submission of a job whose Bash task counts the files of the tree, declared with `task.addInputFile('demo_incremental_inputs_tree/**')`:
+   - twice with `submitJobWithInputsAndOutputsPaths()`, as a baseline;
+   - three times with `InputStore.sync_job()` from the 'demo_file_sync' module followed by `submitJob()`: on a cold store, with the tree unchanged, and after the modification of a single file.
+   `sync_job()` builds a manifest of the SHA-256 digest of each input file (reusing the digests of the files whose size and modification time did not change), uploads to the user space only the files whose digest is not stored in "input_store/objects/" yet, and replaces the input files of the task by a pre-script which copies them from the store into the local space of the task.
+4. Display of the submission time and of the number of files and bytes uploaded for each run, and of the output of the last job.
+5. Removal of the test tree and disconnection from the gateway.
+"""
+import os
+import time
+import shutil
+
+from proactive import getProActiveGateway
+from demo_file_sync.inputs import InputStore
+
+# Size of the test tree
+NUMBER_OF_FILES = 10_000
+FILES_PER_DIRECTORY = 100
+FILE_SIZE = 2048
+
+TREE_DIR = "demo_incremental_inputs_tree"
+
+def create_tree():
+    for i in range(NUMBER_OF_FILES):
+        directory = os.path.join(TREE_DIR, f"dir_{i // FILES_PER_DIRECTORY:03d}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file_{i:05d}.bin"), "wb") as f:
+            f.write(os.urandom(FILE_SIZE))
+
+def create_job(gateway, name):
+    job = gateway.createJob(name)
+    task = gateway.createTask(language="bash", task_name="count_files")
+    task.setTaskImplementation(f"""
+echo "Number of files in {TREE_DIR}: $(find {TREE_DIR} -type f | wc -l)"
+md5sum {TREE_DIR}/dir_000/file_00000.bin
+""")
+    task.addInputFile(f"{TREE_DIR}/**")
+    job.addTask(task)
+    return job
+
+def print_run(label, seconds, files, size):
+    print(f"{label:<36} {seconds:8.2f} s   {files:6d} files   {size / 2 ** 20:8.2f} MB uploaded")
+
+print(f"Creating a test tree of {NUMBER_OF_FILES} files...")
+create_tree()
+tree_size = NUMBER_OF_FILES * FILE_SIZE
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    print("\nSubmission time of the job:")
+    print("-" * 80)
+    for run in range(2):
+        job = create_job(gateway, "demo_incremental_inputs_baseline_job")
+        start = time.perf_counter()
+        job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+        print_run(f"Full upload, run {run + 1}", time.perf_counter() - start, NUMBER_OF_FILES, tree_size)
+
+    store = InputStore(gateway)
+    for label in ["Incremental, cold store", "Incremental, unchanged tree", "Incremental, one file changed"]:
+        if label.endswith("changed"):
+            with open(os.path.join(TREE_DIR, "dir_000", "file_00000.bin"), "wb") as f:
+                f.write(os.urandom(FILE_SIZE))
+        job = create_job(gateway, "demo_incremental_inputs_job")
+        start = time.perf_counter()
+        stats = store.sync_job(job)
+        job_id = gateway.submitJob(job)
+        print_run(label, time.perf_counter() - start, stats["uploaded_files"], stats["uploaded_bytes"])
+        print(f"{'':<36} {stats['hashed']} of {stats['files']} files hashed")
+
+    print("\nGetting the output of the last job...")
+    print(gateway.getJobOutput(job_id))
+
+except Exception as e:
+    print(f"Error during the incremental inputs demo: {e}")
+finally:
+    shutil.rmtree(TREE_DIR, ignore_errors=True)
+    gateway.close()
+    print("Disconnected and finished.")
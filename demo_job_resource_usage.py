@@ -0,0 +1,199 @@
+"""
+This script demonstrates how to measure the exact resources consumed by each task of a ProActive job, instead of estimating them from host-wide metrics. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway.
+- Wrapping of each Python task implementation with a resource accounting prologue and epilogue, using `wrap_with_resource_accounting()`. On the executing node, the wrapper records the wall time, the CPU-seconds (user and system), the peak RSS (the lifetime high-water mark of the task process) and the I/O bytes of the task process and of its terminated child processes (e.g. the `pip install` subprocess).
+- Attachment of these measurements to the task results through the job `resultMap`, under the `PA_RESOURCE_USAGE_<task name>` keys.
+- Retrieval of the per-task and per-job usage with `getJobResourceUsage(gateway, job_id)`.
+- Implementation of proper error handling and gateway connection management.
+
+Unlike demo_monitoring_job_metrics.py, which times the polling loop and reads the node metrics over a coarse `TimeRange`, the numbers reported here only account for the processes of the job's own tasks.
+"""
+
+import json
+import logging
+import humanize
+
+from proactive import getProActiveGateway
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('JobResourceUsage')
+
+# Prefix of the resultMap keys holding the resource usage of each task
+RESOURCE_USAGE_PREFIX = "PA_RESOURCE_USAGE_"
+
+# Code running the task implementation with resource accounting
+RESOURCE_ACCOUNTING_TEMPLATE = '''
+import json as _ra_json
+import resource as _ra_resource
+import time as _ra_time
+
+def _ra_io_bytes():
+    """Return the bytes read and written by the task process, from /proc when available."""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        return int(counters["read_bytes"]), int(counters["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        usage = _ra_resource.getrusage(_ra_resource.RUSAGE_SELF)
+        return usage.ru_inblock * 512, usage.ru_oublock * 512
+
+_ra_source = {source!r}
+_ra_start_wall = _ra_time.time()
+_ra_start_self = _ra_resource.getrusage(_ra_resource.RUSAGE_SELF)
+_ra_start_children = _ra_resource.getrusage(_ra_resource.RUSAGE_CHILDREN)
+_ra_start_io = _ra_io_bytes()
+try:
+    exec(compile(_ra_source, "<task:{task_name}>", "exec"), globals())
+finally:
+    _ra_end_wall = _ra_time.time()
+    _ra_end_self = _ra_resource.getrusage(_ra_resource.RUSAGE_SELF)
+    _ra_end_children = _ra_resource.getrusage(_ra_resource.RUSAGE_CHILDREN)
+    _ra_end_io = _ra_io_bytes()
+    _ra_children_io = (_ra_end_children.ru_inblock - _ra_start_children.ru_inblock,
+                       _ra_end_children.ru_oublock - _ra_start_children.ru_oublock)
+    resultMap.put("{key}", _ra_json.dumps({{
+        "task_name": "{task_name}",
+        "start_time": _ra_start_wall,
+        "end_time": _ra_end_wall,
+        "wall_time_s": _ra_end_wall - _ra_start_wall,
+        "cpu_user_s": (_ra_end_self.ru_utime - _ra_start_self.ru_utime) + (_ra_end_children.ru_utime - _ra_start_children.ru_utime),
+        "cpu_system_s": (_ra_end_self.ru_stime - _ra_start_self.ru_stime) + (_ra_end_children.ru_stime - _ra_start_children.ru_stime),
+        "peak_rss_bytes": max(_ra_end_self.ru_maxrss, _ra_end_children.ru_maxrss) * 1024,
+        "io_read_bytes": (_ra_end_io[0] - _ra_start_io[0]) + _ra_children_io[0] * 512,
+        "io_write_bytes": (_ra_end_io[1] - _ra_start_io[1]) + _ra_children_io[1] * 512,
+    }}))
+'''
+
+def wrap_with_resource_accounting(task_name, implementation):
+    """
+    Wrap a Python task implementation so that its resource usage is measured on the node.
+
+    The implementation is embedded as a string and run with exec(), so that its code, including
+    multi-line string literals, is executed unchanged.
+
+    The peak RSS is the high-water mark (ru_maxrss) of the task process over its whole lifetime, including
+    the memory used before the implementation started, or of its largest terminated child process. Unlike
+    the other measurements, it is not a delta over the execution of the implementation.
+
+    Args:
+        task_name (str): Name of the task, used as the resultMap key suffix
+        implementation (str): The Python task implementation
+
+    Returns:
+        str: The wrapped implementation, to be passed to task.setTaskImplementation()
+    """
+    return RESOURCE_ACCOUNTING_TEMPLATE.format(
+        source=implementation,
+        key=RESOURCE_USAGE_PREFIX + task_name,
+        task_name=task_name
+    )
+
+def getJobResourceUsage(gateway, job_id, timeout=60000):
+    """
+    Return the resource usage of a job whose tasks were wrapped with wrap_with_resource_accounting().
+
+    Args:
+        gateway: The ProActive gateway
+        job_id (int): The ID of the job
+        timeout (int, optional): The timeout in milliseconds for waiting for the job to finish. Defaults to 60000
+
+    Returns:
+        dict: {'tasks': {task_name: usage}, 'job': totals} where the job totals sum the CPU-seconds
+        and I/O bytes of all tasks, keep the highest peak RSS (lifetime high-water mark of the task processes) and span the first start to the last end.
+    """
+    result_map = gateway.getJobResultMap(job_id, timeout)
+    tasks = {}
+    for key in result_map.keySet():
+        if str(key).startswith(RESOURCE_USAGE_PREFIX):
+            usage = json.loads(str(result_map.get(key)))
+            tasks[usage["task_name"]] = usage
+
+    job = {}
+    if tasks:
+        usages = tasks.values()
+        job = {
+            "wall_time_s": max(u["end_time"] for u in usages) - min(u["start_time"] for u in usages),
+            "cpu_user_s": sum(u["cpu_user_s"] for u in usages),
+            "cpu_system_s": sum(u["cpu_system_s"] for u in usages),
+            "peak_rss_bytes": max(u["peak_rss_bytes"] for u in usages),
+            "io_read_bytes": sum(u["io_read_bytes"] for u in usages),
+            "io_write_bytes": sum(u["io_write_bytes"] for u in usages),
+        }
+    return {"tasks": tasks, "job": job}
+
+def print_usage(label, usage):
+    """Print the resource usage of a task or a job."""
+    cpu_seconds = usage["cpu_user_s"] + usage["cpu_system_s"]
+    print(f"\n{label}:")
+    print("-" * 40)
+    print(f"Wall Time....... {usage['wall_time_s']:.2f} s")
+    print(f"CPU Time........ {cpu_seconds:.2f} s (user {usage['cpu_user_s']:.2f} s, system {usage['cpu_system_s']:.2f} s)")
+    if usage['wall_time_s'] > 0:
+        print(f"CPU Utilization. {100 * cpu_seconds / usage['wall_time_s']:.1f}% of one core")
+    print(f"Peak RSS........ {humanize.naturalsize(usage['peak_rss_bytes'], binary=True)}")
+    print(f"I/O Read........ {humanize.naturalsize(usage['io_read_bytes'], binary=True)}")
+    print(f"I/O Written..... {humanize.naturalsize(usage['io_write_bytes'], binary=True)}")
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    logger.info("Connected to ProActive server.")
+
+    # Create a job with a CPU intensive task and a RAM intensive task
+    job = gateway.createJob("Job_Resource_Usage")
+
+    cpu_task = gateway.createPythonTask("CpuIntensiveTask")
+    cpu_task.setTaskImplementation(wrap_with_resource_accounting("CpuIntensiveTask", '''
+import subprocess
+import sys
+
+# Ensure numpy is installed
+subprocess.check_call([sys.executable, "-m", "pip", "install", "--user", "numpy"])
+
+import numpy as np
+
+print("Generating high CPU usage...")
+for _ in range(20):
+    matrix = np.random.random((3000, 3000))
+    np.dot(matrix, matrix)
+print("Task completed.")
+'''))
+
+    ram_task = gateway.createPythonTask("RamIntensiveTask")
+    ram_task.addDependency(cpu_task)
+    ram_task.setTaskImplementation(wrap_with_resource_accounting("RamIntensiveTask", '''
+import numpy as np
+import time
+
+print("Generating high RAM usage...")
+large_data = np.ones((50000000,), dtype=np.float32)
+time.sleep(10)
+print("Task completed.")
+'''))
+
+    job.addTask(cpu_task)
+    job.addTask(ram_task)
+
+    # Submit the job
+    logger.info("Submitting the job to the ProActive scheduler...")
+    job_id = gateway.submitJob(job)
+    logger.info(f"Job submitted with ID: {job_id}")
+
+    # Wait for the job and collect its resource usage
+    logger.info("Waiting for the job to finish...")
+    resource_usage = getJobResourceUsage(gateway, job_id, timeout=600000)
+
+    for task_name, usage in resource_usage["tasks"].items():
+        print_usage(f"Task {task_name}", usage)
+    if resource_usage["job"]:
+        print_usage(f"Job {job_id}", resource_usage["job"])
+    else:
+        logger.warning("No resource usage was reported by the tasks.")
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway.close()
+    logger.info("Disconnected and finished.")
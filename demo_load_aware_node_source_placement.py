@@ -0,0 +1,229 @@
+"""
+This script demonstrates how to place jobs on node sources according to their live load, and compares it with the placement of `executeJobsAcrossNodeSources`. It provides a practical example of how to:
+
+- Connect to the ProActive server using the SDK.
+- Read the Resource Manager state (free and busy nodes per node source) from the `/rm/monitoring` REST endpoint.
+- Sample the live free CPU and free RAM of the hosts of each node source concurrently with the monitoring client, skipping the hosts that cannot be sampled.
+- Read the pending jobs of the scheduler, from all users, with `getAllJobs()`, to know how many jobs are already queued on each node source.
+- Rank the node sources by free nodes, free CPU, free RAM and the number of jobs queued on them.
+- Target each job to the best ranked node source with the `NODE_SOURCE` generic information shown in demo_node_source.py, submitting several jobs to the same node source when it has several free nodes.
+- Benchmark the makespan of the same workload with `executeJobsAcrossNodeSources` (one job at a time per node source, no load information) and with the load-aware placement.
+- Handle exceptions and ensure clean disconnection from the gateway.
+"""
+import os
+import time
+import logging
+import urllib3
+import requests
+
+from concurrent.futures import ThreadPoolExecutor
+from proactive import getProActiveGateway
+from proactive.monitoring.ProactiveNodeMBeanClient import ProactiveNodeMBeanClient, CPUMetric, MemoryMetric
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_load_aware_node_source_placement")
+
+# Specify which node sources to use (None to use all of them)
+NODE_SOURCES = None
+
+# Seconds between two refreshes of the node source loads
+LOAD_REFRESH_INTERVAL = 10
+
+# Score removed from a node source for each job queued on it
+QUEUE_PENALTY = 25
+
+# Seconds between two polls of the job states
+POLL_INTERVAL = 1
+
+FINAL_STATES = ["FINISHED", "CANCELED", "FAILED", "KILLED"]
+
+def get_node_source_loads(gateway, node_sources=None):
+    """
+    Return the load of each node source.
+
+    Returns:
+        dict: Maps each node source name to {'free_nodes', 'total_nodes', 'free_cpu', 'free_ram'},
+        free_cpu and free_ram being averaged over the hosts of the node source, in percent.
+    """
+    response = requests.get(
+        f"{gateway.getBaseURL()}/rest/rm/monitoring",
+        headers={"sessionid": gateway.getSession()},
+        verify=False
+    )
+    response.raise_for_status()
+
+    loads = {}
+    jmx_urls = {}
+    for node in response.json().get("nodesEvents", []):
+        source = node.get("nodeSource")
+        if not source or node.get("eventType") == "NODE_REMOVED":
+            continue
+        if node_sources is not None and source not in node_sources:
+            continue
+        load = loads.setdefault(source, {"free_nodes": 0, "total_nodes": 0, "free_cpu": 0.0, "free_ram": 0.0})
+        load["total_nodes"] += 1
+        if node.get("nodeState") == "FREE":
+            load["free_nodes"] += 1
+        if node.get("proactiveJMXUrl"):
+            jmx_urls.setdefault(source, set()).add(node["proactiveJMXUrl"])
+
+    def sample_host(jmx_url):
+        try:
+            client = ProactiveNodeMBeanClient(gateway, jmx_url)
+            return (100.0 - client.get_cpu_metrics(CPUMetric.COMBINED),
+                    100.0 - client.get_memory_metrics(MemoryMetric.USED_PERCENT))
+        except Exception as e:
+            logger.warning(f"Skipping the host {jmx_url}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for source, urls in jmx_urls.items():
+            samples = [sample for sample in executor.map(sample_host, urls) if sample is not None]
+            if samples:
+                loads[source]["free_cpu"] = sum(cpu for cpu, _ in samples) / len(samples)
+                loads[source]["free_ram"] = sum(ram for _, ram in samples) / len(samples)
+    return loads
+
+def get_pending_jobs(gateway, node_sources=None, max_number_of_jobs=1000):
+    """
+    Return the number of pending jobs of the scheduler, from all users, targeting each node source.
+
+    The pending jobs without a NODE_SOURCE generic information are not counted, since they weigh
+    the same on every node source.
+    """
+    pending = {}
+    for job_info in gateway.getAllJobs(max_number_of_jobs, my_jobs_only=False, pending=True, running=False):
+        source = job_info.getGenericInformation().get("NODE_SOURCE")
+        if source and (node_sources is None or source in node_sources):
+            pending[source] = pending.get(source, 0) + 1
+    return pending
+
+def rank_node_sources(loads, queued, claimed):
+    """
+    Rank the node sources, best first.
+
+    Node sources with a free node not yet claimed by a job submitted since the last load
+    refresh come first, then the higher the free CPU and RAM and the fewer jobs queued
+    on them, the better.
+    """
+    def score(source):
+        load = loads[source]
+        available = load["free_nodes"] - claimed.get(source, 0)
+        return (available > 0,
+                0.5 * load["free_cpu"] + 0.5 * load["free_ram"] - QUEUE_PENALTY * queued.get(source, 0))
+    return sorted(loads, key=score, reverse=True)
+
+def execute_jobs_load_aware(gateway, proactive_jobs, node_sources=None):
+    """
+    Execute the jobs, each one on the best ranked node source at the time of its submission.
+
+    Returns:
+        List[dict]: A list of {'job_id', 'job_state', 'node_source'} dictionaries.
+    """
+    if not proactive_jobs:
+        raise ValueError("proactive_jobs cannot be empty")
+
+    job_queue = list(proactive_jobs)
+    active_jobs = {}
+    job_results = []
+    loads, last_refresh = None, 0
+    claimed, pending = {}, {}
+
+    while job_queue or active_jobs:
+        # Collect the finished jobs
+        for job_id, source in list(active_jobs.items()):
+            job_status = gateway.getJobStatus(job_id)
+            if job_status.upper() in FINAL_STATES:
+                job_results.append({'job_id': job_id, 'job_state': job_status, 'node_source': source})
+                del active_jobs[job_id]
+
+        # Refresh the node source loads
+        if job_queue and time.monotonic() - last_refresh >= LOAD_REFRESH_INTERVAL:
+            loads = get_node_source_loads(gateway, node_sources)
+            pending = get_pending_jobs(gateway, node_sources)
+            last_refresh = time.monotonic()
+            claimed = {}
+            if not loads:
+                raise RuntimeError("No available node sources were found.")
+
+        # Place the queued jobs while some node source has a free node
+        while job_queue:
+            # Pending jobs of the scheduler at the last refresh, and jobs submitted since then
+            queued = {source: pending.get(source, 0) + claimed.get(source, 0) for source in loads}
+            best = rank_node_sources(loads, queued, claimed)[0]
+            if loads[best]["free_nodes"] - claimed.get(best, 0) <= 0 and active_jobs:
+                break
+            job = job_queue.pop(0)
+            job.addGenericInformation("NODE_SOURCE", best)
+            job_id = gateway.submitJob(job)
+            active_jobs[job_id] = best
+            claimed[best] = claimed.get(best, 0) + 1
+            logger.info(f"Job {job_id} submitted to {best} (free CPU: {loads[best]['free_cpu']:.1f}%, "
+                        f"free RAM: {loads[best]['free_ram']:.1f}%, queued: {queued.get(best, 0)})")
+
+        if job_queue or active_jobs:
+            time.sleep(POLL_INTERVAL)
+
+    return job_results
+
+def create_jobs(gateway, prefix):
+    """Create a workload of jobs with different durations and CPU needs."""
+    jobs = []
+    for i in range(8):
+        job = gateway.createJob(f"{prefix}_{i}")
+        task = gateway.createPythonTask(f"Task_{i}")
+        task.setTaskImplementation(f'''
+import time
+start = time.time()
+print("Starting task {i}...")
+while time.time() - start < {5 + 5 * (i % 3)}:
+    sum(x * x for x in range(10000))
+print("Finished task {i}")
+''')
+        job.addTask(task)
+        jobs.append(job)
+    return jobs
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    # Display the current node source loads
+    print("\nNode source loads:")
+    print("-" * 60)
+    for source, load in get_node_source_loads(gateway, NODE_SOURCES).items():
+        print(f"{source}: {load['free_nodes']}/{load['total_nodes']} free nodes, "
+              f"free CPU {load['free_cpu']:.1f}%, free RAM {load['free_ram']:.1f}%")
+
+    # Current strategy
+    logger.info("Running the workload with executeJobsAcrossNodeSources...")
+    start = time.monotonic()
+    baseline_results = gateway.executeJobsAcrossNodeSources(create_jobs(gateway, "BaselineJob"), NODE_SOURCES)
+    baseline_makespan = time.monotonic() - start
+
+    # Load-aware strategy
+    logger.info("Running the workload with the load-aware placement...")
+    start = time.monotonic()
+    load_aware_results = execute_jobs_load_aware(gateway, create_jobs(gateway, "LoadAwareJob"), NODE_SOURCES)
+    load_aware_makespan = time.monotonic() - start
+
+    for result in load_aware_results:
+        logger.info(f"Job ID: {result['job_id']}, State: {result['job_state']}, Node Source: {result['node_source']}")
+
+    print("\nMakespan Comparison:")
+    print("-" * 40)
+    print(f"executeJobsAcrossNodeSources.. {baseline_makespan:.1f} s ({len(baseline_results)} jobs)")
+    print(f"Load-aware placement.......... {load_aware_makespan:.1f} s ({len(load_aware_results)} jobs)")
+    if load_aware_makespan > 0:
+        print(f"Speedup....................... x{baseline_makespan / load_aware_makespan:.2f}")
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,189 @@
+"""
+This script demonstrates how to analyze historical hardware metrics of a ProActive node with NumPy. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway and retrieval of the monitoring client.
+- Conversion of the historical CPU and memory series returned by `get_cpu_metrics()` and `get_memory_metrics()` into NumPy arrays of timestamps and values.
+- Vectorized statistics (average, percentiles, peak and minimum) computed on a masked array where zero samples are ignored, replacing the `sum()/len()`, `max()` and `min()` list reductions used by demo_hardware_metrics.py.
+- Downsampling of long series with two strategies: bucket averaging and Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape of the series.
+- A benchmark comparing pure Python statistics with the vectorized ones on a synthetic one-year series at one-minute resolution.
+- Implementation of proper error handling and gateway connection management.
+
+This script requires NumPy on the client side (`python3 -m pip install numpy`).
+"""
+
+import time
+import random
+import humanize
+import numpy as np
+
+from proactive import getProActiveGateway
+from proactive.monitoring.ProactiveNodeMBeanClient import TimeRange, CPUMetric, MemoryMetric
+
+# Duration in seconds covered by each TimeRange
+TIME_RANGE_SECONDS = {
+    TimeRange.MINUTE_1: 60,
+    TimeRange.MINUTE_5: 5 * 60,
+    TimeRange.MINUTE_10: 10 * 60,
+    TimeRange.MINUTE_30: 30 * 60,
+    TimeRange.HOUR_1: 3600,
+    TimeRange.HOUR_2: 2 * 3600,
+    TimeRange.HOUR_4: 4 * 3600,
+    TimeRange.HOUR_8: 8 * 3600,
+    TimeRange.DAY_1: 86400,
+    TimeRange.WEEK_1: 7 * 86400,
+    TimeRange.MONTH_1: 30 * 86400,
+    TimeRange.YEAR_1: 365 * 86400,
+}
+
+# Number of points kept when downsampling a series for display
+DOWNSAMPLE_POINTS = 100
+
+def to_series(values, time_range, end_time=None):
+    """
+    Convert a historical metric list into NumPy arrays of timestamps and values.
+
+    The monitoring REST API returns evenly spaced samples covering the requested
+    time range and ending now, so the timestamps are rebuilt from the range length.
+
+    Returns:
+        tuple: (timestamps, values) as float64 arrays, timestamps in seconds since the epoch.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if end_time is None:
+        end_time = time.time()
+    step = TIME_RANGE_SECONDS[time_range] / max(len(values), 1)
+    timestamps = end_time - step * np.arange(len(values) - 1, -1, -1, dtype=np.float64)
+    return timestamps, values
+
+def mask_zeros(values):
+    """Return a masked array where zero samples (no data collected) are ignored."""
+    return np.ma.masked_equal(values, 0.0)
+
+def summarize(values, percentiles=(50, 95, 99)):
+    """
+    Compute the average, percentiles, peak and minimum of a series, ignoring zero samples.
+
+    Returns:
+        dict: Statistics of the series, or None if the series has no non-zero sample.
+    """
+    samples = mask_zeros(values).compressed()
+    if samples.size == 0:
+        return None
+    stats = {
+        "avg": float(samples.mean()),
+        "peak": float(samples.max()),
+        "min": float(samples.min()),
+    }
+    for p, value in zip(percentiles, np.percentile(samples, percentiles)):
+        stats[f"p{p}"] = float(value)
+    return stats
+
+def bucket_downsample(timestamps, values, n_buckets):
+    """Downsample a series by averaging its values over n_buckets equally sized buckets."""
+    if len(values) <= n_buckets:
+        return timestamps, values
+    edges = np.linspace(0, len(values), n_buckets + 1).astype(np.int64)[:-1]
+    counts = np.diff(np.append(edges, len(values)))
+    return (np.add.reduceat(timestamps, edges) / counts,
+            np.add.reduceat(values, edges) / counts)
+
+def lttb_downsample(timestamps, values, threshold):
+    """
+    Downsample a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are kept, and for each bucket the point forming the
+    largest triangle with the previously selected point and the average of the next
+    bucket is selected. The triangle areas of a bucket are computed in one vectorized step.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return timestamps, values
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_t = timestamps[next_start:next_end].mean()
+        avg_v = values[next_start:next_end].mean()
+        areas = np.abs(
+            (timestamps[previous] - avg_t) * (values[start:end] - values[previous])
+            - (timestamps[previous] - timestamps[start:end]) * (avg_v - values[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return timestamps[selected], values[selected]
+
+def print_stats(label, stats):
+    """Print the statistics of a series."""
+    if stats is None:
+        print(f"No {label.lower()} data collected.")
+        return
+    print(f"Average {label} Usage.. {stats['avg']:.1f}%")
+    print(f"Median {label} Usage... {stats['p50']:.1f}%")
+    print(f"P95 {label} Usage...... {stats['p95']:.1f}%")
+    print(f"Peak {label} Usage..... {stats['peak']:.1f}%")
+    print(f"Minimum {label} Usage.. {stats['min']:.1f}%")
+
+# Initialize gateway and client
+gateway = getProActiveGateway()
+monitoring_client = gateway.getProactiveMonitoringClient()
+
+print("\nCurrent ProActive JMX URL:")
+print(f"JMX URL: {monitoring_client.node_url}")
+
+try:
+    for label, time_range in [("last 5 minutes", TimeRange.MINUTE_5), ("last year", TimeRange.YEAR_1)]:
+        historical_cpu = monitoring_client.get_cpu_metrics(CPUMetric.COMBINED, historical=True, time_range=time_range)
+        historical_mem = monitoring_client.get_memory_metrics(MemoryMetric.USED_PERCENT, historical=True, time_range=time_range)
+        cpu_timestamps, cpu_values = to_series(historical_cpu, time_range)
+        mem_timestamps, mem_values = to_series(historical_mem, time_range)
+
+        print(f"\nHistorical Usage ({label}, {len(cpu_values)} samples):")
+        print("-" * 40)
+        print_stats("CPU", summarize(cpu_values))
+        print_stats("Memory", summarize(mem_values))
+
+        # Downsample the CPU series for display
+        _, lttb_values = lttb_downsample(cpu_timestamps, cpu_values, DOWNSAMPLE_POINTS)
+        _, bucket_values = bucket_downsample(cpu_timestamps, cpu_values, DOWNSAMPLE_POINTS)
+        print(f"CPU series downsampled to {len(lttb_values)} points (LTTB), peak kept: {lttb_values.max() if lttb_values.size else 0:.1f}%")
+        print(f"CPU series downsampled to {len(bucket_values)} points (buckets), peak kept: {bucket_values.max() if bucket_values.size else 0:.1f}%")
+
+    # Benchmark pure Python statistics against vectorized ones on a one-year, one-minute series
+    print("\nBenchmark (synthetic one-year series at one-minute resolution):")
+    print("-" * 40)
+    n_samples = TIME_RANGE_SECONDS[TimeRange.YEAR_1] // 60
+    python_series = [random.random() * 100 if random.random() > 0.1 else 0.0 for _ in range(n_samples)]
+    timestamps, numpy_series = to_series(python_series, TimeRange.YEAR_1)
+
+    start = time.perf_counter()
+    values = [v for v in python_series if v > 0]
+    python_stats = (sum(values) / len(values), max(values), min(values), sorted(values)[int(len(values) * 0.95)])
+    python_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    numpy_stats = summarize(numpy_series)
+    numpy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    lttb_downsample(timestamps, numpy_series, DOWNSAMPLE_POINTS)
+    lttb_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Samples............ {n_samples}")
+    print(f"List size.......... {humanize.naturalsize(len(python_series) * 32, binary=True)} (approx.)")
+    print(f"Array size......... {humanize.naturalsize(numpy_series.nbytes, binary=True)}")
+    print(f"Python statistics.. {python_ms:.1f} ms")
+    print(f"NumPy statistics... {numpy_ms:.1f} ms")
+    print(f"LTTB downsampling.. {lttb_ms:.1f} ms")
+    print(f"Same average....... {abs(python_stats[0] - numpy_stats['avg']) < 1e-6}")
+
+except Exception as e:
+    print(f"\nError during monitoring: {str(e)}")
+finally:
+    gateway.close()
+    print("\nDisconnected and finished.")
@@ -0,0 +1,213 @@
+"""
+This script demonstrates how to query the hardware metrics of a ProActive node over an arbitrary time window, with the aggregation computed inside the cluster. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway and retrieval of the monitoring client.
+- Definition of a `query_metrics()` helper taking explicit `start` and `end` timestamps, a `step` in seconds and a list of aggregations (`avg`, `min`, `max`, `sum`, `count` or any percentile such as `p95`).
+- Submission of a Python task that fetches the node history from the Resource Manager REST API within the cluster, keeps only the samples of the requested window, and aggregates them per step.
+- Retrieval of the aggregated rows only, as the task result, so the client downloads one row per step instead of the whole `TimeRange` series.
+- Display of the aggregated CPU and memory usage over the last 61 minutes with a 5 minute step.
+- Implementation of proper error handling and gateway connection management.
+
+The history is stored by the Resource Manager with the fixed `TimeRange` resolutions, so the task reads the smallest range covering the window (e.g. 2 hours for a 61-minute window) and discards the rest on the cluster side.
+
+Each query is a scheduler job, which adds the scheduling and task start-up latency (typically a few seconds) to every query. This pays off when the history of the covering range is large compared to the aggregated rows (long windows, week to year ranges, or slow links between the client and the cluster), since only the rows leave the cluster. For short windows over the minute and hour ranges, reading the history with the monitoring client and aggregating it on the client side, as in demo_metrics_numpy_series.py, is faster.
+"""
+
+import json
+import time
+import logging
+
+from proactive import getProActiveGateway, ProactiveScriptLanguage
+from proactive.monitoring.ProactiveNodeMBeanClient import TimeRange, CPUMetric, MemoryMetric, MBeanObjectNames
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('MetricsTimeWindowQuery')
+
+# Duration in seconds covered by each TimeRange, shortest first
+TIME_RANGE_SECONDS = {
+    TimeRange.MINUTE_1: 60,
+    TimeRange.MINUTE_5: 5 * 60,
+    TimeRange.MINUTE_10: 10 * 60,
+    TimeRange.MINUTE_30: 30 * 60,
+    TimeRange.HOUR_1: 3600,
+    TimeRange.HOUR_2: 2 * 3600,
+    TimeRange.HOUR_4: 4 * 3600,
+    TimeRange.HOUR_8: 8 * 3600,
+    TimeRange.DAY_1: 86400,
+    TimeRange.WEEK_1: 7 * 86400,
+    TimeRange.MONTH_1: 30 * 86400,
+    TimeRange.YEAR_1: 365 * 86400,
+}
+
+# Pre-script retrieving the session and the REST URL of the scheduler from within the task
+SESSION_PRE_SCRIPT = """
+schedulerapi.connect()
+def sessionId = schedulerapi.getSession()
+
+def connectionInfo = schedulerapi.getConnectionInfo()
+def url = new URL(connectionInfo.getUrl())
+def proactiveUrl = url.getProtocol() + "://" + url.getHost() + ":" + url.getPort()
+
+variables.put("SESSION_ID", sessionId)
+variables.put("PROACTIVE_URL", proactiveUrl)
+"""
+
+# Task implementation fetching and aggregating the history within the cluster
+QUERY_TASK_IMPLEMENTATION = """
+import json
+import math
+import ssl
+import time
+import urllib.parse
+import urllib.request
+
+query = json.loads(variables.get("METRICS_QUERY"))
+start, end, step = query["start"], query["end"], query["step"]
+now = time.time()
+
+# Pick the smallest time range that covers the start of the window
+range_code, range_seconds = next(((code, seconds) for code, seconds in query["time_ranges"] if seconds >= now - start),
+                                 query["time_ranges"][-1])
+
+params = urllib.parse.urlencode({
+    "nodejmxurl": query["node_url"],
+    "objectname": query["mbean"],
+    "attrs": query["attribute"],
+    "range": range_code,
+})
+request = urllib.request.Request(variables.get("PROACTIVE_URL") + "/rest/rm/node/mbeans/history?" + params,
+                                 headers={"sessionid": variables.get("SESSION_ID")})
+context = ssl._create_unverified_context()
+with urllib.request.urlopen(request, context=context) as response:
+    history = json.loads(response.read().decode("utf-8"))
+
+values = [float(v) * query["scale"] for v in json.loads(history.get(query["mbean"], "{}")).get(query["key"], [])]
+
+# Rebuild the timestamps of the evenly spaced samples, the last one being now
+sample_step = range_seconds / max(len(values), 1)
+buckets = {}
+for i, value in enumerate(values):
+    timestamp = now - sample_step * (len(values) - 1 - i)
+    if start <= timestamp < end and value > 0:
+        buckets.setdefault(int((timestamp - start) // step), []).append(value)
+
+def aggregate(samples, name):
+    if name == "avg":
+        return sum(samples) / len(samples)
+    if name == "min":
+        return min(samples)
+    if name == "max":
+        return max(samples)
+    if name == "sum":
+        return sum(samples)
+    if name == "count":
+        return len(samples)
+    if name.startswith("p"):
+        ordered = sorted(samples)
+        rank = (len(ordered) - 1) * float(name[1:]) / 100
+        low, high = int(math.floor(rank)), int(math.ceil(rank))
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    raise ValueError("Unsupported aggregation: " + name)
+
+rows = []
+for index in sorted(buckets):
+    row = {"start": start + index * step}
+    for name in query["aggregations"]:
+        row[name] = aggregate(buckets[index], name)
+    rows.append(row)
+
+print("Aggregated", len(values), "samples of the", range_code, "range into", len(rows), "rows")
+result = json.dumps({"samples": len(values), "rows": rows})
+"""
+
+def get_metric_query(metric):
+    """Return the MBean name, the historical key and the scale factor of a metric."""
+    if isinstance(metric, CPUMetric):
+        return MBeanObjectNames.CPU_USAGE, f"{metric.value}CpuUsage", 100
+    if isinstance(metric, MemoryMetric):
+        return MBeanObjectNames.MEMORY_USAGE, f"{metric.value}Mem", 1
+    raise ValueError(f"Unsupported metric: {metric}")
+
+def query_metrics(gateway, node_url, metric, start, end, step, aggregations=("avg", "max", "p95"), timeout=120000):
+    """
+    Query a metric of a node over [start, end) and aggregate it per step within the cluster.
+
+    Args:
+        gateway: The ProActive gateway
+        node_url (str): JMX URL of the node, as returned by list_proactive_jmx_urls()
+        metric (CPUMetric or MemoryMetric): The metric to query
+        start (float): Start of the window, in seconds since the epoch
+        end (float): End of the window, in seconds since the epoch
+        step (int): Aggregation step in seconds
+        aggregations (iterable): Aggregations computed per step, among avg, min, max, sum, count and pXX
+        timeout (int, optional): The timeout in milliseconds for waiting for the query task. Defaults to 120000
+
+    Returns:
+        dict: {'samples': number of samples read by the task, 'rows': [{'start': ..., <aggregation>: ...}]}.
+        Steps without any sample are omitted.
+
+    Raises:
+        ValueError: If the window or the step is invalid
+    """
+    if end <= start:
+        raise ValueError("end must be greater than start")
+    if step <= 0:
+        raise ValueError("step must be positive")
+
+    mbean, key, scale = get_metric_query(metric)
+    query = {
+        "node_url": node_url,
+        "mbean": mbean,
+        "attribute": metric.value,
+        "key": key,
+        "scale": scale,
+        "start": start,
+        "end": end,
+        "step": step,
+        "aggregations": list(aggregations),
+        "time_ranges": [(time_range.value, seconds) for time_range, seconds in TIME_RANGE_SECONDS.items()],
+    }
+
+    job = gateway.createJob("metrics_time_window_query")
+    task = gateway.createPythonTask("MetricsQueryTask")
+    task.addVariable("METRICS_QUERY", json.dumps(query))
+    pre_script = gateway.createPreScript(ProactiveScriptLanguage().groovy())
+    pre_script.setImplementation(SESSION_PRE_SCRIPT)
+    task.setPreScript(pre_script)
+    task.setTaskImplementation(QUERY_TASK_IMPLEMENTATION)
+    job.addTask(task)
+
+    job_id = gateway.submitJob(job)
+    logger.info(f"Metrics query submitted as job {job_id}")
+    return json.loads(str(gateway.getTaskResult(job_id, "MetricsQueryTask", timeout)))
+
+def format_timestamp(timestamp):
+    """Format a timestamp as local time."""
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+# Initialize gateway and client
+gateway = getProActiveGateway()
+monitoring_client = gateway.getProactiveMonitoringClient()
+
+try:
+    # Query the last 61 minutes with a 5 minute step
+    end = time.time()
+    start = end - 61 * 60
+    step = 5 * 60
+    print(f"\nQuerying {monitoring_client.node_url}")
+    print(f"Window: {format_timestamp(start)} -> {format_timestamp(end)}, step: {step // 60} minutes")
+
+    for label, metric in [("CPU", CPUMetric.COMBINED), ("Memory", MemoryMetric.USED_PERCENT)]:
+        response = query_metrics(gateway, monitoring_client.node_url, metric, start, end, step,
+                                 aggregations=("avg", "max", "p95"))
+        print(f"\n{label} Usage ({response['samples']} samples read in the cluster, {len(response['rows'])} rows downloaded):")
+        print("-" * 40)
+        print(f"{'Start':<10}{'Avg':>8}{'Max':>8}{'P95':>8}")
+        for row in response["rows"]:
+            print(f"{format_timestamp(row['start']):<10}{row['avg']:>7.1f}%{row['max']:>7.1f}%{row['p95']:>7.1f}%")
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway.close()
+    logger.info("Disconnected and finished.")
@@ -0,0 +1,82 @@
+"""
+This script demonstrates how to bring back only the output files that the tasks created or modified, instead of `addOutputFile('demo_transf_file/**')` as in demo_transf_file.py and demo_decorators_transf_file.py, which copies the whole directory back although only 'file_count.txt' changed. The workflow includes:
+
+1. Initialization of the ProActive gateway.
+2. Creation of a job with the Bash task of demo_transf_file.py, counting the files of the 'demo_transf_file' directory into 'demo_transf_file/file_count.txt', and of a second task appending a line to an existing file. Both tasks declare `addInputFile('demo_transf_file/**')` and `addOutputFile('demo_transf_file/**')`.
+3. Attachment of the input files with `InputStore.sync_job()` and of the output files with `OutputStore.attach_job()` from the 'demo_file_sync' module. The post-script of each task hashes the files matching its output patterns, compares them with the input manifest of the task, pushes only the new or modified files to the user space and logs the transfer sizes.
+4. Submission of the job with `submitJob()` and retrieval of its output.
+5. Download with `OutputStore.fetch_job()` of the output files which differ from the local files, and display of the transfer sizes of each task against the size of the whole output directory.
+6. Disconnection from the gateway.
+The job works on a copy of the 'demo_transf_file' directory in a temporary directory, so the directory of the repository is never modified.
+"""
+import os
+import shutil
+import tempfile
+
+from proactive import getProActiveGateway
+from demo_file_sync.inputs import InputStore
+from demo_file_sync.outputs import OutputStore
+
+DIRECTORY = "demo_transf_file"
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+work_dir = tempfile.mkdtemp(prefix="demo_output_diff_")
+
+try:
+    shutil.copytree(DIRECTORY, os.path.join(work_dir, DIRECTORY))
+
+    print("Creating a proactive job...")
+    job = gateway.createJob("demo_output_diff_job")
+
+    print("Creating the proactive tasks...")
+    count_task = gateway.createTask(language="bash", task_name="count_files")
+    count_task.setTaskImplementation(f"""
+FILE_COUNT=$(find "./{DIRECTORY}" -type f | wc -l)
+echo "Number of files in {DIRECTORY}: $FILE_COUNT"
+echo "Number of files in {DIRECTORY}: $FILE_COUNT" > "./{DIRECTORY}/file_count.txt"
+""")
+    append_task = gateway.createTask(language="bash", task_name="append_line")
+    append_task.setTaskImplementation(f"""
+echo "Appended by $variables_PA_TASK_NAME" >> "./{DIRECTORY}/demo_file_1"
+""")
+    for task in [count_task, append_task]:
+        task.addInputFile(f"{DIRECTORY}/**")
+        task.addOutputFile(f"{DIRECTORY}/**")
+        job.addTask(task)
+
+    print("Uploading the input files and attaching the output files...")
+    input_store = InputStore(gateway)
+    output_store = OutputStore(gateway)
+    stats = input_store.sync_job(job, root=work_dir)
+    print(f"Input files: {stats['uploaded_files']} of {stats['files']} uploaded ({stats['uploaded_bytes']} bytes)")
+    output_store.attach_job(job)
+
+    print("Submitting the job to the proactive scheduler...")
+    job_id = gateway.submitJob(job)
+    print("job_id: " + str(job_id))
+
+    print("Getting job output...")
+    print(gateway.getJobOutput(job_id))
+
+    print("Fetching the new or modified output files...")
+    directory_size = sum(os.path.getsize(os.path.join(path, name))
+                         for path, _, names in os.walk(os.path.join(work_dir, DIRECTORY)) for name in names)
+    report = output_store.fetch_job(job_id, job, root=work_dir)
+    print(f"\n{'Task':<14} {'Files':>6} {'Changed':>8} {'Pushed':>10} {'Fetched':>10} {'Full copy':>10}")
+    print("-" * 64)
+    for task_name, task_report in report.items():
+        print(f"{task_name:<14} {task_report['files']:6d} {task_report['changed']:8d} "
+              f"{task_report['pushed_bytes']:9d}B {task_report['fetched_bytes']:9d}B {directory_size:9d}B")
+
+    for name in sorted(os.listdir(os.path.join(work_dir, DIRECTORY))):
+        print(f"\n{DIRECTORY}/{name}:")
+        with open(os.path.join(work_dir, DIRECTORY, name)) as f:
+            print(f.read().strip())
+
+except Exception as e:
+    print(f"Error during the output diff demo: {e}")
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+    gateway.close()
+    print("Disconnected and finished.")
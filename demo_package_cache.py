@@ -0,0 +1,83 @@
+"""
+This script demonstrates how to ship the Python packages of the tasks through a content-addressed cache in the node cache space, instead of `addInputFile('demo_python_module/**')` and `addInputFile('demo_exec_file/hellopkg/**')` as in demo_python_module.py and demo_exec_file.py, which transfer the package to every task of every job. The workflow includes:
+
+1. Packing of the 'demo_python_module' and 'demo_exec_file/hellopkg' packages with `pack()` from the 'demo_package_cache' module, twice, to show that the archives and their SHA-256 digests are reproducible.
+2. Initialization of the ProActive gateway, and upload of the archives to the user space with `PackageStore.upload()`, which skips the archives already stored.
+3. Submission of a baseline job of NUMBER_OF_TASKS tasks importing 'demo_python_module' and of the 'demo_exec_file' task, with the packages as input files.
+4. Submission of the same job twice with `PackageStore.attach()`, which appends the scripts/package_cache.groovy fork environment script to the tasks. On each node, the script extracts each archive into "<cachespace>/packages/<sha256>" on a hash miss only, adds these directories to the PYTHONPATH of the task, and evicts the least recently used packages when the cache is larger than CACHE_MAX_SIZE_MB.
+5. Display of the duration of each job, and of the cache hits and misses reported in the output of the last job.
+6. Disconnection from the gateway.
+"""
+import time
+
+from proactive import getProActiveGateway
+from demo_package_cache.packages import PackageStore, pack
+
+PACKAGES = ["demo_python_module", "demo_exec_file/hellopkg"]
+
+# Number of tasks importing demo_python_module in each job
+NUMBER_OF_TASKS = 8
+
+# Size cap of the package cache of each node
+CACHE_MAX_SIZE_MB = 256
+
+def create_job(gateway, name, store=None):
+    job = gateway.createJob(name)
+    tasks = []
+    for i in range(NUMBER_OF_TASKS):
+        task = gateway.createPythonTask(f"demo_python_module_task_{i}")
+        task.addInputFile('demo_python_module/**')
+        task.setTaskImplementation("""
+import os, sys
+sys.path.append(os.getcwd())
+from demo_python_module.mymodule import add_numbers
+print("1 + 2 =", add_numbers(1, 2), "from", sys.modules["demo_python_module"].__file__)
+""")
+        tasks.append((task, ["demo_python_module"]))
+    task = gateway.createPythonTask("demo_exec_file_task")
+    task.setTaskExecutionFromFile('demo_exec_file/main.py', ['param1', 'param2'])
+    task.addInputFile('demo_exec_file/hellopkg/**')
+    tasks.append((task, ["demo_exec_file/hellopkg"]))
+
+    for task, packages in tasks:
+        if store is not None:
+            store.attach(task, packages, max_size_mb=CACHE_MAX_SIZE_MB)
+        job.addTask(task)
+    return job
+
+def run_job(gateway, job):
+    start = time.monotonic()
+    job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+    output = gateway.getJobOutput(job_id)
+    return job_id, time.monotonic() - start, output
+
+print("Packing the packages...")
+for path in PACKAGES:
+    (data, digest), (_, digest_again) = pack(path), pack(path)
+    print(f"{path:<26} {len(data):8d} bytes  sha256={digest[:16]}...  reproducible: {digest == digest_again}")
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    store = PackageStore(gateway)
+    for path in PACKAGES:
+        digest, uploaded = store.upload(path)
+        print(f"{path:<26} {'uploaded' if uploaded else 'already in the store'}")
+
+    print("\nDuration of the jobs:")
+    print("-" * 60)
+    _, duration, _ = run_job(gateway, create_job(gateway, "demo_package_input_files_job"))
+    print(f"{'Input files':<30} {duration:8.1f} s")
+    for label in ["Package cache, first run", "Package cache, second run"]:
+        job_id, duration, output = run_job(gateway, create_job(gateway, "demo_package_cache_job", store))
+        print(f"{label:<30} {duration:8.1f} s")
+
+    print("\nPackage cache lines of the last job:")
+    print("\n".join(line for line in str(output).splitlines() if "Package" in line or "from" in line))
+
+except Exception as e:
+    print(f"Error during the package cache demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
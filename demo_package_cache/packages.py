@@ -0,0 +1,119 @@
+# packages.py
+"""
+Content-addressed distribution of Python packages to the node cache space.
+
+pack() builds a reproducible zip archive of a package directory: the same sources always give
+the same archive, and so the same SHA-256 digest. PackageStore uploads each archive once to the
+user data space under "package_store/<sha256>.zip", and attach() configures a task to get its
+packages from the node cache with the scripts/package_cache.groovy fork environment script
+instead of transferring them as input files.
+"""
+import io
+import os
+import zipfile
+import hashlib
+import requests
+
+from proactive import ProactiveForkEnv, ProactiveScriptLanguage
+
+# Location of the archives in the user data space
+STORE_DIR = "package_store"
+
+CACHE_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "package_cache.groovy")
+
+# Fixed timestamp of the archive entries, for reproducible archives
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+EXCLUDED_DIRECTORIES = {"__pycache__", ".git"}
+EXCLUDED_SUFFIXES = (".pyc", ".pyo")
+
+
+def pack(path):
+    """
+    Build a reproducible zip archive of a package directory, whose entries start with the package name.
+
+    Returns:
+        tuple: (archive bytes, SHA-256 digest)
+    """
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for directory, directories, files in os.walk(path):
+            directories[:] = sorted(d for d in directories if d not in EXCLUDED_DIRECTORIES)
+            for name in sorted(files):
+                if name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                file_path = os.path.join(directory, name)
+                info = zipfile.ZipInfo(os.path.relpath(file_path, parent).replace(os.sep, "/"), ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                with open(file_path, "rb") as f:
+                    archive.writestr(info, f.read())
+    data = buffer.getvalue()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+class PackageStore:
+    """
+    Store of package archives in the user data space.
+
+    Args:
+        gateway: A connected ProActive gateway
+        store_dir (str): Location of the archives in the user data space
+    """
+
+    def __init__(self, gateway, store_dir=STORE_DIR):
+        self.base_url = f"{gateway.getBaseURL()}/rest/data/user/{store_dir}"
+        self.session = requests.Session()
+        self.session.headers["sessionid"] = gateway.getSession()
+        self.session.verify = False
+        self._packages = {}
+
+    def upload(self, path):
+        """
+        Pack a package directory and upload its archive if the store does not hold it yet.
+
+        Returns:
+            tuple: (SHA-256 digest, True if the archive was uploaded)
+        """
+        data, digest = pack(path)
+        url = f"{self.base_url}/{digest}.zip"
+        uploaded = self.session.head(url).status_code != 200
+        if uploaded:
+            response = self.session.put(url, data=data, headers={"Content-Type": "application/octet-stream"})
+            response.raise_for_status()
+        self._packages[os.path.abspath(path)] = digest
+        return digest, uploaded
+
+    def attach(self, task, paths, max_size_mb=None, min_idle_seconds=None):
+        """
+        Make packages available to a task from the node cache space.
+
+        The package cache script is appended to the fork environment of the task, if it has one (such as
+        the one of setVirtualEnv() or scripts/fork_env.groovy). The input files of the packages are removed
+        from the task.
+        """
+        entries = []
+        for path in paths:
+            digest = self._packages.get(os.path.abspath(path)) or self.upload(path)[0]
+            name = os.path.basename(os.path.abspath(path))
+            entries.append(f"{name}={digest}")
+            for pattern in list(task.getInputFiles()):
+                if pattern.replace("\\", "/").rstrip("/*") == os.path.relpath(path).replace(os.sep, "/"):
+                    task.removeInputFile(pattern)
+        task.addVariable("PACKAGE_CACHE_PACKAGES", ",".join(entries))
+        if max_size_mb is not None:
+            task.addVariable("PACKAGE_CACHE_MAX_SIZE_MB", str(max_size_mb))
+        if min_idle_seconds is not None:
+            task.addVariable("PACKAGE_CACHE_MIN_IDLE_SECONDS", str(min_idle_seconds))
+
+        with open(CACHE_SCRIPT) as f:
+            cache_script = f.read()
+        fork_env = task.getForkEnvironment()
+        if fork_env is None:
+            fork_env = ProactiveForkEnv(ProactiveScriptLanguage().groovy())
+            fork_env.setImplementation(cache_script)
+        else:
+            fork_env.setImplementation(fork_env.getImplementation() + "\n" + cache_script)
+        task.setForkEnvironment(fork_env)
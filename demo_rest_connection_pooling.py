@@ -0,0 +1,154 @@
+"""
+This script demonstrates how to reuse keep-alive HTTPS connections for the REST calls of the ProActive Python SDK, and measures the gain. The workflow includes:
+
+1. Connecting to the ProActive server using the ProActive gateway.
+2. Benchmarking REST calls such as `gateway.getProactiveRestApi().get_active_service_instances()` (used in demo_service_stop.py) and the monitoring client calls, with the default behavior of the SDK: each call goes through `requests.get()`/`requests.post()`, and `requests.api.request` creates a new session for every call and closes it afterwards, which opens a new connection and performs a new TLS handshake.
+3. Installing a `PooledRequests` transport, which routes these module-level calls to thread-local sessions sharing a single thread-safe connection pool with HTTP keep-alive and a configurable pool size.
+4. Running the same benchmark with pooling and reporting the requests/s in both cases.
+5. Uninstalling the transport, which restores `requests.api.request`, as soon as the pooled benchmark ends, and closing the connection.
+
+`PooledRequests` can also gzip the request bodies above a size threshold, but only when `compress_min_bytes` is given explicitly: the ProActive REST endpoints do not inflate `Content-Encoding: gzip` requests, so this is only for servers behind a proxy configured to do it, and the demo leaves it off.
+
+The SDK REST calls go through `requests`, which speaks HTTP/1.1 only, so the pool relies on keep-alive rather than HTTP/2 multiplexing to avoid the connection setup cost.
+"""
+import os
+import gzip
+import json
+import time
+import threading
+import urllib3
+import requests
+import requests.api
+
+from requests.adapters import HTTPAdapter
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Number of calls of each benchmark
+BENCHMARK_CALLS = 30
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTP adapter whose connections survive close().
+
+    requests.api.request, behind requests.get() and requests.post(), runs each call in a
+    new session closed afterwards, which closes its adapters and would drop the pooled
+    connections. Only shutdown() closes them.
+    """
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        super().close()
+
+class PooledRequests:
+    """
+    Route the requests module-level functions to sessions sharing one keep-alive connection pool.
+
+    Can be used as a context manager, installed on entry and uninstalled on exit. Request bodies
+    are sent as is, unless compress_min_bytes is given: the bodies larger than it are then gzipped,
+    which only works with servers inflating "Content-Encoding: gzip" requests.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=32, compress_min_bytes=None):
+        self.adapter = KeepAliveAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.compress_min_bytes = compress_min_bytes
+        self._local = threading.local()
+        self._original_requests = None
+
+    def session(self):
+        """Return the session of the current thread, all sessions sharing the same adapter."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+        return session
+
+    def _compress(self, kwargs):
+        """Gzip the request body when it is larger than compress_min_bytes."""
+        if "json" in kwargs and kwargs["json"] is not None:
+            kwargs["data"] = json.dumps(kwargs.pop("json")).encode("utf-8")
+            kwargs.setdefault("headers", {})
+            kwargs["headers"] = dict(kwargs["headers"] or {}, **{"Content-Type": "application/json"})
+        data = kwargs.get("data")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if isinstance(data, bytes) and len(data) >= self.compress_min_bytes:
+            kwargs["data"] = gzip.compress(data, compresslevel=5)
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **{"Content-Encoding": "gzip"})
+
+    def request(self, method, url, **kwargs):
+        """Drop-in replacement of requests.api.request."""
+        if self.compress_min_bytes is not None:
+            self._compress(kwargs)
+        return self.session().request(method=method, url=url, **kwargs)
+
+    def install(self):
+        """Route requests.get(), requests.post(), ... through the pool."""
+        if self._original_requests is None:
+            self._original_requests = (requests.api.request, requests.request)
+            requests.api.request = self.request
+            requests.request = self.request
+
+    def uninstall(self):
+        """Restore requests.api.request and requests.request, and close the pooled connections."""
+        if self._original_requests is not None:
+            requests.api.request, requests.request = self._original_requests
+            self._original_requests = None
+        self.adapter.shutdown()
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+def run_benchmark(label, calls):
+    """Run each call BENCHMARK_CALLS times and print the throughput."""
+    results = {}
+    for name, call in calls.items():
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_CALLS):
+            call()
+        elapsed = time.perf_counter() - start
+        results[name] = BENCHMARK_CALLS / elapsed
+        print(f"{label:<16} {name:<34} {results[name]:7.1f} calls/s")
+    return results
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+rest_api = gateway.getProactiveRestApi()
+monitoring_client = gateway.getProactiveMonitoringClient()
+pool = PooledRequests(pool_maxsize=32)
+
+try:
+    calls = {
+        "get_active_service_instances()": rest_api.get_active_service_instances,
+        "list_proactive_jmx_urls()": monitoring_client.list_proactive_jmx_urls,
+    }
+
+    print(f"\nBenchmark ({BENCHMARK_CALLS} calls each):")
+    print("-" * 60)
+    without_pool = run_benchmark("Without pooling", calls)
+
+    with pool:
+        next(iter(calls.values()))()  # Open the first pooled connection
+        with_pool = run_benchmark("With pooling", calls)
+
+    print("\nSpeedup:")
+    print("-" * 60)
+    for name in calls:
+        print(f"{name:<34} x{with_pool[name] / without_pool[name]:.1f}")
+
+except Exception as e:
+    print(f"Error during the benchmark: {e}")
+finally:
+    pool.uninstall()
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,242 @@
+"""
+This script demonstrates how to cache, on the client side, the responses of REST endpoints whose data changes rarely, such as the active service instances, the node sources or the JMX URLs of the nodes. The workflow includes:
+
+1. Connecting to the ProActive server using the ProActive gateway.
+2. Installing a read-through `ResponseCache` in front of the REST calls of the SDK, with one `CachePolicy` per endpoint:
+   - a fresh entry (younger than the TTL of its policy) is returned without any request;
+   - a stale entry carrying an `ETag` is revalidated with `If-None-Match`, and a `304 Not Modified` answer renews it without transferring the body again;
+   - any other GET goes to the server.
+3. Invalidating the cached entries of an endpoint explicitly after mutating calls: `startService` and `finishService` invalidate the service instance entries, the job submissions and the job and task control calls (`submitJob`, `killJob`, `killTask`, `removeExternalEndpointUrl`, ...) invalidate the service instance and Resource Manager entries, and any non-GET request invalidates the entries of its endpoint.
+4. Calling `get_active_service_instances()`, `get_rm_model_nodesources()` and `list_proactive_jmx_urls()` repeatedly, as a monitoring tool would, and comparing the elapsed time with and without the cache.
+5. Displaying the hit rate of each policy and uninstalling the cache.
+
+Only GET requests are cached, and the session id is part of the cache key, so that users never share entries.
+"""
+import os
+import re
+import time
+import threading
+import urllib3
+import requests
+import requests.api
+
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Number of polling rounds of the benchmark
+BENCHMARK_ROUNDS = 20
+
+class CachePolicy:
+    """Caching settings of the endpoints whose URL path matches a regular expression."""
+
+    def __init__(self, name, pattern, ttl):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+# Endpoint policies, the first matching policy applies
+DEFAULT_POLICIES = [
+    CachePolicy("connected", r"/common/connected$", ttl=10),
+    CachePolicy("service-instances", r"/cloud-automation-service/serviceInstances", ttl=30),
+    CachePolicy("rm-model", r"/rm/model/", ttl=60),
+    CachePolicy("rm-monitoring", r"/rm/monitoring$", ttl=15),
+    CachePolicy("catalog", r"/catalog/buckets/", ttl=300),
+]
+
+# Policies whose data changes when a job is submitted or controlled: service instances are jobs,
+# and the jobs take or release nodes
+JOB_POLICIES = ["service-instances", "rm-model", "rm-monitoring"]
+
+# Gateway methods changing the data of a policy, invalidated after each call
+MUTATING_METHODS = {
+    "startService": ["service-instances"],
+    "finishService": ["service-instances"],
+    "submitJob": JOB_POLICIES,
+    "submitJobWithInputsAndOutputsPaths": JOB_POLICIES,
+    "submitWorkflowFromCatalog": JOB_POLICIES,
+    "submitWorkflowFromFile": JOB_POLICIES,
+    "submitWorkflowFromURL": JOB_POLICIES,
+    "submitCustomWorkflowFromCatalog": JOB_POLICIES,
+    "submitCustomWorkflowFromFile": JOB_POLICIES,
+    "killJob": JOB_POLICIES,
+    "pauseJob": JOB_POLICIES,
+    "resumeJob": JOB_POLICIES,
+    "killTask": JOB_POLICIES,
+    "restartTask": JOB_POLICIES,
+    "preemptTask": JOB_POLICIES,
+    "addExternalEndpointUrl": ["service-instances"],
+    "removeExternalEndpointUrl": ["service-instances"],
+}
+
+class CacheEntry:
+    def __init__(self, response, stored_at):
+        self.response = response
+        self.stored_at = stored_at
+        self.etag = response.headers.get("ETag")
+
+class ResponseCache:
+    """Read-through TTL + ETag cache of the requests module-level functions."""
+
+    def __init__(self, policies=DEFAULT_POLICIES):
+        self.policies = policies
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._original_request = None
+
+    def policy_for(self, url):
+        path = requests.utils.urlparse(url).path
+        for policy in self.policies:
+            if policy.pattern.search(path):
+                return policy
+        return None
+
+    @staticmethod
+    def _key(url, kwargs):
+        # Encode the params as requests does, whether they are a dict, a list of tuples, bytes or a string
+        params = kwargs.get("params") or {}
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        params = requests.models.RequestEncodingMixin._encode_params(params)
+        headers = kwargs.get("headers") or {}
+        return url, params, headers.get("sessionid")
+
+    def _count(self, policy, counter):
+        with self._lock:
+            setattr(policy, counter, getattr(policy, counter) + 1)
+
+    def invalidate(self, *policy_names):
+        """Drop the entries of the given policies, or all the entries when no name is given."""
+        with self._lock:
+            for key in list(self._entries):
+                policy = self.policy_for(key[0])
+                if not policy_names or (policy and policy.name in policy_names):
+                    del self._entries[key]
+                    if policy:
+                        policy.invalidations += 1
+
+    def request(self, method, url, **kwargs):
+        """Drop-in replacement of requests.api.request."""
+        policy = self.policy_for(url)
+        if policy is None:
+            return self._original_request(method, url, **kwargs)
+        if method.upper() != "GET":
+            self.invalidate(policy.name)
+            return self._original_request(method, url, **kwargs)
+
+        key = self._key(url, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry.stored_at < policy.ttl:
+            self._count(policy, "hits")
+            return entry.response
+
+        if entry is not None and entry.etag:
+            headers = dict(kwargs.get("headers") or {}, **{"If-None-Match": entry.etag})
+            response = self._original_request(method, url, **dict(kwargs, headers=headers))
+            if response.status_code == 304:
+                self._count(policy, "revalidations")
+                entry.stored_at = now
+                return entry.response
+        else:
+            response = self._original_request(method, url, **kwargs)
+
+        self._count(policy, "misses")
+        if response.status_code == 200:
+            with self._lock:
+                self._entries[key] = CacheEntry(response, now)
+        return response
+
+    def install(self, gateway=None, mutating_methods=MUTATING_METHODS):
+        """Route requests.get(), ... through the cache, and invalidate after the mutating gateway methods."""
+        if self._original_request is None:
+            self._original_request = requests.api.request
+            requests.api.request = self.request
+            requests.request = self.request
+        if gateway is not None:
+            for name, policy_names in mutating_methods.items():
+                method = getattr(gateway, name, None)
+                if callable(method):
+                    setattr(gateway, name, self._invalidating(method, policy_names))
+
+    def _invalidating(self, method, policy_names):
+        def call(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.invalidate(*policy_names)
+        call.__name__ = method.__name__
+        call.__doc__ = method.__doc__
+        return call
+
+    def uninstall(self):
+        """Restore the default behavior and drop all the entries."""
+        if self._original_request is not None:
+            requests.api.request = self._original_request
+            requests.request = self._original_request
+            self._original_request = None
+        self.invalidate()
+
+    def print_stats(self):
+        with self._lock:
+            rows = [(policy.name, policy.ttl, policy.hits, policy.revalidations, policy.misses,
+                     policy.invalidations, policy.hit_rate()) for policy in self.policies]
+        print(f"{'Policy':<20} {'TTL':>5} {'Hits':>6} {'Revalid.':>9} {'Misses':>7} {'Invalid.':>9} {'Hit rate':>9}")
+        for name, ttl, hits, revalidations, misses, invalidations, hit_rate in rows:
+            print(f"{name:<20} {ttl:>4}s {hits:>6} {revalidations:>9} {misses:>7} {invalidations:>9} {hit_rate:>8.0%}")
+
+def poll(rest_api, monitoring_client):
+    """Run BENCHMARK_ROUNDS rounds of the calls of a monitoring tool and return the elapsed time."""
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_ROUNDS):
+        rest_api.get_active_service_instances()
+        rest_api.get_rm_model_nodesources()
+        monitoring_client.list_proactive_jmx_urls()
+    return time.perf_counter() - start
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+rest_api = gateway.getProactiveRestApi()
+monitoring_client = gateway.getProactiveMonitoringClient()
+cache = ResponseCache()
+
+try:
+    print(f"\nPolling {BENCHMARK_ROUNDS} rounds without cache...")
+    uncached = poll(rest_api, monitoring_client)
+
+    cache.install(gateway)
+    print(f"Polling {BENCHMARK_ROUNDS} rounds with cache...")
+    cached = poll(rest_api, monitoring_client)
+
+    # Mutating calls invalidate the entries of their endpoint
+    print("Invalidating the service instances as finishService would...")
+    cache.invalidate("service-instances")
+    instances = rest_api.get_active_service_instances() or []
+    print(f"{len(instances)} active service instance(s) after invalidation")
+
+    print("\nElapsed time:")
+    print("-" * 40)
+    print(f"Without cache: {uncached:.2f} s")
+    print(f"With cache:    {cached:.2f} s (x{uncached / cached:.1f})")
+
+    print("\nCache statistics:")
+    print("-" * 75)
+    cache.print_stats()
+
+except Exception as e:
+    print(f"Error during the cache demo: {e}")
+finally:
+    cache.uninstall()
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,271 @@
+"""
+This script demonstrates how to control the tail latency and the transient failures of the ProActive gateway calls with retries, backoff, a circuit breaker and hedged requests. The workflow includes:
+
+- Definition of a per-operation `CallPolicy`: number of attempts, jittered exponential backoff between attempts, exceptions that can be retried (connection and timeout errors by default), and optional hedging.
+- Hedging of short idempotent reads: when a call has not answered after the p95 latency observed so far for this operation, a second identical call is sent and the first answer wins.
+- A `CircuitBreaker` per operation, which fails fast after consecutive failures and lets a single trial call through after a cool-down period.
+- Application of the policies to the gateway with `make_resilient()`, for the status reads `getJobStatus`, `getJobState`, `getJobInfo`, `isJobFinished`, `getTaskStatus` and `isTaskFinished`.
+- A benchmark against a local stand-in that injects latency spikes and transient errors, reporting the p50/p95/p99 latencies and the error rate with and without the policies.
+- Submission of a real job and retrieval of its results through the resilient gateway.
+
+Only short idempotent reads should be hedged or retried freely. The result and output getters (`getJobResultMap`, `getJobResult`, `getTaskResult`, `getTaskPreciousResult`, `getJobPreciousResults`, `getJobOutput`) block until the job or task finishes, so a slow answer is not a tail latency: hedging or retrying them would only pile up waiting calls. They are left without policy, and the demo polls the job status through the policies before reading the results. `submitJob` is given a single attempt so that a job is never submitted twice.
+"""
+import time
+import random
+import logging
+import threading
+import requests
+import py4j.protocol
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from proactive import getProActiveGateway
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_retry_hedging")
+
+# Number of calls made by the benchmark, after warm-up calls filling the latency windows used for hedging
+BENCHMARK_CALLS = 400
+WARMUP_CALLS = 50
+
+# Errors of a call that can succeed when retried: connection failures and timeouts
+TRANSIENT_ERRORS = (
+    ConnectionError, TimeoutError,
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+    py4j.protocol.Py4JNetworkError,
+)
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker of its operation is open."""
+
+class CallPolicy:
+    """Retry, backoff and hedging settings of one gateway operation."""
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=5.0, retry_on=TRANSIENT_ERRORS,
+                 hedge=False, hedge_percentile=95, min_hedge_delay=0.05,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def backoff(self, attempt):
+        """Return the delay before a retry, with full jitter: uniform in [0, base * 2^attempt]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+# Policies of the gateway operations: short status reads are retried and hedged, submissions are not
+# retried, and the result getters, which block until the job finishes, are left unchanged
+DEFAULT_POLICIES = {
+    "getJobStatus": CallPolicy(hedge=True),
+    "getJobState": CallPolicy(hedge=True),
+    "getJobInfo": CallPolicy(hedge=True),
+    "isJobFinished": CallPolicy(hedge=True),
+    "getTaskStatus": CallPolicy(hedge=True),
+    "isTaskFinished": CallPolicy(hedge=True),
+    "submitJob": CallPolicy(max_attempts=1),
+}
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold consecutive failures -> half-open after reset_timeout."""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let one trial call through and keep rejecting the other calls for another
+                # reset_timeout; the trial closes the circuit if it succeeds and reopens it if it fails
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            if success:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Rolling window of the latencies of an operation."""
+
+    def __init__(self, size=200):
+        self.samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, latency):
+        with self._lock:
+            self.samples.append(latency)
+
+    def percentile(self, p):
+        with self._lock:
+            ordered = sorted(self.samples)
+        if len(ordered) < 20:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def make_resilient(gateway, policies=DEFAULT_POLICIES, max_workers=16):
+    """
+    Apply the call policies to the operations of a gateway.
+
+    The wrappers are set on the gateway instance, so calls made internally by the gateway
+    itself use the policies too.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    gateway._resilience_executor = executor
+
+    def wrap(name, method, policy):
+        breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+        latencies = LatencyTracker()
+
+        def call_once(args, kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            latencies.add(time.perf_counter() - start)
+            return result
+
+        def call_hedged(args, kwargs):
+            hedge_delay = latencies.percentile(policy.hedge_percentile)
+            first = executor.submit(call_once, args, kwargs)
+            if hedge_delay is None:
+                return first.result()
+            done, _ = wait([first], timeout=max(hedge_delay, policy.min_hedge_delay))
+            if done:
+                return first.result()
+            # The first call is late: send a second one and keep the first successful answer
+            second = executor.submit(call_once, args, kwargs)
+            pending = {first, second}
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+            raise error
+
+        def resilient(*args, **kwargs):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {name}")
+            for attempt in range(policy.max_attempts):
+                try:
+                    if policy.hedge:
+                        result = call_hedged(args, kwargs)
+                    else:
+                        result = call_once(args, kwargs)
+                    breaker.record(True)
+                    return result
+                except policy.retry_on as e:
+                    breaker.record(False)
+                    if attempt + 1 >= policy.max_attempts or not breaker.allow():
+                        raise
+                    delay = policy.backoff(attempt)
+                    logger.debug(f"{name} failed ({e}), retrying in {delay:.2f}s")
+                    time.sleep(delay)
+
+        resilient.__name__ = name
+        resilient.__doc__ = method.__doc__
+        return resilient
+
+    for name, policy in policies.items():
+        method = getattr(gateway, name, None)
+        if callable(method):
+            setattr(gateway, name, wrap(name, method, policy))
+    return gateway
+
+class LatencyInjectingStandIn:
+    """Local stand-in of the gateway read operations, with latency spikes and transient errors."""
+
+    def __init__(self, base_latency=0.01, spike_latency=0.3, spike_rate=0.02, error_rate=0.02):
+        self.base_latency = base_latency
+        self.spike_latency = spike_latency
+        self.spike_rate = spike_rate
+        self.error_rate = error_rate
+
+    def getJobStatus(self, job_id):
+        draw = random.random()
+        if draw < self.error_rate:
+            time.sleep(self.base_latency)
+            raise ConnectionError("Injected transient error")
+        if draw < self.error_rate + self.spike_rate:
+            time.sleep(self.spike_latency)
+        else:
+            time.sleep(random.uniform(0.5, 1.5) * self.base_latency)
+        return "FINISHED"
+
+def run_benchmark(label, gateway):
+    """Call getJobStatus BENCHMARK_CALLS times and print the latency percentiles."""
+    for i in range(WARMUP_CALLS):
+        try:
+            gateway.getJobStatus(i)
+        except Exception:
+            pass
+    latencies, errors = [], 0
+    for i in range(BENCHMARK_CALLS):
+        start = time.perf_counter()
+        try:
+            gateway.getJobStatus(i)
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+    print(f"{label:<22} p50 {p(50):7.1f} ms   p95 {p(95):7.1f} ms   p99 {p(99):7.1f} ms   errors {errors}/{BENCHMARK_CALLS}")
+    return p(99)
+
+# Benchmark against the latency-injecting stand-in
+print(f"\nBenchmark ({BENCHMARK_CALLS} calls of getJobStatus on a stand-in injecting latency and errors):")
+print("-" * 100)
+baseline_p99 = run_benchmark("Without policies", LatencyInjectingStandIn())
+resilient_p99 = run_benchmark("Retry + hedging", make_resilient(LatencyInjectingStandIn()))
+print(f"p99 improvement: x{baseline_p99 / resilient_p99:.1f}")
+
+# Initialize the ProActive gateway and apply the policies
+gateway = make_resilient(getProActiveGateway())
+
+try:
+    # Create and submit a job
+    print("\nCreating a proactive job...")
+    job = gateway.createJob("demo_retry_hedging")
+    task = gateway.createPythonTask("PythonTask")
+    task.setPreciousResult(True)
+    task.setTaskImplementation('''
+print("Hello from the resilient gateway demo")
+resultMap.put("ANSWER", "42")
+result = "done"
+''')
+    job.addTask(task)
+
+    job_id = gateway.submitJob(job)
+    print("job_id: " + str(job_id))
+
+    # The job status is polled through the retry, circuit breaker and hedging policies
+    while not gateway.isJobFinished(job_id):
+        time.sleep(1)
+    print("Job status:", gateway.getJobStatus(job_id))
+
+    # The job is finished, the blocking result getters answer right away
+    print("Result map:", gateway.getJobResultMap(job_id))
+    print("Precious result:", gateway.getTaskPreciousResult(job_id, "PythonTask"))
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway._resilience_executor.shutdown(wait=False)
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,217 @@
+"""
+This script starts and finishes many PSA service instances concurrently using the ProActive Python SDK, and compares it with the sequential path of demo_service_start.py and demo_service_stop.py.
+
+Steps:
+1. Initialize the ProActive gateway.
+2. Ask the user for the bucket, the workflow name of the service and the number of instances.
+3. Sequential path: start the instances one by one with `gateway.startService()`, wait for each one to be ready, then finish them one by one with `gateway.finishService()`.
+4. Parallel path:
+   - `startServices()` submits all the instances concurrently, polls each instance with `get_service_instance_by_id()` with an exponential backoff until it is RUNNING with an endpoint in its deployments, and yields each instance as soon as it is ready;
+   - `finishServices()` submits all the finish workflows concurrently and yields each instance as soon as it is finished.
+   Every instance started by either path is recorded as soon as it is submitted, and the ones not finished by the demo (failed, timed out or interrupted) are finished at the end.
+5. Display the timing report of both paths.
+6. Close the connection.
+"""
+import time
+import logging
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from proactive import getProActiveGateway
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_service_bulk_start_stop")
+
+# Concurrent submissions and polls
+MAX_WORKERS = 16
+
+# Readiness polling: first delay, backoff factor, maximum delay and timeout, in seconds
+POLL_INITIAL_DELAY = 1
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 15
+READY_TIMEOUT = 600
+
+READY_STATUSES = ["RUNNING"]
+FINISHED_STATUSES = ["FINISHED", "CANCELED"]
+FAILED_STATUSES = ["ERROR"]
+
+def get_endpoint(instance):
+    """Return the endpoint URL of the first deployment of a service instance, or None."""
+    for deployment in instance.get("deployments") or []:
+        endpoint = deployment.get("endpoint") or {}
+        url = endpoint.get("proxyfiedUrl") or endpoint.get("url")
+        if url:
+            return url
+    return None
+
+def wait_for_status(gateway, instance_id, statuses, require_endpoint=False, timeout=READY_TIMEOUT):
+    """
+    Poll a service instance with exponential backoff until its status is one of the given statuses.
+
+    Raises:
+        RuntimeError: If the instance fails or the timeout is reached
+    """
+    rest_api = gateway.getProactiveRestApi()
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL_DELAY
+    while True:
+        instance = rest_api.get_service_instance_by_id(instance_id) or {}
+        status = instance.get("instance_status")
+        if status in statuses and (not require_endpoint or get_endpoint(instance)):
+            return instance
+        if status in FAILED_STATUSES:
+            raise RuntimeError(f"Service instance {instance_id} is in {status} state")
+        if time.monotonic() + delay > deadline:
+            raise RuntimeError(f"Service instance {instance_id} still {status} after {timeout}s")
+        time.sleep(delay)
+        delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+
+def finish_service(gateway, instance):
+    """Submit the finish workflow of a service instance."""
+    gateway.finishService(
+        instance_id=instance["instance_id"],
+        bucket_name=instance.get("bucket_name", "service-automation"),
+        workflow_name=f"Finish_{instance['service_id']}",
+        variables={}
+    )
+
+def startServices(gateway, services, max_workers=MAX_WORKERS, started=None):
+    """
+    Start several service instances concurrently.
+
+    Args:
+        services (list): A list of {'bucket_name', 'workflow_name', 'variables'} dictionaries
+        started (dict, optional): Receives each started instance, by instance id, as soon as it is
+            submitted, including the instances that then fail or time out, so that they can be finished
+
+    Yields:
+        tuple: (index in services, ready instance or exception, seconds until ready), in readiness order
+    """
+    def start(service):
+        response = gateway.startService(**service)
+        if started is not None:
+            started[response["instance_id"]] = response
+        return wait_for_status(gateway, response["instance_id"], READY_STATUSES, require_endpoint=True)
+
+    yield from _run_concurrently(start, services, max_workers)
+
+def finishServices(gateway, instances, max_workers=MAX_WORKERS):
+    """
+    Finish several service instances concurrently.
+
+    Args:
+        instances (list): Service instances, as returned by get_active_service_instances() or startServices()
+
+    Yields:
+        tuple: (index in instances, finished instance or exception, seconds until finished), in completion order
+    """
+    def finish(instance):
+        finish_service(gateway, instance)
+        return wait_for_status(gateway, instance["instance_id"], FINISHED_STATUSES)
+
+    yield from _run_concurrently(finish, instances, max_workers)
+
+def _run_concurrently(function, items, max_workers):
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(function, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            yield futures[future], result, time.monotonic() - start
+
+def start_sequentially(gateway, services, started=None):
+    instances = []
+    for service in services:
+        response = gateway.startService(**service)
+        if started is not None:
+            started[response["instance_id"]] = response
+        instances.append(wait_for_status(gateway, response["instance_id"], READY_STATUSES, require_endpoint=True))
+    return instances
+
+def finish_sequentially(gateway, instances, finished=None):
+    for instance in instances:
+        finish_service(gateway, instance)
+        wait_for_status(gateway, instance["instance_id"], FINISHED_STATUSES)
+        if finished is not None:
+            finished.add(instance["instance_id"])
+
+def make_services(bucket_name, workflow_name, count, prefix):
+    return [
+        {
+            "bucket_name": bucket_name,
+            "workflow_name": workflow_name,
+            "variables": {
+                "INSTANCE_NAME": f"{workflow_name.lower()}-{prefix}-{i}-${{PA_JOB_ID}}",
+                "ENDPOINT_ID": f"{workflow_name.lower()}-endpoint-{prefix}-{i}-${{PA_JOB_ID}}",
+            },
+        }
+        for i in range(count)
+    ]
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+workflow_name = input("Enter the name of the service you want to launch: ").strip()
+bucket_name = input("Enter the bucket name containing the service: ").strip()
+count = int(input("Enter the number of instances to start: ").strip() or "4")
+
+timings = {}
+# Every instance started by the demo, and the ones finished, so that none is left running
+started, finished = {}, set()
+try:
+    # Sequential path
+    logger.info(f"Starting {count} instances sequentially...")
+    start = time.monotonic()
+    instances = start_sequentially(gateway, make_services(bucket_name, workflow_name, count, "seq"), started)
+    timings["Sequential start"] = time.monotonic() - start
+
+    logger.info(f"Finishing {count} instances sequentially...")
+    start = time.monotonic()
+    finish_sequentially(gateway, instances, finished)
+    timings["Sequential finish"] = time.monotonic() - start
+
+    # Parallel path
+    logger.info(f"Starting {count} instances concurrently...")
+    start = time.monotonic()
+    instances = []
+    for index, instance, elapsed in startServices(gateway, make_services(bucket_name, workflow_name, count, "par"),
+                                                  started=started):
+        if isinstance(instance, Exception):
+            logger.error(f"Instance #{index} failed to start: {instance}")
+            continue
+        logger.info(f"Instance {instance['instance_id']} ready after {elapsed:.1f}s: {get_endpoint(instance)}")
+        instances.append(instance)
+    timings["Parallel start"] = time.monotonic() - start
+
+    logger.info(f"Finishing {len(instances)} instances concurrently...")
+    start = time.monotonic()
+    for index, instance, elapsed in finishServices(gateway, instances):
+        if isinstance(instance, Exception):
+            logger.error(f"Instance #{index} failed to finish: {instance}")
+        else:
+            finished.add(instance["instance_id"])
+            logger.info(f"Instance {instance['instance_id']} finished after {elapsed:.1f}s")
+    timings["Parallel finish"] = time.monotonic() - start
+
+    print(f"\nTiming report ({count} instances):")
+    print("-" * 40)
+    for label, seconds in timings.items():
+        print(f"{label:<20} {seconds:8.1f} s")
+    print(f"Start speedup        x{timings['Sequential start'] / timings['Parallel start']:.1f}")
+    print(f"Finish speedup       x{timings['Sequential finish'] / timings['Parallel finish']:.1f}")
+
+except Exception as e:
+    print(f"\n[ERROR] {e}")
+finally:
+    # Finish the instances left by a failure, a timeout or an interruption, even partially started ones
+    leftovers = [instance for instance_id, instance in started.items() if instance_id not in finished]
+    for instance in leftovers:
+        try:
+            logger.info(f"Finishing the leftover instance {instance['instance_id']}...")
+            finish_service(gateway, instance)
+        except Exception as e:
+            logger.error(f"Failed to finish the instance {instance['instance_id']}: {e}")
+    gateway.close()
+    print("\n[INFO] Disconnected and finished.")
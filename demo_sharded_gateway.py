@@ -0,0 +1,207 @@
+"""
+This script demonstrates how to spread the jobs of a client over several ProActive servers with a `ShardedGateway`, which exposes the same API as a single gateway. The workflow includes:
+
+1. Connecting to each ProActive server listed in the `PROACTIVE_SHARD_URLS` environment variable (comma-separated, e.g. "https://server1:8443,https://server2:8443"), with the `PROACTIVE_USERNAME` and `PROACTIVE_PASSWORD` credentials. When the variable is not set, the single server of `getProActiveGateway()` is used.
+2. Wrapping the connections in a `ShardedGateway` that:
+   - creates jobs and tasks locally, as a single gateway does;
+   - submits each job to one shard, chosen by consistent hashing of a stable key (`policy="consistent-hash"`), the job name or the `shard_key=` argument of the submit call, so that the same key always goes to the same shard, or by the smallest number of pending and running jobs (`policy="least-loaded"`);
+   - names the shards by their index in `PROACTIVE_SHARD_URLS` ("shard0", "shard1", ...), so that servers on the same host or reached through different host names stay distinct;
+   - returns job ids prefixed with the shard name (e.g. "shard1:1234"), and routes the status, output, result, signal and control calls to the owning shard from that prefix;
+   - sends the calls listing jobs, such as `getAllJobs`, to every shard and merges their results.
+3. Submitting a batch of jobs, displaying how they were distributed and the submission throughput.
+4. Retrieving the output of every job through the sharded gateway.
+5. Closing all the connections.
+
+Since submissions and result calls of different shards are independent, the throughput of the client scales with the number of servers.
+"""
+import os
+import time
+import bisect
+import hashlib
+import logging
+import threading
+
+from urllib.parse import urlparse
+from proactive import getProActiveGateway, ProActiveGateway
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("demo_sharded_gateway")
+
+# Number of jobs submitted by the demo
+NUMBER_OF_JOBS = 12
+
+# Gateway methods taking a job id as first argument, routed to the owning shard
+JOB_ID_METHODS = {
+    "getTaskStatus", "getJobState", "getJobStatus", "isJobFinished", "isTaskFinished", "getJobInfo",
+    "waitForJob", "waitJobIsFinished", "getJobOutput", "getJobResult", "getJobResultMap",
+    "getJobPreciousResults", "getTaskResult", "getTaskPreciousResult", "printJobOutput", "printTaskOutput",
+    "killJob", "pauseJob", "resumeJob", "killTask", "restartTask", "preemptTask",
+    "addExternalEndpointUrl", "removeExternalEndpointUrl", "sendSignal",
+}
+
+# Gateway methods submitting a job, routed by the sharding policy
+SUBMIT_METHODS = {"submitJob", "submitJobWithInputsAndOutputsPaths"}
+
+# Gateway methods returning a list of jobs, sent to every shard and merged
+FAN_OUT_METHODS = {"getAllJobs"}
+
+class ShardedGateway:
+    """
+    Gateway spreading job submissions over several ProActive servers.
+
+    Job ids returned by the submit methods are strings "<shard name>:<job id>". The submit methods
+    take an optional shard_key argument, hashed instead of the job name by the consistent-hash policy.
+    Methods taking a job id route the call to the owning shard, methods listing jobs are called on
+    every shard and return the concatenation of their lists (any limit, such as max_number_of_jobs,
+    applies per shard), and all the other methods are forwarded to the first shard, which is enough
+    for the creation of jobs, tasks and scripts.
+    """
+
+    def __init__(self, gateways, policy="consistent-hash", virtual_nodes=64, load_cache_seconds=5):
+        if not gateways:
+            raise ValueError("At least one gateway is required")
+        if policy not in ("consistent-hash", "least-loaded"):
+            raise ValueError(f"Unknown sharding policy: {policy}")
+        self.shards = dict(gateways)
+        self.policy = policy
+        self.load_cache_seconds = load_cache_seconds
+        self._primary = next(iter(self.shards.values()))
+        self._loads = {}
+        self._lock = threading.Lock()
+
+        # Hash ring with virtual nodes for an even distribution
+        self._ring = sorted(
+            (self._hash(f"{name}#{i}"), name) for name in self.shards for i in range(virtual_nodes)
+        )
+        self._ring_keys = [key for key, _ in self._ring]
+
+    @staticmethod
+    def _hash(value):
+        return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:16], 16)
+
+    def _shard_for_key(self, key):
+        index = bisect.bisect(self._ring_keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+    def _shard_load(self, name):
+        """Return the number of pending and running jobs of a shard, cached for load_cache_seconds."""
+        now = time.monotonic()
+        load, timestamp = self._loads.get(name, (None, 0))
+        if load is None or now - timestamp > self.load_cache_seconds:
+            load = len(self.shards[name].getAllJobs(my_jobs_only=True, pending=True, running=True))
+            self._loads[name] = (load, now)
+        return load
+
+    def _least_loaded_shard(self):
+        with self._lock:
+            name = min(self.shards, key=self._shard_load)
+            load, timestamp = self._loads[name]
+            self._loads[name] = (load + 1, timestamp)
+            return name
+
+    def select_shard(self, job_model, key=None):
+        """
+        Return the name of the shard a job is submitted to.
+
+        With the consistent-hash policy, the shard is the one of key on the hash ring, or of the job
+        name when key is None: jobs sharing a name or a key always go to the same shard, and adding a
+        shard only moves the keys of its part of the ring.
+        """
+        if self.policy == "least-loaded":
+            return self._least_loaded_shard()
+        return self._shard_for_key(str(key) if key is not None else job_model.getJobName())
+
+    def split_job_id(self, job_id):
+        """Return the shard name and the server job id of a sharded job id."""
+        name, separator, server_job_id = str(job_id).rpartition(":")
+        if not separator or name not in self.shards:
+            raise ValueError(f"Job id {job_id} does not belong to any shard")
+        return name, server_job_id
+
+    def __getattr__(self, name):
+        if name in SUBMIT_METHODS:
+            def submit(job_model, *args, **kwargs):
+                shard = self.select_shard(job_model, kwargs.pop("shard_key", None))
+                job_id = getattr(self.shards[shard], name)(job_model, *args, **kwargs)
+                return f"{shard}:{job_id}"
+            return submit
+        if name in JOB_ID_METHODS:
+            def route(job_id, *args, **kwargs):
+                shard, server_job_id = self.split_job_id(job_id)
+                return getattr(self.shards[shard], name)(server_job_id, *args, **kwargs)
+            return route
+        if name in FAN_OUT_METHODS:
+            def fan_out(*args, **kwargs):
+                merged = []
+                for gateway in self.shards.values():
+                    merged.extend(getattr(gateway, name)(*args, **kwargs))
+                return merged
+            return fan_out
+        return getattr(self._primary, name)
+
+    def close(self):
+        """Close the connections to all the shards."""
+        for gateway in self.shards.values():
+            gateway.close()
+
+def connect_shards():
+    """
+    Connect to the servers of PROACTIVE_SHARD_URLS, or to the default server.
+
+    The shards are named by their index in PROACTIVE_SHARD_URLS.
+    """
+    urls = [url.strip() for url in os.getenv("PROACTIVE_SHARD_URLS", "").split(",") if url.strip()]
+    if not urls:
+        return {"shard0": getProActiveGateway()}
+
+    gateways = {}
+    for index, url in enumerate(urls):
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.hostname:
+            raise ValueError(f"Invalid shard URL {url}, expected a URL such as https://server1:8443")
+        name = f"shard{index}"
+        logger.info(f"Connecting shard {name} on {url}")
+        gateway = ProActiveGateway(base_url=url)
+        gateway.connect(os.getenv("PROACTIVE_USERNAME"), os.getenv("PROACTIVE_PASSWORD"))
+        assert gateway.isConnected(), f"Failed to connect to {url}!"
+        gateways[name] = gateway
+    return gateways
+
+# Initialize the sharded gateway
+gateway = ShardedGateway(connect_shards(), policy="consistent-hash")
+print(f"Connected to {len(gateway.shards)} shard(s): {', '.join(gateway.shards)}")
+
+try:
+    # Create and submit the jobs
+    job_ids = []
+    start = time.perf_counter()
+    for i in range(NUMBER_OF_JOBS):
+        job = gateway.createJob(f"demo_sharded_job_{i}")
+        task = gateway.createPythonTask(f"Task_{i}")
+        task.setTaskImplementation(f'''
+import socket
+print("Job {i} running on", socket.gethostname())
+''')
+        job.addTask(task)
+        job_ids.append(gateway.submitJob(job))
+    elapsed = time.perf_counter() - start
+
+    # Display the distribution of the jobs
+    print("\nJob distribution:")
+    print("-" * 40)
+    for shard in gateway.shards:
+        owned = [job_id for job_id in job_ids if job_id.startswith(f"{shard}:")]
+        print(f"{shard}: {len(owned)} job(s) {owned}")
+    print(f"Submission throughput: {NUMBER_OF_JOBS / elapsed:.1f} jobs/s")
+
+    # Retrieve the output of every job from its owning shard
+    print("\nJob outputs:")
+    print("-" * 40)
+    for job_id in job_ids:
+        print(f"{job_id}: {gateway.getJobOutput(job_id).strip()}")
+
+except Exception as e:
+    logger.error(f"An error occurred: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,158 @@
+"""
+ProActive Signal Broadcast Demonstration
+
+This script demonstrates how to broadcast a signal to many jobs at once, and measures the latency between the sending of a signal and the reaction of the waiting tasks.
+
+Overview:
+1. Initialize the ProActive Scheduler gateway and attach `sendSignals(job_ids, signal_name, variables)` to it. It sends the signal to all the jobs concurrently over a single pool of keep-alive connections, instead of one `gateway.sendSignal` call (and one new connection) per job.
+2. Submit two batches of jobs whose task waits for the 'Continue' signal, as in demo_signal_wait.py. The signal pre-script of each task is extended to record the time at which the signal was received.
+3. Wait until every task is ready for the signal.
+4. Send the signal to the first batch with a loop over `gateway.sendSignal`, and to the second batch with `gateway.sendSignals`, recording the time at which the signal was sent to each job.
+5. Retrieve the reception times from the job result maps and display, for each method, the broadcast duration and the signal-to-reaction latencies.
+6. Ensure proper cleanup by disconnecting from the ProActive Scheduler gateway post-execution.
+
+The latencies compare the clock of the client with the clock of the nodes, which are assumed to be synchronized (e.g. with NTP).
+
+Documentation:
+- https://doc.activeeon.com/latest/javadoc/org/ow2/proactive/scheduler/signal/Signal.html
+"""
+import os
+import time
+import urllib3
+import requests
+
+from functools import partial
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Number of jobs of each batch
+JOBS_PER_BATCH = 10
+
+# Timeout for the tasks to be ready for the signal, in seconds
+READY_TIMEOUT = 300
+
+def sendSignals(gateway, job_ids, signal_name, variables=None, max_workers=32):
+    """
+    Send a signal to several jobs concurrently over a pool of keep-alive connections.
+
+    Args:
+        job_ids (list): IDs of the jobs to send the signal to
+        signal_name (str): Name of the signal to be sent
+        variables (dict): Dictionary of variables to be sent with the signal
+
+    Returns:
+        dict: Maps each job ID to a (sent successfully, time at which the signal was sent) tuple
+    """
+    session = requests.Session()
+    session.headers.update({"sessionid": gateway.getSession(), "Content-Type": "application/json"})
+    session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+    session.mount("http://", HTTPAdapter(pool_maxsize=max_workers))
+
+    def send(job_id):
+        sent_at = time.time()
+        response = session.post(
+            f"{gateway.getBaseURL()}/rest/scheduler/job/{job_id}/signals",
+            params={"signal": signal_name},
+            json=variables or {},
+            verify=False
+        )
+        return job_id, (response.status_code == 200, sent_at)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(executor.map(send, job_ids))
+    finally:
+        session.close()
+
+def submit_waiting_job(gateway, name):
+    """Submit a job whose task waits for the 'Continue' signal and records when it was received."""
+    job = gateway.createJob(name)
+    task = gateway.createPythonTask("wait_task")
+    task.setSignals({'Continue': {}})
+    pre_script = task.getPreScript()
+    pre_script.setImplementation(pre_script.getImplementation() + """
+        variables.put("SIGNAL_RECEIVED_AT", System.currentTimeMillis())
+        """)
+    task.setTaskImplementation("""
+resultMap.put("SIGNAL_RECEIVED_AT", str(variables.get("SIGNAL_RECEIVED_AT")))
+""")
+    job.addTask(task)
+    return gateway.submitJob(job)
+
+def wait_until_ready(gateway, job_ids, signal_name):
+    """Wait until the task of every job has declared that it is ready for the signal."""
+    deadline = time.monotonic() + READY_TIMEOUT
+    pending = set(job_ids)
+    while pending:
+        for job_id in list(pending):
+            signals = gateway.getJobInfo(job_id).getSignals()
+            if signals is not None and f"ready_{signal_name}" in [str(signal) for signal in signals]:
+                pending.discard(job_id)
+        if pending:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Jobs {sorted(pending)} not ready for {signal_name} after {READY_TIMEOUT}s")
+            time.sleep(1)
+
+def send_sequentially(gateway, job_ids, signal_name, variables=None):
+    sent = {}
+    for job_id in job_ids:
+        sent_at = time.time()
+        sent[job_id] = (gateway.sendSignal(job_id, signal_name, variables or {}), sent_at)
+    return sent
+
+def report(label, gateway, sent, duration):
+    """Print the broadcast duration and the signal-to-reaction latencies of a batch."""
+    latencies = []
+    for job_id, (ok, sent_at) in sent.items():
+        received_at = gateway.getJobResultMap(job_id).get("SIGNAL_RECEIVED_AT")
+        if ok and received_at:
+            latencies.append(int(received_at) / 1000.0 - sent_at)
+    latencies.sort()
+    if not latencies:
+        print(f"{label:<22} broadcast {duration * 1000:8.1f} ms   no reaction recorded")
+        return
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))] * 1000
+    print(f"{label:<22} broadcast {duration * 1000:8.1f} ms   latency p50 {p(50):8.1f} ms   "
+          f"p95 {p(95):8.1f} ms   max {latencies[-1] * 1000:8.1f} ms")
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+gateway.sendSignals = partial(sendSignals, gateway)
+
+try:
+    # Submit the waiting jobs
+    print(f"Submitting {2 * JOBS_PER_BATCH} jobs waiting for the 'Continue' signal...")
+    sequential_jobs = [submit_waiting_job(gateway, f"demo_signal_broadcast_seq_{i}") for i in range(JOBS_PER_BATCH)]
+    bulk_jobs = [submit_waiting_job(gateway, f"demo_signal_broadcast_bulk_{i}") for i in range(JOBS_PER_BATCH)]
+
+    print("Waiting for the tasks to be ready for the signal...")
+    wait_until_ready(gateway, sequential_jobs + bulk_jobs, "Continue")
+
+    # Broadcast the signal with both methods
+    start = time.perf_counter()
+    sequential_sent = send_sequentially(gateway, sequential_jobs, "Continue")
+    sequential_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk_sent = gateway.sendSignals(bulk_jobs, "Continue", {})
+    bulk_duration = time.perf_counter() - start
+
+    # Wait for the jobs to finish and report
+    for job_id in sequential_jobs + bulk_jobs:
+        gateway.waitForJob(job_id, timeout=READY_TIMEOUT * 1000)
+
+    print(f"\nSignal broadcast to {JOBS_PER_BATCH} jobs:")
+    print("-" * 100)
+    report("Loop over sendSignal", gateway, sequential_sent, sequential_duration)
+    report("sendSignals", gateway, bulk_sent, bulk_duration)
+
+except Exception as e:
+    print(f"Error during the signal broadcast demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,200 @@
+"""
+ProActive Signal Select Demonstration
+
+This script demonstrates how to make the tasks of a job wait for signals without consuming CPU, with timeouts, and with a `select`-style API that returns whichever signal arrives first.
+
+Overview:
+1. Initialize the ProActive Scheduler gateway.
+2. Define `setSignalSelect(task, signals, timeout)`, a variant of `task.setSignals()` that:
+   - declares the task ready for each signal of the list;
+   - blocks in `signalapi.waitForAny(signals, timeout)`, which is notified by the Synchronization API when a signal is sent, instead of a polling loop;
+   - on timeout, stops waiting and sets the selected signal to "TIMEOUT";
+   - exposes the selected signal, its variables, the time at which it was received and the CPU time spent waiting in the `SELECTED_SIGNAL`, `SELECTED_SIGNAL_VARIABLES`, `SIGNAL_RECEIVED_AT` and `SIGNAL_WAIT_CPU_MS` variables.
+3. Submit a job with two selecting tasks: one waiting for 'Continue' or 'Stop', released by the 'Stop' signal, and one waiting for 'Resume' with a 5 seconds timeout.
+4. Benchmark: submit two jobs of NUMBER_OF_WAITING_TASKS tasks waiting for the 'Continue' signal, one with a polling loop over `signalapi.isReceived()` and one with `setSignalSelect()`, send the signal to both jobs and compare the CPU time spent waiting and the signal-to-reaction latency.
+5. Ensure proper cleanup by disconnecting from the ProActive Scheduler gateway post-execution.
+
+The benchmark needs as many free nodes as waiting tasks. The latencies compare the clock of the client with the clock of the nodes, which are assumed to be synchronized (e.g. with NTP).
+
+Documentation:
+- https://doc.activeeon.com/latest/javadoc/org/ow2/proactive/scheduler/signal/SignalApi.html
+"""
+import time
+
+from proactive import getProActiveGateway, ProactiveScriptLanguage, ProactivePreScript
+
+# Number of waiting tasks of each benchmark job
+NUMBER_OF_WAITING_TASKS = 200
+
+# Interval of the polling loop of the baseline, in milliseconds
+POLL_INTERVAL_MS = 1000
+
+# Timeout for the tasks to be waiting for the signal, in seconds
+READY_TIMEOUT = 600
+
+# Groovy code waiting for the first signal among a set, with an optional timeout
+SIGNAL_SELECT_TEMPLATE = """
+import java.lang.management.ManagementFactory
+import java.util.concurrent.TimeoutException
+
+def signalsSet = {signals}.toSet()
+def timeoutMs = {timeout_ms}L
+signalsSet.each {{ signal -> signalapi.readyForSignal(signal) }}
+def threadMXBean = ManagementFactory.getThreadMXBean()
+def cpuStart = threadMXBean.getCurrentThreadCpuTime()
+def receivedSignal = null
+try {{
+    println("Waiting for any signal among " + signalsSet + (timeoutMs > 0 ? " for " + timeoutMs + " ms" : ""))
+    receivedSignal = timeoutMs > 0 ? signalapi.waitForAny(signalsSet, timeoutMs) : signalapi.waitForAny(signalsSet)
+}} catch (TimeoutException e) {{
+    println("No signal among " + signalsSet + " received after " + timeoutMs + " ms")
+}} finally {{
+    signalapi.removeManySignals(new HashSet<>(signalsSet.collect {{ signal -> "ready_" + signal }}))
+}}
+variables.put("SIGNAL_RECEIVED_AT", System.currentTimeMillis())
+variables.put("SIGNAL_WAIT_CPU_MS", (threadMXBean.getCurrentThreadCpuTime() - cpuStart) / 1000000)
+variables.put("SELECTED_SIGNAL", receivedSignal != null ? receivedSignal.getName() : "TIMEOUT")
+variables.put("SELECTED_SIGNAL_VARIABLES", receivedSignal != null ? receivedSignal.getUpdatedVariables() : [:])
+println("Selected signal: " + variables.get("SELECTED_SIGNAL"))
+"""
+
+# Groovy code of the baseline, polling the signals until one of them is received
+SIGNAL_POLL_TEMPLATE = """
+import java.lang.management.ManagementFactory
+
+def signalsSet = {signals}.toSet()
+signalsSet.each {{ signal -> signalapi.readyForSignal(signal) }}
+def threadMXBean = ManagementFactory.getThreadMXBean()
+def cpuStart = threadMXBean.getCurrentThreadCpuTime()
+while (!signalsSet.any {{ signal -> signalapi.isReceived(signal) }}) {{
+    Thread.sleep({poll_interval_ms})
+}}
+signalapi.removeManySignals(new HashSet<>(signalsSet.collect {{ signal -> "ready_" + signal }}))
+variables.put("SIGNAL_RECEIVED_AT", System.currentTimeMillis())
+variables.put("SIGNAL_WAIT_CPU_MS", (threadMXBean.getCurrentThreadCpuTime() - cpuStart) / 1000000)
+"""
+
+# Task reporting its wait measurements in the job result map
+REPORT_IMPLEMENTATION = """
+resultMap.put(variables.get("PA_TASK_NAME"), variables.get("SIGNAL_RECEIVED_AT") + "," + variables.get("SIGNAL_WAIT_CPU_MS"))
+"""
+
+def _to_groovy_list(signals):
+    return "[" + ", ".join('"' + signal + '"' for signal in signals) + "]"
+
+def setSignalSelect(task, signals, timeout=None):
+    """
+    Make a task wait, before its execution, for the first signal received among a list.
+
+    Args:
+        task: A task created with gateway.createPythonTask() or gateway.createTask()
+        signals (list): Names of the signals to wait for
+        timeout (float): Maximum wait in seconds, None to wait forever
+
+    The task implementation can read the selected signal in variables.get("SELECTED_SIGNAL"),
+    which is "TIMEOUT" if no signal was received in time.
+    """
+    if not signals:
+        raise ValueError("At least one signal is required")
+    pre_script = ProactivePreScript(ProactiveScriptLanguage().groovy())
+    pre_script.setImplementation(SIGNAL_SELECT_TEMPLATE.format(
+        signals=_to_groovy_list(signals),
+        timeout_ms=int(timeout * 1000) if timeout else 0
+    ))
+    task.setPreScript(pre_script)
+
+def setSignalPoll(task, signals, poll_interval_ms=POLL_INTERVAL_MS):
+    """Make a task poll the signals before its execution (baseline of the benchmark)."""
+    pre_script = ProactivePreScript(ProactiveScriptLanguage().groovy())
+    pre_script.setImplementation(SIGNAL_POLL_TEMPLATE.format(
+        signals=_to_groovy_list(signals),
+        poll_interval_ms=poll_interval_ms
+    ))
+    task.setPreScript(pre_script)
+
+def submit_waiting_job(gateway, name, set_wait):
+    """Submit a job of NUMBER_OF_WAITING_TASKS tasks waiting for the 'Continue' signal."""
+    job = gateway.createJob(name)
+    for i in range(NUMBER_OF_WAITING_TASKS):
+        task = gateway.createTask(language=ProactiveScriptLanguage().groovy(), task_name=f"wait_task_{i}")
+        set_wait(task, ["Continue"])
+        task.setTaskImplementation(REPORT_IMPLEMENTATION)
+        job.addTask(task)
+    return gateway.submitJob(job)
+
+def wait_until_waiting(gateway, job_ids):
+    """Wait until all the tasks of the jobs are running, i.e. waiting for the signal in their pre-script."""
+    deadline = time.monotonic() + READY_TIMEOUT
+    for job_id in job_ids:
+        while gateway.getJobInfo(job_id).getNumberOfRunningTasks() < NUMBER_OF_WAITING_TASKS:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"The tasks of job {job_id} are not all running after {READY_TIMEOUT}s")
+            time.sleep(1)
+    # Leave time to the last tasks to reach the wait
+    time.sleep(5)
+
+def report(gateway, label, job_id, sent_at):
+    """Print the CPU time spent waiting and the signal-to-reaction latencies of a benchmark job."""
+    latencies, cpu_times = [], []
+    for value in gateway.getJobResultMap(job_id).values():
+        received_at, cpu_ms = str(value).split(",")
+        latencies.append(int(received_at) / 1000.0 - sent_at)
+        cpu_times.append(float(cpu_ms))
+    if not latencies:
+        print(f"{label:<16} no measurement")
+        return
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))] * 1000
+    print(f"{label:<16} CPU while waiting {sum(cpu_times) / len(cpu_times):8.1f} ms/task   "
+          f"latency p50 {p(50):8.1f} ms   p95 {p(95):8.1f} ms   max {latencies[-1] * 1000:8.1f} ms")
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    # Select-style waits with a timeout
+    print("Creating a job with select-style signal waits...")
+    job = gateway.createJob("demo_signal_select_job")
+    select_task = gateway.createPythonTask("select_task")
+    setSignalSelect(select_task, ["Continue", "Stop"], timeout=120)
+    select_task.setTaskImplementation("""
+print("Selected signal:", variables.get("SELECTED_SIGNAL"), variables.get("SELECTED_SIGNAL_VARIABLES"))
+""")
+    timeout_task = gateway.createPythonTask("timeout_task")
+    setSignalSelect(timeout_task, ["Resume"], timeout=5)
+    timeout_task.setTaskImplementation("""
+print("Selected signal:", variables.get("SELECTED_SIGNAL"))
+""")
+    job.addTask(select_task)
+    job.addTask(timeout_task)
+    job_id = gateway.submitJob(job)
+    print("job_id: " + str(job_id))
+
+    while "ready_Stop" not in [str(signal) for signal in gateway.getJobInfo(job_id).getSignals() or []]:
+        time.sleep(1)
+    gateway.sendSignal(job_id, "Stop", {})
+    print(gateway.getJobOutput(job_id))
+
+    # Benchmark with many concurrently waiting tasks
+    print(f"Submitting 2 jobs of {NUMBER_OF_WAITING_TASKS} tasks waiting for the 'Continue' signal...")
+    polling_job = submit_waiting_job(gateway, "demo_signal_poll_benchmark", setSignalPoll)
+    select_job = submit_waiting_job(gateway, "demo_signal_select_benchmark", setSignalSelect)
+    wait_until_waiting(gateway, [polling_job, select_job])
+
+    sent_at = {}
+    for benchmark_job in [polling_job, select_job]:
+        sent_at[benchmark_job] = time.time()
+        gateway.sendSignal(benchmark_job, "Continue", {})
+    for benchmark_job in [polling_job, select_job]:
+        gateway.waitForJob(benchmark_job, timeout=READY_TIMEOUT * 1000)
+
+    print(f"\nSignal wait with {NUMBER_OF_WAITING_TASKS} waiting tasks:")
+    print("-" * 110)
+    report(gateway, f"Polling {POLL_INTERVAL_MS} ms", polling_job, sent_at[polling_job])
+    report(gateway, "setSignalSelect", select_job, sent_at[select_job])
+
+except Exception as e:
+    print(f"Error during the signal select demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,169 @@
+"""
+This script demonstrates how to hand DataFrames over between tasks as Arrow IPC or Parquet files in the user data space, instead of the `df.to_json()` / `pd.read_json()` variables of demo_webapp.py, demo_decorators_webapp.py and notebooks/02_ML_Example.ipynb. The workflow includes:
+
+1. A local benchmark on a 1M-row DataFrame of the JSON path (`to_json(orient='split')` / `read_json`) and of `TaskIO.put_frame()` / `get_frame()` from the 'demo_task_io' module with the Arrow IPC and Parquet formats, against a local stand-in of the data space. It reports the write and read times, the file sizes, whether the column types survive the round trip, and the time to take a slice of the memory-mapped Arrow table.
+2. Initialization of the ProActive gateway.
+3. Creation of a pipeline job similar to the one of notebooks/02_ML_Example.ipynb:
+   - "Load_Data" builds a DataFrame and publishes it with `task_io.put_frame("dataframe", df)`;
+   - "Split" reads it with `task_io.get_frame("dataframe")` and publishes the train and test frames as Parquet;
+   - "Describe" reads a few columns of the train frame and a zero-copy slice of the test table.
+4. Submission of the job, retrieval of its output and disconnection from the gateway.
+
+Only the location of each frame goes through the scheduler; the frames themselves are pulled once per node and memory-mapped.
+"""
+import io
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from proactive import getProActiveGateway
+from demo_task_io.task_io import TaskIO
+
+# Number of rows of the benchmark DataFrame
+BENCHMARK_ROWS = 1_000_000
+
+class LocalDataSpace:
+    """Local stand-in of the userspaceapi binding, copying files to a temporary directory."""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="dataspace_")
+
+    def connect(self):
+        pass
+
+    def pushFile(self, local_path, remote_path):
+        os.makedirs(os.path.dirname(os.path.join(self.root, remote_path)), exist_ok=True)
+        shutil.copyfile(local_path, os.path.join(self.root, remote_path))
+
+    def pullFile(self, remote_path, local_path):
+        shutil.copyfile(os.path.join(self.root, remote_path), local_path)
+
+class LocalVariables(dict):
+    """Local stand-in of the variables binding."""
+
+    def put(self, name, value):
+        self[name] = value
+
+def benchmark_frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(BENCHMARK_ROWS, dtype=np.int64),
+        "value": rng.random(BENCHMARK_ROWS),
+        "count": rng.integers(0, 100, BENCHMARK_ROWS, dtype=np.int32),
+        "label": pd.Categorical(rng.choice(["low", "medium", "high"], BENCHMARK_ROWS)),
+        "timestamp": pd.date_range("2024-01-01", periods=BENCHMARK_ROWS, freq="s"),
+    })
+
+def run_benchmark():
+    frame = benchmark_frame()
+    print(f"\n{'Path':<10} {'Write':>9} {'Read':>9} {'Size':>10} {'Slice':>10}  Same types")
+    print("-" * 65)
+
+    # JSON path
+    start = time.perf_counter()
+    data = frame.to_json(orient="split")
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decoded = pd.read_json(io.StringIO(data), orient="split")
+    read_time = time.perf_counter() - start
+    print(f"{'json':<10} {write_time:8.2f}s {read_time:8.2f}s {len(data) / 1e6:8.1f}MB {'-':>10}  "
+          f"{(decoded.dtypes == frame.dtypes).all()}")
+
+    # Arrow IPC and Parquet through the data space stand-in, with separate node caches
+    dataspace = LocalDataSpace()
+    variables = LocalVariables(PA_JOB_ID="0")
+    for file_format in ["arrow", "parquet"]:
+        producer = TaskIO(variables, dataspace, None, cache_dir=tempfile.mkdtemp(prefix="producer_"))
+        consumer = TaskIO(variables, dataspace, None, cache_dir=tempfile.mkdtemp(prefix="consumer_"))
+        start = time.perf_counter()
+        producer.put_frame(f"frame_{file_format}", frame, format=file_format)
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = consumer.get_frame(f"frame_{file_format}")
+        read_time = time.perf_counter() - start
+        start = time.perf_counter()
+        consumer.get_table(f"frame_{file_format}").slice(BENCHMARK_ROWS // 2, 1000).to_pandas()
+        slice_time = time.perf_counter() - start
+        size = os.path.getsize(consumer._local_path(f"frame_{file_format}"))
+        print(f"{file_format:<10} {write_time:8.2f}s {read_time:8.2f}s {size / 1e6:8.1f}MB {slice_time * 1000:8.1f}ms  "
+              f"{(decoded.dtypes == frame.dtypes).all()}")
+        shutil.rmtree(producer.cache_dir)
+        shutil.rmtree(consumer.cache_dir)
+    shutil.rmtree(dataspace.root)
+
+# Local benchmark of the frame handoff
+run_benchmark()
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+# Create a new ProActive job
+print("\nCreating a proactive job...")
+job = gateway.createJob("demo_task_io_job")
+
+TASK_IO_SETUP = """
+import os, sys
+sys.path.append(os.getcwd())
+from demo_task_io.task_io import TaskIO
+task_io = TaskIO(variables, userspaceapi, gateway.jvm)
+"""
+
+# Task 1: Build and publish a dataframe
+print("Creating Task 1: Load data into a dataframe...")
+task1 = gateway.createPythonTask("Load_Data")
+task1.setTaskImplementation(TASK_IO_SETUP + """
+import numpy as np
+import pandas as pd
+
+rng = np.random.default_rng(0)
+df = pd.DataFrame({f"feature_{i}": rng.random(1_000_000) for i in range(10)})
+df["LABEL"] = df.sum(axis=1) + rng.normal(0, 0.1, len(df))
+task_io.put_frame("dataframe", df)
+print("Dataframe of", len(df), "rows published.")
+""")
+
+# Task 2: Split the dataframe
+print("Creating Task 2: Split the dataframe...")
+task2 = gateway.createPythonTask("Split")
+task2.addDependency(task1)
+task2.setTaskImplementation(TASK_IO_SETUP + """
+df = task_io.get_frame("dataframe")
+train = df.sample(frac=0.7, random_state=0)
+test = df.drop(train.index)
+task_io.put_frame("train", train, format="parquet")
+task_io.put_frame("test", test)
+print("Train and test frames published:", len(train), len(test))
+""")
+
+# Task 3: Read some columns and a slice
+print("Creating Task 3: Describe the frames...")
+task3 = gateway.createPythonTask("Describe")
+task3.addDependency(task2)
+task3.setTaskImplementation(TASK_IO_SETUP + """
+train = task_io.get_frame("train", columns=["feature_0", "LABEL"])
+print(train.describe())
+head = task_io.get_table("test").slice(0, 5).to_pandas()
+print(head)
+""")
+
+for task in [task1, task2, task3]:
+    task.addInputFile('demo_task_io/**')
+    task.setVirtualEnv(requirements=['numpy', 'pandas', 'pyarrow'])
+    job.addTask(task)
+
+# Job submission
+print("Submitting the job to the proactive scheduler...")
+job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+print("job_id: " + str(job_id))
+
+# Retrieve job output
+print("Getting job output...")
+job_output = gateway.getJobOutput(job_id)
+print(job_output)
+
+# Cleanup
+gateway.close()
+print("Disconnected and finished.")
@@ -0,0 +1,162 @@
+# task_io.py
+"""
+DataFrame handoff between ProActive tasks through the user data space.
+
+put_frame() writes a DataFrame as an Arrow IPC file (or a Parquet file) in the user data space
+and stores its location in the variables map. get_frame() and get_table() pull the file into a
+node cache directory once and memory-map it, so that reading a frame does not copy it through
+the scheduler, and slices of the Arrow table are zero-copy views of the mapped file.
+
+The files are named by the SHA-256 digest of their content, so that publishing a new frame under
+a name already used in the job never returns the previous frame from a node cache. The node cache
+is kept under a size limit by evicting the least recently used files.
+"""
+import os
+import hashlib
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Prefix of the frame locations stored in the variables map
+REFERENCE_PREFIX = "pa-frame://"
+
+# Location of the frames in the user data space
+DATASPACE_DIR = "frames"
+
+# Node cache of the frames, shared by the tasks running on the same node
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "proactive_frame_cache")
+
+# Size limit of the node cache (in bytes)
+DEFAULT_CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+
+class TaskIO:
+    """
+    Frame handoff API of a task.
+
+    Args:
+        variables: The `variables` binding of the task
+        dataspace: The `userspaceapi` (or `globalspaceapi`) binding of the task
+        jvm: The `gateway.jvm` of the task, used to create java.io.File objects, or None to
+            pass plain paths to the data space API
+        cache_dir (str): Node cache directory of the frames
+        cache_max_bytes (int): Size limit of the node cache, the least recently used files being evicted beyond it
+    """
+
+    def __init__(self, variables, dataspace, jvm, cache_dir=DEFAULT_CACHE_DIR, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.variables = variables
+        self.dataspace = dataspace
+        self.jvm = jvm
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self._connected = False
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _connect(self):
+        if not self._connected:
+            self.dataspace.connect()
+            self._connected = True
+
+    def _file(self, path):
+        return self.jvm.java.io.File(path) if self.jvm is not None else path
+
+    def _temp_path(self):
+        """Return a new temporary file of the cache directory, unique across processes and threads."""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        return temp_path
+
+    def _evict(self):
+        """Remove the least recently used files of the node cache until it fits in cache_max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                # Tasks that memory-mapped the file keep reading it
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def put_frame(self, name, frame, format="arrow", compression=None):
+        """
+        Write a DataFrame (or an Arrow table) to the data space and publish it under a variable name.
+
+        Args:
+            format (str): "arrow" for an Arrow IPC file, which can be memory-mapped without
+                decoding, or "parquet" for a smaller, encoded file
+            compression (str): Compression of the file ("lz4", "zstd", ...), None for the Arrow
+                default (uncompressed, required for zero-copy reads) and "snappy" for Parquet
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown frame format: {format}")
+        table = frame if isinstance(frame, pa.Table) else pa.Table.from_pandas(frame, preserve_index=True)
+        job_id = str(self.variables.get("PA_JOB_ID"))
+
+        temp_path = self._temp_path()
+        if format == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, temp_path, compression=compression or "snappy")
+
+        digest = hashlib.sha256()
+        with open(temp_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        file_name = f"{digest.hexdigest()}{FORMATS[format]}"
+        local_path = os.path.join(self.cache_dir, file_name)
+        os.replace(temp_path, local_path)
+        self._evict()
+
+        remote_path = f"{DATASPACE_DIR}/{job_id}/{file_name}"
+        self._connect()
+        self.dataspace.pushFile(self._file(local_path), remote_path)
+        self.variables.put(name, REFERENCE_PREFIX + remote_path)
+
+    def _local_path(self, name):
+        reference = self.variables.get(name)
+        if reference is None or not str(reference).startswith(REFERENCE_PREFIX):
+            raise KeyError(f"No frame published under {name}")
+        remote_path = str(reference)[len(REFERENCE_PREFIX):]
+        local_path = os.path.join(self.cache_dir, remote_path.rsplit("/", 1)[-1])
+        try:
+            os.utime(local_path)
+        except FileNotFoundError:
+            temp_path = self._temp_path()
+            self._connect()
+            self.dataspace.pullFile(remote_path, self._file(temp_path))
+            os.replace(temp_path, local_path)
+            self._evict()
+        return local_path
+
+    def get_table(self, name, columns=None):
+        """
+        Return a published frame as an Arrow table.
+
+        Arrow IPC files are memory-mapped: the table and its slices (table.slice(offset, length))
+        are views of the file, and only the pages actually read are loaded.
+        """
+        local_path = self._local_path(name)
+        if local_path.endswith(FORMATS["parquet"]):
+            return pq.read_table(local_path, columns=columns, memory_map=True)
+        table = pa.ipc.open_file(pa.memory_map(local_path, "r")).read_all()
+        return table.select(columns) if columns else table
+
+    def get_frame(self, name, columns=None):
+        """Return a published frame as a pandas DataFrame, with its original column types and index."""
+        return self.get_table(name, columns).to_pandas()
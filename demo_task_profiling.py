@@ -0,0 +1,254 @@
+"""
+This script demonstrates how to profile the implementation of Python tasks while they run on ProActive nodes, and how to retrieve the resulting profiles. The workflow includes:
+
+- Connection to the ProActive server using the ProActive gateway.
+- Activation of profiling on a task with `enable_profiling(task, mode, interval)`, which wraps the task implementation so that it runs under a profiler:
+    - `mode="sampling"`: a low-overhead sampling profiler that records the stack of the task every `interval` seconds from a background thread, and produces collapsed stacks (for flamegraph.pl) and a speedscope JSON file.
+    - `mode="cprofile"`: the deterministic cProfile profiler, which produces a pstats file.
+- Upload of the profiles to the user data space, under `profiles/<job id>/<task name>.*`, at the end of the task (even if the task fails).
+- Retrieval of the profiles with `getTaskProfile(gateway, job_id, task_name)` through the data space REST API, into the `proactive_profiles` directory of the temporary directory.
+- Display of the hottest stacks of the sampled task and of the most expensive functions of the cProfiled task.
+
+The speedscope file can be opened with https://www.speedscope.app to browse the profile as a flame chart.
+"""
+import os
+import pstats
+import tempfile
+import urllib3
+import requests
+
+from proactive import getProActiveGateway
+
+# Disable SSL certificate verification (for demo purposes only)
+os.environ['PYTHONHTTPSVERIFY'] = '0'
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Location of the profiles in the user data space
+PROFILES_DATASPACE_PATH = "profiles"
+
+# Local directory receiving the downloaded profiles
+PROFILES_LOCAL_PATH = os.path.join(tempfile.gettempdir(), "proactive_profiles")
+
+# Files produced by each profiling mode
+PROFILE_EXTENSIONS = {
+    "sampling": ["collapsed.txt", "speedscope.json"],
+    "cprofile": ["prof"],
+}
+
+# Code running the task implementation under the sampling profiler
+SAMPLING_PROFILER_TEMPLATE = '''
+import collections as _prof_collections
+import json as _prof_json
+import os as _prof_os
+import sys as _prof_sys
+import threading as _prof_threading
+import time as _prof_time
+
+_prof_source = {source!r}
+_prof_interval = {interval!r}
+_prof_counts = _prof_collections.Counter()
+_prof_done = _prof_threading.Event()
+_prof_target = _prof_threading.get_ident()
+
+def _prof_sample():
+    while not _prof_done.wait(_prof_interval):
+        frame = _prof_sys._current_frames().get(_prof_target)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(code.co_name + " (" + _prof_os.path.basename(code.co_filename) + ":" + str(code.co_firstlineno) + ")")
+            frame = frame.f_back
+        if stack:
+            _prof_counts[tuple(reversed(stack))] += 1
+
+_prof_sampler = _prof_threading.Thread(target=_prof_sample, daemon=True)
+_prof_start = _prof_time.time()
+_prof_sampler.start()
+try:
+    exec(compile(_prof_source, "<task:{task_name}>", "exec"), globals())
+finally:
+    _prof_done.set()
+    _prof_sampler.join()
+    _prof_duration = _prof_time.time() - _prof_start
+
+    with open("{task_name}.collapsed.txt", "w") as f:
+        for stack, count in _prof_counts.most_common():
+            f.write(";".join(stack) + " " + str(count) + "\\n")
+
+    _prof_frames = {{}}
+    _prof_samples, _prof_weights = [], []
+    for stack, count in _prof_counts.items():
+        _prof_samples.append([_prof_frames.setdefault(name, len(_prof_frames)) for name in stack])
+        _prof_weights.append(count * _prof_interval)
+    with open("{task_name}.speedscope.json", "w") as f:
+        _prof_json.dump({{
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {{"frames": [{{"name": name}} for name in _prof_frames]}},
+            "profiles": [{{
+                "type": "sampled", "name": "{task_name}", "unit": "seconds",
+                "startValue": 0, "endValue": _prof_duration,
+                "samples": _prof_samples, "weights": _prof_weights,
+            }}],
+        }}, f)
+
+    print("Profiled", sum(_prof_counts.values()), "samples of {task_name}")
+    _prof_dataspace_dir = "{dataspace_path}/" + str(variables.get("PA_JOB_ID"))
+    userspaceapi.connect()
+    for _prof_file in ["{task_name}.collapsed.txt", "{task_name}.speedscope.json"]:
+        userspaceapi.pushFile(gateway.jvm.java.io.File(_prof_file), _prof_dataspace_dir + "/" + _prof_file)
+'''
+
+# Code running the task implementation under cProfile
+CPROFILE_TEMPLATE = '''
+import cProfile as _prof_cprofile
+
+_prof_source = {source!r}
+_prof_profiler = _prof_cprofile.Profile()
+_prof_profiler.enable()
+try:
+    exec(compile(_prof_source, "<task:{task_name}>", "exec"), globals())
+finally:
+    _prof_profiler.disable()
+    _prof_profiler.dump_stats("{task_name}.prof")
+    print("Profiled {task_name} with cProfile")
+    userspaceapi.connect()
+    userspaceapi.pushFile(gateway.jvm.java.io.File("{task_name}.prof"),
+                          "{dataspace_path}/" + str(variables.get("PA_JOB_ID")) + "/{task_name}.prof")
+'''
+
+def enable_profiling(task, mode="sampling", interval=0.01):
+    """
+    Run the implementation of a Python task under a profiler and upload the profile to the user data space.
+
+    Must be called after task.setTaskImplementation().
+
+    Args:
+        task: A Python task created with gateway.createPythonTask()
+        mode (str): "sampling" for the low-overhead sampling profiler, "cprofile" for cProfile
+        interval (float): Sampling interval in seconds, used by the sampling mode only
+
+    Raises:
+        ValueError: If the mode is unknown or the task has no implementation
+    """
+    source = task.getTaskImplementation()
+    if not source:
+        raise ValueError("The task implementation must be set before enabling profiling")
+    if mode == "sampling":
+        template = SAMPLING_PROFILER_TEMPLATE
+    elif mode == "cprofile":
+        template = CPROFILE_TEMPLATE
+    else:
+        raise ValueError(f"Unknown profiling mode: {mode}")
+    task.setTaskImplementation(template.format(
+        source=source,
+        interval=interval,
+        task_name=task.getTaskName(),
+        dataspace_path=PROFILES_DATASPACE_PATH
+    ))
+
+def getTaskProfile(gateway, job_id, task_name, local_path=PROFILES_LOCAL_PATH):
+    """
+    Download the profiles of a task from the user data space.
+
+    Returns:
+        dict: Maps each profile file type ('collapsed.txt', 'speedscope.json' or 'prof') to its local path.
+    """
+    os.makedirs(local_path, exist_ok=True)
+    profiles = {}
+    for extension in sum(PROFILE_EXTENSIONS.values(), []):
+        file_name = f"{task_name}.{extension}"
+        response = requests.get(
+            f"{gateway.getBaseURL()}/rest/data/user/{PROFILES_DATASPACE_PATH}/{job_id}/{file_name}",
+            headers={"sessionid": gateway.getSession()},
+            verify=False
+        )
+        if response.status_code == 200:
+            file_path = os.path.join(local_path, f"{job_id}_{file_name}")
+            with open(file_path, "wb") as f:
+                f.write(response.content)
+            profiles[extension] = file_path
+    return profiles
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    # Create a new ProActive job
+    print("Creating a proactive job...")
+    job = gateway.createJob("demo_task_profiling")
+
+    # Task profiled with the sampling profiler
+    print("Creating a task profiled with the sampling profiler...")
+    matrix_task = gateway.createPythonTask("MatrixTask")
+    matrix_task.setTaskImplementation('''
+import numpy as np
+
+def multiply(size):
+    matrix = np.random.random((size, size))
+    return np.dot(matrix, matrix)
+
+def run():
+    for _ in range(20):
+        multiply(2000)
+
+run()
+print("Matrix loop completed.")
+''')
+    enable_profiling(matrix_task, mode="sampling", interval=0.005)
+    job.addTask(matrix_task)
+
+    # Task profiled with cProfile
+    print("Creating a task profiled with cProfile...")
+    training_task = gateway.createPythonTask("TrainingTask")
+    training_task.setTaskImplementation('''
+import random
+
+def train(epochs, samples):
+    weights = [0.0] * 10
+    for _ in range(epochs):
+        for _ in range(samples):
+            x = [random.random() for _ in range(10)]
+            y = sum(x) > 5
+            prediction = sum(w * v for w, v in zip(weights, x)) > 0
+            if prediction != y:
+                sign = 1 if y else -1
+                weights = [w + sign * 0.01 * v for w, v in zip(weights, x)]
+    return weights
+
+print("Trained weights:", train(epochs=5, samples=20000))
+''')
+    enable_profiling(training_task, mode="cprofile")
+    job.addTask(training_task)
+
+    # Job submission
+    print("Submitting the job to the proactive scheduler...")
+    job_id = gateway.submitJob(job)
+    print("job_id: " + str(job_id))
+
+    # Retrieve job output
+    print("Getting job output...")
+    print(gateway.getJobOutput(job_id))
+
+    # Retrieve and display the sampled profile
+    matrix_profiles = getTaskProfile(gateway, job_id, "MatrixTask")
+    if "collapsed.txt" in matrix_profiles:
+        print("\nHottest stacks of MatrixTask:")
+        print("-" * 40)
+        with open(matrix_profiles["collapsed.txt"]) as f:
+            for line in f.readlines()[:5]:
+                stack, count = line.rsplit(" ", 1)
+                print(f"{int(count):>6} samples  {stack.split(';')[-1]}")
+        print(f"Speedscope profile: {matrix_profiles.get('speedscope.json')}")
+
+    # Retrieve and display the cProfile profile
+    training_profiles = getTaskProfile(gateway, job_id, "TrainingTask")
+    if "prof" in training_profiles:
+        print("\nMost expensive functions of TrainingTask:")
+        print("-" * 40)
+        pstats.Stats(training_profiles["prof"]).sort_stats("cumulative").print_stats(10)
+
+except Exception as e:
+    print(f"Error during the profiling demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
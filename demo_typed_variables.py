@@ -0,0 +1,145 @@
+"""
+This script demonstrates how to pass typed Python values between tasks through the ProActive variables with a compact binary codec, instead of the py4j conversions shown in demo_global_var.py. The workflow includes:
+
+1. A local benchmark of the codec of the 'demo_typed_variables' module (msgpack, with numpy arrays stored as raw buffers and pandas DataFrames as Arrow IPC streams) against the JSON path used today (`X.tolist()`, `df.to_json()`), reporting the encoded sizes and the encode/decode throughputs.
+2. Initialization of the ProActive gateway.
+3. Creation of a job with two Python tasks shipping the 'demo_typed_variables' module as input files:
+   - "PythonTaskA" stores a tuple, a set, a dict with integer keys, a numpy array, a numpy scalar and a DataFrame with `TypedVariables(variables).put()`;
+   - "PythonTaskB" reads them with `TypedVariables(variables).get()`, which decodes each value only when it is read, and prints their types.
+4. Submission of the job, retrieval of its output and disconnection from the gateway.
+
+Each value is stored as a single byte array, so it crosses the py4j bridge in one call instead of element by element.
+"""
+import io
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from proactive import getProActiveGateway
+from demo_typed_variables.codec import encode, decode
+
+# Number of repetitions of each benchmark measurement
+BENCHMARK_REPEAT = 5
+
+def benchmark_values():
+    """Return the values of the benchmark, by name."""
+    rng = np.random.default_rng(0)
+    return {
+        "ndarray 1M float64": rng.random(1_000_000),
+        "ndarray 1000x100 int32": rng.integers(0, 1000, (1000, 100), dtype=np.int32),
+        "DataFrame 200k rows": pd.DataFrame({
+            "id": np.arange(200_000),
+            "value": rng.random(200_000),
+            "label": rng.choice(["a", "b", "c"], 200_000),
+            "timestamp": pd.date_range("2024-01-01", periods=200_000, freq="s"),
+        }),
+        "dict of lists": {f"key_{i}": list(range(100)) for i in range(1000)},
+    }
+
+def json_encode(value):
+    """JSON path used today: tolist() for arrays, to_json() for DataFrames."""
+    if isinstance(value, np.ndarray):
+        return json.dumps(value.tolist()).encode("utf-8")
+    if isinstance(value, pd.DataFrame):
+        return value.to_json().encode("utf-8")
+    return json.dumps(value).encode("utf-8")
+
+def json_decode(data, like):
+    if isinstance(like, np.ndarray):
+        return np.array(json.loads(data))
+    if isinstance(like, pd.DataFrame):
+        return pd.read_json(io.StringIO(data.decode("utf-8")))
+    return json.loads(data)
+
+def measure(function):
+    """Return the best time of BENCHMARK_REPEAT calls and the result of the last call."""
+    best = float("inf")
+    for _ in range(BENCHMARK_REPEAT):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmark():
+    print(f"\n{'Value':<24} {'Codec':<7} {'Size':>10} {'Encode':>12} {'Decode':>12}  Same type")
+    print("-" * 80)
+    for name, value in benchmark_values().items():
+        for codec_name, encoder, decoder in [
+            ("json", json_encode, lambda data: json_decode(data, value)),
+            ("typed", encode, decode),
+        ]:
+            encode_time, data = measure(lambda: encoder(value))
+            decode_time, decoded = measure(lambda: decoder(data))
+            size_mb = len(data) / 1e6
+            same_type = type(decoded) is type(value) and getattr(decoded, "dtype", None) == getattr(value, "dtype", None)
+            if isinstance(value, pd.DataFrame):
+                same_type = same_type and (decoded.dtypes == value.dtypes).all()
+            print(f"{name:<24} {codec_name:<7} {size_mb:8.2f}MB {size_mb / encode_time:8.0f}MB/s "
+                  f"{size_mb / decode_time:8.0f}MB/s  {same_type}")
+
+# Local benchmark of the codec
+run_benchmark()
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+# Create a new ProActive job
+print("\nCreating a ProActive job...")
+job = gateway.createJob("demo_typed_variables_job")
+
+# Create a Python task A storing typed values
+print("Creating a Python task...")
+taskA = gateway.createPythonTask("PythonTaskA")
+taskA.addInputFile('demo_typed_variables/**')
+taskA.setVirtualEnv(requirements=['msgpack', 'numpy', 'pandas', 'pyarrow'])
+taskA.setTaskImplementation("""
+import os, sys
+sys.path.append(os.getcwd())
+import numpy as np
+import pandas as pd
+from demo_typed_variables.codec import TypedVariables
+
+typed = TypedVariables(variables)
+typed.put("tupleFromA", (1, "two", 3.0))
+typed.put("setFromA", {"a", "b"})
+typed.put("dictFromA", {1: "one", 2: [1, 2]})
+typed.put("arrayFromA", np.arange(12, dtype=np.float32).reshape(3, 4))
+typed.put("scalarFromA", np.int64(42))
+typed.put("frameFromA", pd.DataFrame({"x": [1, 2], "when": pd.to_datetime(["2024-01-01", "2024-06-01"])}))
+""")
+
+# Create a Python task B reading them
+print("Creating a Python task...")
+taskB = gateway.createPythonTask("PythonTaskB")
+taskB.addDependency(taskA)
+taskB.addInputFile('demo_typed_variables/**')
+taskB.setVirtualEnv(requirements=['msgpack', 'numpy', 'pandas', 'pyarrow'])
+taskB.setTaskImplementation("""
+import os, sys
+sys.path.append(os.getcwd())
+from demo_typed_variables.codec import TypedVariables
+
+typed = TypedVariables(variables)
+print("Received in TaskB:")
+for name in ["tupleFromA", "setFromA", "dictFromA", "arrayFromA", "scalarFromA", "frameFromA"]:
+    value = typed.get(name)
+    print(name, type(value).__name__, getattr(value, "dtype", ""), repr(value))
+""")
+
+# Add tasks to the job
+job.addTask(taskA)
+job.addTask(taskB)
+
+# Submit the job with its input files
+job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+print(f"Job submitted with ID: {job_id}")
+
+# Retrieve job output
+print("Getting job output...")
+job_output = gateway.getJobOutput(job_id)
+print(job_output)
+
+# Cleanup
+gateway.close()
+print("Disconnected and finished.")
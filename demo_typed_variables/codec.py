@@ -0,0 +1,170 @@
+# codec.py
+"""
+Compact, typed binary encoding of Python values for the ProActive job and task variables.
+
+Values are encoded with msgpack, numpy arrays are stored as raw buffers and pandas DataFrames
+as Arrow IPC streams, so that they round-trip with their original type instead of coming
+back as py4j JavaList/JavaMap objects. Integers outside of the 64-bit range are stored as
+their decimal text. bytearray values are stored as msgpack binaries, and come back as bytes.
+
+numpy is needed to encode or decode arrays, pandas and pyarrow for DataFrames and Series.
+"""
+import io
+import datetime
+
+import msgpack
+
+# Prefix of the encoded values, used to recognize them among plain variables
+MAGIC = b"PATV1"
+
+EXT_NDARRAY = 1
+EXT_NUMPY_SCALAR = 2
+EXT_DATAFRAME = 3
+EXT_SERIES = 4
+EXT_TUPLE = 5
+EXT_SET = 6
+EXT_FROZENSET = 7
+EXT_COMPLEX = 8
+EXT_DATETIME = 9
+EXT_DATE = 10
+EXT_BIGINT = 11
+
+
+def _pack(value):
+    return msgpack.packb(value, default=_default, use_bin_type=True, strict_types=True)
+
+
+def _pack_ndarray(array):
+    import numpy as np
+    if array.dtype.hasobject:
+        raise TypeError("numpy arrays of Python objects cannot be encoded")
+    # tobytes() rather than the buffer of the array, which rejects datetime64 and timedelta64 dtypes
+    return msgpack.packb([array.dtype.str, list(array.shape), array.tobytes()], use_bin_type=True)
+
+
+def _pack_dataframe(frame):
+    import pyarrow as pa
+    table = pa.Table.from_pandas(frame)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _default(value):
+    type_name = type(value).__module__ + "." + type(value).__name__
+    if type_name == "numpy.ndarray":
+        return msgpack.ExtType(EXT_NDARRAY, _pack_ndarray(value))
+    if type_name.startswith("numpy."):
+        import numpy as np
+        if isinstance(value, np.generic):
+            return msgpack.ExtType(EXT_NUMPY_SCALAR, _pack_ndarray(np.asarray(value)))
+    if type_name.startswith("pandas.") and type(value).__name__ == "DataFrame":
+        return msgpack.ExtType(EXT_DATAFRAME, _pack_dataframe(value))
+    if type_name.startswith("pandas.") and type(value).__name__ == "Series":
+        return msgpack.ExtType(EXT_SERIES, _pack_dataframe(value.to_frame(name=value.name if value.name is not None else "__series__")))
+    if isinstance(value, tuple):
+        return msgpack.ExtType(EXT_TUPLE, _pack(list(value)))
+    if isinstance(value, frozenset):
+        return msgpack.ExtType(EXT_FROZENSET, _pack(list(value)))
+    if isinstance(value, set):
+        return msgpack.ExtType(EXT_SET, _pack(list(value)))
+    if isinstance(value, complex):
+        return msgpack.ExtType(EXT_COMPLEX, _pack([value.real, value.imag]))
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(EXT_DATETIME, _pack(value.isoformat()))
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(EXT_DATE, _pack(value.isoformat()))
+    if isinstance(value, int) and not isinstance(value, bool) and not -2 ** 63 <= value < 2 ** 64:
+        return msgpack.ExtType(EXT_BIGINT, _pack(str(int(value))))
+    # Subclasses of the msgpack types (e.g. OrderedDict, IntEnum) are encoded as their base type
+    for base in (bool, int, float, str, bytes, dict, list):
+        if isinstance(value, base):
+            return base(value)
+    raise TypeError(f"Cannot encode a value of type {type_name}")
+
+
+def _unpack_ndarray(data):
+    import numpy as np
+    dtype, shape, buffer = msgpack.unpackb(data, raw=False)
+    # Copied out of the encoded buffer, so that the array is writable
+    return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+
+
+def _unpack_dataframe(data):
+    import pyarrow as pa
+    return pa.ipc.open_stream(io.BytesIO(data)).read_all().to_pandas()
+
+
+def _ext_hook(code, data):
+    if code == EXT_NDARRAY:
+        return _unpack_ndarray(data)
+    if code == EXT_NUMPY_SCALAR:
+        return _unpack_ndarray(data)[()]
+    if code == EXT_DATAFRAME:
+        return _unpack_dataframe(data)
+    if code == EXT_SERIES:
+        series = _unpack_dataframe(data).iloc[:, 0]
+        return series.rename(None) if series.name == "__series__" else series
+    value = msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+    if code == EXT_TUPLE:
+        return tuple(value)
+    if code == EXT_SET:
+        return set(value)
+    if code == EXT_FROZENSET:
+        return frozenset(value)
+    if code == EXT_COMPLEX:
+        return complex(*value)
+    if code == EXT_DATETIME:
+        return datetime.datetime.fromisoformat(value)
+    if code == EXT_DATE:
+        return datetime.date.fromisoformat(value)
+    if code == EXT_BIGINT:
+        return int(value)
+    return msgpack.ExtType(code, data)
+
+
+def encode(value):
+    """Encode a Python value into bytes."""
+    return MAGIC + _pack(value)
+
+
+def decode(data):
+    """Decode bytes produced by encode()."""
+    data = bytes(data)
+    if not is_encoded(data):
+        raise ValueError("The data was not produced by encode()")
+    return msgpack.unpackb(memoryview(data)[len(MAGIC):], ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def is_encoded(data):
+    return isinstance(data, (bytes, bytearray)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+
+class TypedVariables:
+    """
+    Typed view of the `variables` map of a task.
+
+    put() stores the encoded value, get() decodes it only when it is read, and keeps the
+    decoded value so that reading it again is free. Values that were not stored through
+    put() are returned unchanged.
+    """
+
+    def __init__(self, variables):
+        self.variables = variables
+        self._decoded = {}
+
+    def put(self, name, value):
+        self.variables.put(name, encode(value))
+        self._decoded[name] = value
+
+    def get(self, name, default=None):
+        if name in self._decoded:
+            return self._decoded[name]
+        raw = self.variables.get(name)
+        if raw is None:
+            return default
+        if not is_encoded(raw):
+            return raw
+        value = self._decoded[name] = decode(raw)
+        return value
@@ -0,0 +1,112 @@
+"""
+This script demonstrates how to keep the job variables small when tasks hand large values over to each other, by spilling these values automatically to the user data space. The workflow includes:
+
+1. Initialization of the ProActive gateway.
+2. Creation of two jobs with the same handoff: "PythonTaskA" generates a training batch and a trained model, and "PythonTaskB" reads them and evaluates the model.
+   - The "inline" job stores the batch with `X.tolist()` and the model with `pickle.dumps()` in the variables, as demo_continual_learning.py does.
+   - The "spill" job stores the batch and the model weights with `SpillingVariables(variables, userspaceapi, gateway.jvm).put()` from the 'demo_variable_spill' module. Values whose encoding is larger than a threshold (64 KB by default) are written to the user data space, and the variables only hold a reference such as "pa-spill://spilled_variables/<sha256>#<size>". `get()` fetches the value on first use, through a node cache directory shared by the tasks of the node, and checks its digest.
+3. Submission of both jobs, and comparison of their duration and of the size of the values stored in the variables map of the scheduler.
+4. Removal of the variables, which keeps the shared, content-addressed spilled values in the user space, and disconnection from the gateway.
+"""
+import time
+
+from proactive import getProActiveGateway
+
+# Number of rows and columns of the training batch
+ROWS, COLUMNS = 200_000, 20
+
+REQUIREMENTS = ['msgpack', 'numpy', 'pandas', 'pyarrow', 'scikit-learn']
+
+PRODUCER_DATA = f"""
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+rng = np.random.default_rng(0)
+X = rng.random(({ROWS}, {COLUMNS}))
+y = (X.sum(axis=1) > {COLUMNS} / 2).astype(int)
+model = SGDClassifier().fit(X, y)
+"""
+
+INLINE_PRODUCER = PRODUCER_DATA + """
+import pickle
+X_list, model_pickle = X.tolist(), pickle.dumps(model)
+variables.put("X", X_list)
+variables.put("y", y.tolist())
+variables.put("model_pickle", model_pickle)
+resultMap.put("STORED_BYTES", str(len(str(X_list)) + len(str(y.tolist())) + len(model_pickle)))
+"""
+
+INLINE_CONSUMER = """
+import pickle
+import numpy as np
+
+X = np.array(variables.get("X"))
+y = np.array(variables.get("y"))
+model = pickle.loads(variables.get("model_pickle"))
+print("Accuracy:", model.score(X, y))
+"""
+
+SPILL_PRODUCER = """
+import os, sys
+sys.path.append(os.getcwd())
+from demo_variable_spill.spill import SpillingVariables
+""" + PRODUCER_DATA + """
+spilling = SpillingVariables(variables, userspaceapi, gateway.jvm)
+spilling.put("X", X)
+spilling.put("y", y)
+spilling.put("model", model.coef_)
+resultMap.put("STORED_BYTES", str(sum(len(variables.get(name)) for name in ["X", "y", "model"])))
+print("Stored references:", [variables.get(name) for name in ["X", "y"]])
+"""
+
+SPILL_CONSUMER = """
+import os, sys
+sys.path.append(os.getcwd())
+from demo_variable_spill.spill import SpillingVariables
+
+spilling = SpillingVariables(variables, userspaceapi, gateway.jvm)
+X, y, coef = spilling.get("X"), spilling.get("y"), spilling.get("model")
+print("Accuracy:", (((X @ coef.T).ravel() > 0).astype(int) == y).mean())
+for name in ["X", "y", "model"]:
+    spilling.delete(name)
+"""
+
+def run_job(gateway, name, producer, consumer, input_files=()):
+    """Submit a producer/consumer job, wait for it and return its duration and the stored size."""
+    job = gateway.createJob(name)
+    taskA = gateway.createPythonTask("PythonTaskA")
+    taskA.setTaskImplementation(producer)
+    taskB = gateway.createPythonTask("PythonTaskB")
+    taskB.addDependency(taskA)
+    taskB.setTaskImplementation(consumer)
+    for task in [taskA, taskB]:
+        task.setVirtualEnv(requirements=REQUIREMENTS)
+        for input_file in input_files:
+            task.addInputFile(input_file)
+        job.addTask(task)
+
+    start = time.monotonic()
+    job_id = gateway.submitJobWithInputsAndOutputsPaths(job)
+    print(f"{name} submitted with ID: {job_id}")
+    print(gateway.getJobOutput(job_id))
+    duration = time.monotonic() - start
+    return duration, int(gateway.getJobResultMap(job_id).get("STORED_BYTES", 0))
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    inline_duration, inline_bytes = run_job(gateway, "demo_variable_inline_job", INLINE_PRODUCER, INLINE_CONSUMER)
+    spill_duration, spill_bytes = run_job(gateway, "demo_variable_spill_job", SPILL_PRODUCER, SPILL_CONSUMER,
+                                          ['demo_variable_spill/**', 'demo_typed_variables/**'])
+
+    print(f"\nHandoff of a {ROWS}x{COLUMNS} batch:")
+    print("-" * 60)
+    print(f"{'Inline variables':<20} {inline_duration:8.1f} s   {inline_bytes / 1e6:10.2f} MB in the variables")
+    print(f"{'Spilled variables':<20} {spill_duration:8.1f} s   {spill_bytes / 1e6:10.4f} MB in the variables")
+
+except Exception as e:
+    print(f"Error during the spill demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
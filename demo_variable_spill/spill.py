@@ -0,0 +1,189 @@
+# spill.py
+"""
+Automatic spill of large task variables to the user data space.
+
+Values are encoded with the codec of demo_typed_variables. When the encoded value is larger
+than a threshold, it is pushed to the user data space under a name derived from its SHA-256
+digest, and only a short reference is stored in the variables map. Reading a reference fetches
+the value on first use only, through a cache directory shared by the tasks of the node, which
+is kept under a size limit by evicting the least recently used values.
+
+The spilled values are content-addressed, so the same file of the data space can be referenced
+by several variables, tasks and jobs: removing a variable never removes its spilled value, which
+is left to the cleanup of the "spilled_variables" directory of the user space.
+"""
+import os
+import hashlib
+import tempfile
+
+from demo_typed_variables.codec import encode, decode, is_encoded
+
+# Prefix of the references stored in the variables map
+REFERENCE_PREFIX = "pa-spill://"
+
+# Values whose encoding is larger than this size are spilled (in bytes)
+DEFAULT_THRESHOLD = 64 * 1024
+
+# Location of the spilled values in the user data space
+DATASPACE_DIR = "spilled_variables"
+
+# Node cache of the spilled values, shared by the tasks running on the same node
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "proactive_spill_cache")
+
+# Size limit of the node cache (in bytes)
+DEFAULT_CACHE_MAX_BYTES = 1024 ** 3
+
+
+def is_reference(value):
+    return isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+
+
+class SpillingVariables:
+    """
+    View of the `variables` map of a task spilling large values to the user data space.
+
+    Args:
+        variables: The `variables` binding of the task
+        dataspace: The `userspaceapi` binding of the task
+        jvm: The `gateway.jvm` of the task, used to create java.io.File objects
+        threshold (int): Size in bytes above which encoded values are spilled
+        cache_dir (str): Node cache directory of the spilled values
+        cache_max_bytes (int): Size limit of the node cache, the least recently used values being evicted beyond it
+    """
+
+    def __init__(self, variables, dataspace, jvm, threshold=DEFAULT_THRESHOLD, cache_dir=DEFAULT_CACHE_DIR,
+                 cache_max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.variables = variables
+        self.dataspace = dataspace
+        self.jvm = jvm
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self._decoded = {}
+        self._stored = set()
+        self._connected = False
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _connect(self):
+        if not self._connected:
+            self.dataspace.connect()
+            self._connected = True
+
+    def _cache_path(self, digest):
+        return os.path.join(self.cache_dir, digest)
+
+    def _temp_path(self):
+        """Return a new temporary file of the cache directory, unique across processes and threads."""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        return temp_path
+
+    def _evict(self):
+        """Remove the least recently used values of the node cache until it fits in cache_max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _is_stored(self, remote_path):
+        """Return True if the user data space already holds remote_path."""
+        if remote_path in self._stored:
+            return True
+        directory, name = remote_path.rsplit("/", 1)
+        self._connect()
+        if len(list(self.dataspace.listFiles(directory, name))) > 0:
+            self._stored.add(remote_path)
+            return True
+        return False
+
+    def put(self, name, value):
+        """Store a value, spilling it to the user data space if its encoding is larger than the threshold."""
+        data = encode(value)
+        self._decoded[name] = value
+        if len(data) <= self.threshold:
+            self.variables.put(name, data)
+            return
+
+        digest = hashlib.sha256(data).hexdigest()
+        cache_path = self._cache_path(digest)
+        cached = os.path.exists(cache_path)
+        if not cached:
+            temp_path = self._temp_path()
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        else:
+            os.utime(cache_path)
+
+        # Identical values share the same file in the data space, pushed once
+        remote_path = f"{DATASPACE_DIR}/{digest}"
+        if not self._is_stored(remote_path):
+            self._connect()
+            self.dataspace.pushFile(self.jvm.java.io.File(cache_path), remote_path)
+            self._stored.add(remote_path)
+        self.variables.put(name, f"{REFERENCE_PREFIX}{remote_path}#{len(data)}")
+        if not cached:
+            # After the push, since a value larger than cache_max_bytes is evicted right away
+            self._evict()
+
+    def get(self, name, default=None):
+        """Return a value, fetching it from the node cache or the user data space on first use."""
+        if name in self._decoded:
+            return self._decoded[name]
+        raw = self.variables.get(name)
+        if raw is None:
+            return default
+        if is_reference(raw):
+            value = decode(self._fetch(raw))
+        elif is_encoded(raw):
+            value = decode(raw)
+        else:
+            return raw
+        self._decoded[name] = value
+        return value
+
+    def _fetch(self, reference):
+        remote_path, size = reference[len(REFERENCE_PREFIX):].rsplit("#", 1)
+        digest = remote_path.rsplit("/", 1)[-1]
+        cache_path = self._cache_path(digest)
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            os.utime(cache_path)
+        except FileNotFoundError:
+            temp_path = self._temp_path()
+            self._connect()
+            self.dataspace.pullFile(remote_path, self.jvm.java.io.File(temp_path))
+            with open(temp_path, "rb") as f:
+                data = f.read()
+            if hashlib.sha256(data).hexdigest() != digest:
+                os.remove(temp_path)
+                raise IOError(f"Corrupted spilled value {remote_path}")
+            os.replace(temp_path, cache_path)
+            self._evict()
+        if len(data) != int(size):
+            raise IOError(f"Spilled value {remote_path} has {len(data)} bytes instead of {size}")
+        return data
+
+    def delete(self, name):
+        """
+        Remove a variable.
+
+        Its spilled value, if any, is kept in the user data space, since other variables can reference it.
+        """
+        self.variables.remove(name)
+        self._decoded.pop(name, None)
@@ -0,0 +1,82 @@
+"""
+This script demonstrates how to share the virtual environments of Python tasks through a cache on shared storage, instead of `task.setVirtualEnv()` as in demo_virtualenv.py, demo_webapp.py and demo_continual_learning.py, which rebuilds the environment in the local space of every task, or makes concurrent tasks race on the same environment when a shared basepath such as '/shared/' is given. The workflow includes:
+
+1. Initialization of the ProActive gateway.
+2. Submission of a baseline job of NUMBER_OF_TASKS parallel tasks using `task.setVirtualEnv(requirements=REQUIREMENTS)`.
+3. Submission of the same job twice with `setSharedVirtualEnv(task, REQUIREMENTS, basepath=BASEPATH)` from the 'demo_venv_cache' module, which sets the scripts/venv_cache.groovy fork environment script. This script:
+   - computes a key from the hash of the requirements, of the Python version and of the platform of the node;
+   - uses "<BASEPATH>/<key>/env" right away if it is ready, without lock and without pip;
+   - otherwise lets a single task, across all the nodes, build it under a lock directory on the shared storage, while the other tasks wait for it;
+   - removes the environments unused for a long time, or beyond a maximum number of environments.
+   On the first run of the demo, the first job builds the environment (cold build) and the second one only gets cache hits.
+4. Display of the duration of each job and of the time each task spent getting its environment, by state ("built", "waited for the builder" or "cache hit").
+5. Disconnection from the gateway.
+"""
+import re
+import time
+
+from collections import defaultdict
+from proactive import getProActiveGateway
+from demo_venv_cache.venv_cache import setSharedVirtualEnv
+
+REQUIREMENTS = ['requests==2.26.0', 'pandas']
+
+# Shared directory of the environments, reachable from all the nodes
+BASEPATH = "/shared/venvs"
+
+# Number of parallel tasks of each job
+NUMBER_OF_TASKS = 8
+
+TASK_IMPLEMENTATION = """
+import sys
+import pandas, requests
+print("Python:", sys.executable, "pandas", pandas.__version__, "requests", requests.__version__)
+"""
+
+def create_job(gateway, name, shared):
+    job = gateway.createJob(name)
+    for i in range(NUMBER_OF_TASKS):
+        task = gateway.createPythonTask(f"venv_task_{i}")
+        task.setTaskImplementation(TASK_IMPLEMENTATION)
+        if shared:
+            setSharedVirtualEnv(task, REQUIREMENTS, basepath=BASEPATH)
+        else:
+            task.setVirtualEnv(requirements=REQUIREMENTS)
+        job.addTask(task)
+    return job
+
+def run_job(gateway, job):
+    start = time.monotonic()
+    job_id = gateway.submitJob(job)
+    output = gateway.getJobOutput(job_id)
+    return time.monotonic() - start, str(output)
+
+def environment_times(output):
+    """Return the times reported by the venv_cache.groovy script in a job output, by state."""
+    times = defaultdict(list)
+    for state, seconds in re.findall(r"Virtual environment \w+ \([^)]*\): (.+?) in ([\d.]+) s", output):
+        times[state].append(float(seconds))
+    return times
+
+# Initialize the ProActive gateway
+gateway = getProActiveGateway()
+
+try:
+    print(f"Running jobs of {NUMBER_OF_TASKS} tasks requiring {' '.join(REQUIREMENTS)}...")
+    results = [("setVirtualEnv()", *run_job(gateway, create_job(gateway, "demo_venv_local_job", shared=False)))]
+    for label in ["Shared cache, first job", "Shared cache, second job"]:
+        results.append((label, *run_job(gateway, create_job(gateway, "demo_venv_cache_job", shared=True))))
+
+    print(f"\n{'Job':<26} {'Duration':>9}   Environment times per task")
+    print("-" * 80)
+    for label, duration, output in results:
+        times = environment_times(output)
+        details = ", ".join(f"{len(values)} {state} (avg {sum(values) / len(values):.1f} s, max {max(values):.1f} s)"
+                            for state, values in times.items())
+        print(f"{label:<26} {duration:8.1f}s   {details or '-'}")
+
+except Exception as e:
+    print(f"Error during the virtualenv cache demo: {e}")
+finally:
+    gateway.close()
+    print("Disconnected and finished.")
@@ -0,0 +1,58 @@
+# venv_cache.py
+"""
+Virtual environments shared by the tasks through a cache on shared storage.
+
+setSharedVirtualEnv() is the counterpart of task.setVirtualEnv(): instead of creating or updating
+an environment at a fixed location, the scripts/venv_cache.groovy fork environment script looks
+the environment up by the hash of the requirements, of the Python version and of the platform of
+the node. It builds the environment once per key under a lock shared by all the nodes, and links
+it into the local space of the task.
+"""
+import os
+
+from proactive import ProactiveForkEnv, ProactiveScriptLanguage
+
+CACHE_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "venv_cache.groovy")
+
+# Shared directory of the environments
+DEFAULT_BASEPATH = "/shared/venvs"
+
+
+def canonical_requirements(requirements):
+    """Return the requirements without blanks, deduplicated and sorted, so that equivalent lists share a key."""
+    return sorted(set("".join(requirement.split()) for requirement in requirements if requirement.strip()))
+
+
+def setSharedVirtualEnv(task, requirements, basepath=DEFAULT_BASEPATH, name="venv", python="python3",
+                        max_idle_days=None, max_envs=None):
+    """
+    Make a Python task run in a virtual environment from the shared cache.
+
+    Args:
+        task: A task created with gateway.createPythonTask()
+        requirements (list): Python packages to install in the environment
+        basepath (str): Shared directory of the environments, on storage reachable from all the nodes
+        name (str): Name of the link to the environment in the local space of the task
+        python (str): Python command used to create the environment
+        max_idle_days (int): Environments unused for longer are removed (default of the script: 30)
+        max_envs (int): Maximum number of environments kept (default of the script: 20)
+    """
+    task.addVariable("VENV_CACHE_REQUIREMENTS", " ".join(canonical_requirements(requirements)))
+    task.addVariable("VENV_CACHE_BASEPATH", basepath)
+    task.addVariable("VENV_CACHE_NAME", name)
+    task.addVariable("VENV_CACHE_PYTHON", python)
+    if max_idle_days is not None:
+        task.addVariable("VENV_CACHE_MAX_IDLE_DAYS", str(max_idle_days))
+    if max_envs is not None:
+        task.addVariable("VENV_CACHE_MAX_ENVS", str(max_envs))
+
+    with open(CACHE_SCRIPT) as f:
+        cache_script = f.read()
+    fork_env = task.getForkEnvironment()
+    if fork_env is None:
+        fork_env = ProactiveForkEnv(ProactiveScriptLanguage().groovy())
+        fork_env.setImplementation(cache_script)
+    else:
+        fork_env.setImplementation(fork_env.getImplementation() + "\n" + cache_script)
+    task.setForkEnvironment(fork_env)
+    task.setDefaultPython(f"./{name}/bin/python")
@@ -0,0 +1,131 @@
+/*
+This script makes Python packages available to a task from a content-addressed cache in the node cache space,
+the same cachespace that fork_env.groovy mounts in the containers.
+
+Each package is a zip archive stored in the user space under "package_store/<sha256>.zip" (see demo_package_cache.py).
+It is pulled and extracted into "<cachespace>/packages/<sha256>" only if this directory does not exist yet,
+and the extracted directories are added to the PYTHONPATH of the task. When the size of the cache goes over the cap,
+the least recently used packages which have not been used for PACKAGE_CACHE_MIN_IDLE_SECONDS are removed.
+The last use of a package is the modification time of its directory, set by each task using it. An evicted package
+is first renamed, so that the other tasks never see a partially removed package.
+
+It only uses fully qualified class names, so that it can be appended to another fork environment script.
+
+Variables:
+- PACKAGE_CACHE_PACKAGES: comma-separated list of <name>=<sha256> entries
+- PACKAGE_CACHE_MAX_SIZE_MB: size cap of the cache (default=1024)
+- PACKAGE_CACHE_MIN_IDLE_SECONDS: packages used more recently than this are never evicted (default=600)
+*/
+
+def PACKAGE_CACHE_PACKAGES = variables.get("PACKAGE_CACHE_PACKAGES") ?: ""
+def PACKAGE_CACHE_MAX_SIZE_MB = (variables.get("PACKAGE_CACHE_MAX_SIZE_MB") ?: "1024").toLong()
+def PACKAGE_CACHE_MIN_IDLE_SECONDS = (variables.get("PACKAGE_CACHE_MIN_IDLE_SECONDS") ?: "600").toLong()
+
+def packagesDir = new File(cachespace, "packages")
+packagesDir.mkdirs()
+
+// Runs a closure while holding an exclusive lock on a file of the cache
+def withLock = { String name, Closure action ->
+    def channel = java.nio.channels.FileChannel.open(new File(packagesDir, name).toPath(),
+        java.nio.file.StandardOpenOption.CREATE, java.nio.file.StandardOpenOption.WRITE)
+    try {
+        def lock = channel.lock()
+        try {
+            return action()
+        } finally {
+            lock.release()
+        }
+    } finally {
+        channel.close()
+    }
+}
+
+def sha256 = { File file ->
+    def digest = java.security.MessageDigest.getInstance("SHA-256")
+    file.eachByte(1 << 20) { buffer, length -> digest.update(buffer, 0, length) }
+    digest.digest().encodeHex().toString()
+}
+
+def extract = { File archive, File target ->
+    long size = 0
+    new java.util.zip.ZipInputStream(new FileInputStream(archive)).withCloseable { zip ->
+        def entry
+        while ((entry = zip.nextEntry) != null) {
+            def file = new File(target, entry.name)
+            if (!file.canonicalPath.startsWith(target.canonicalPath + File.separator)) {
+                throw new IllegalStateException("Invalid entry in " + archive + ": " + entry.name)
+            }
+            if (entry.isDirectory()) {
+                file.mkdirs()
+            } else {
+                file.parentFile.mkdirs()
+                file.withOutputStream { it << zip }
+                size += file.length()
+            }
+        }
+    }
+    return size
+}
+
+def paths = []
+def hits = 0, misses = 0
+for (entry in PACKAGE_CACHE_PACKAGES.tokenize(",")) {
+    def (name, digest) = entry.tokenize("=")
+    def packageDir = new File(packagesDir, digest)
+    def hit = packageDir.isDirectory() || withLock(digest + ".lock") {
+        if (packageDir.isDirectory()) {
+            return true
+        }
+        def archive = new File(packagesDir, digest + "." + UUID.randomUUID() + ".zip")
+        def staging = new File(packagesDir, digest + "." + UUID.randomUUID() + ".tmp")
+        try {
+            userspaceapi.connect()
+            userspaceapi.pullFile("package_store/" + digest + ".zip", archive)
+            if (sha256(archive) != digest) {
+                throw new IllegalStateException("Corrupted package " + name + ": " + digest)
+            }
+            staging.mkdirs()
+            new File(staging, ".size").text = String.valueOf(extract(archive, staging))
+            java.nio.file.Files.move(staging.toPath(), packageDir.toPath(), java.nio.file.StandardCopyOption.ATOMIC_MOVE)
+        } finally {
+            archive.delete()
+            staging.deleteDir()
+        }
+        return false
+    }
+    if (hit) {
+        hits++
+    } else {
+        misses++
+    }
+    packageDir.setLastModified(System.currentTimeMillis())
+    paths << packageDir.absolutePath
+    println "Package " + name + " (" + digest.take(12) + "): " + (hit ? "cache hit" : "downloaded")
+}
+
+// Least recently used eviction under the size cap
+withLock(".evict.lock") {
+    def now = System.currentTimeMillis()
+    def entries = packagesDir.listFiles().findAll { it.isDirectory() && it.name ==~ /[0-9a-f]{64}/ }.collect { dir ->
+        [dir: dir, size: new File(dir, ".size").text.toLong(), lastUsed: dir.lastModified()]
+    }
+    long total = entries.sum { it.size } ?: 0L
+    for (candidate in entries.sort { it.lastUsed }) {
+        if (total <= PACKAGE_CACHE_MAX_SIZE_MB * 1024 * 1024) {
+            break
+        }
+        if (paths.contains(candidate.dir.absolutePath) || now - candidate.lastUsed < PACKAGE_CACHE_MIN_IDLE_SECONDS * 1000) {
+            continue
+        }
+        def trash = new File(packagesDir, candidate.dir.name + ".trash-" + UUID.randomUUID())
+        if (candidate.dir.renameTo(trash)) {
+            println "Evicting package " + candidate.dir.name + " (" + candidate.size + " bytes)"
+            trash.deleteDir()
+            total -= candidate.size
+        }
+    }
+}
+
+def pythonPath = (paths + [System.getenv("PYTHONPATH")]).findAll { it }.join(File.pathSeparator)
+forkEnvironment.addSystemEnvironmentVariable("PYTHONPATH", pythonPath)
+println "Package cache: " + hits + " hits, " + misses + " misses, PYTHONPATH=" + pythonPath
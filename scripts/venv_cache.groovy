@@ -0,0 +1,191 @@
+/*
+This script gives a Python task a virtual environment from a cache on shared storage, keyed by the hash of its
+requirements, of the Python version and of the platform of the node.
+
+Each environment is built exactly once per key, in "<VENV_CACHE_BASEPATH>/<key>/env":
+- if "<key>/READY" exists, the environment is used right away, without any lock and without running pip;
+- otherwise, the first task to create the "<key>.lock" directory (an atomic operation, also on NFS) builds the
+  environment and then creates "READY", while the other tasks, on this node or on other nodes, wait for it.
+  The builder refreshes the lock every 30 seconds; a lock not refreshed for VENV_CACHE_LOCK_TIMEOUT_SECONDS
+  is considered abandoned, and taken over. The lock holds an "owner" file with a token of its builder: a lock is
+  only removed by a task which read the same token, and a builder whose lock was taken over neither removes the
+  new lock nor creates "READY".
+The environment is linked as "<localspace>/<VENV_CACHE_NAME>", so that the task runs "./<VENV_CACHE_NAME>/bin/python"
+(see demo_venv_cache.py).
+
+At most once per hour, the environments not used for VENV_CACHE_MAX_IDLE_DAYS are removed, as well as the least
+recently used ones beyond VENV_CACHE_MAX_ENVS. The last use of an environment is the modification time of
+"<VENV_CACHE_BASEPATH>/<key>", set by each task using it.
+
+It only uses fully qualified class names, so that it can be appended to another fork environment script.
+
+Variables:
+- VENV_CACHE_REQUIREMENTS: space-separated list of requirements
+- VENV_CACHE_BASEPATH: shared directory of the environments (default=/shared/venvs)
+- VENV_CACHE_NAME: name of the link in the local space (default=venv)
+- VENV_CACHE_PYTHON: Python command used to create the environments (default=python3)
+- VENV_CACHE_LOCK_TIMEOUT_SECONDS: age of an abandoned lock (default=600)
+- VENV_CACHE_MAX_IDLE_DAYS: environments unused for longer are removed (default=30)
+- VENV_CACHE_MAX_ENVS: maximum number of environments kept (default=20)
+*/
+
+def VENV_CACHE_REQUIREMENTS = variables.get("VENV_CACHE_REQUIREMENTS") ?: ""
+def VENV_CACHE_BASEPATH = variables.get("VENV_CACHE_BASEPATH") ?: "/shared/venvs"
+def VENV_CACHE_NAME = variables.get("VENV_CACHE_NAME") ?: "venv"
+def VENV_CACHE_PYTHON = variables.get("VENV_CACHE_PYTHON") ?: "python3"
+def VENV_CACHE_LOCK_TIMEOUT_SECONDS = (variables.get("VENV_CACHE_LOCK_TIMEOUT_SECONDS") ?: "600").toLong()
+def VENV_CACHE_MAX_IDLE_DAYS = (variables.get("VENV_CACHE_MAX_IDLE_DAYS") ?: "30").toLong()
+def VENV_CACHE_MAX_ENVS = (variables.get("VENV_CACHE_MAX_ENVS") ?: "20").toInteger()
+
+def venvStart = System.currentTimeMillis()
+def baseDir = new File(VENV_CACHE_BASEPATH)
+baseDir.mkdirs()
+
+def runCommand = { List command, File log ->
+    def process = new ProcessBuilder(command.collect { it.toString() })
+        .redirectErrorStream(true)
+        .redirectOutput(ProcessBuilder.Redirect.appendTo(log))
+        .start()
+    if (process.waitFor() != 0) {
+        throw new IllegalStateException("Command " + command.join(" ") + " failed, see " + log)
+    }
+}
+
+// Key of the environment
+def pythonTag = [VENV_CACHE_PYTHON, "-c",
+    "import sys, sysconfig; print('%s-%d.%d-%s' % (sys.implementation.name, sys.version_info[0], sys.version_info[1], sysconfig.get_platform()))"
+].execute().text.trim()
+if (!pythonTag) {
+    throw new IllegalStateException("Cannot run " + VENV_CACHE_PYTHON)
+}
+def venvRequirements = VENV_CACHE_REQUIREMENTS.tokenize(" ").unique().sort()
+def keyDigest = java.security.MessageDigest.getInstance("SHA-256")
+keyDigest.update((venvRequirements.join("\n") + "\n" + pythonTag).getBytes("UTF-8"))
+def key = keyDigest.digest().encodeHex().toString().take(16)
+
+def envRoot = new File(baseDir, key)
+def envDir = new File(envRoot, "env")
+def ready = new File(envRoot, "READY")
+def lockDir = new File(baseDir, key + ".lock")
+
+def removeDirectory = { File directory ->
+    def trash = new File(baseDir, directory.name + ".trash-" + UUID.randomUUID())
+    if (directory.renameTo(trash)) {
+        trash.deleteDir()
+    }
+}
+
+// Token of the builder holding a lock directory, or "" if it has none
+def lockOwner = { File directory ->
+    try {
+        return new File(directory, "owner").text
+    } catch (IOException e) {
+        return ""
+    }
+}
+
+// Removes the lock directory if it is still held by the given owner
+def releaseLock = { String owner ->
+    if (lockOwner(lockDir) != owner) {
+        return
+    }
+    def trash = new File(baseDir, lockDir.name + ".trash-" + UUID.randomUUID())
+    if (lockDir.renameTo(trash)) {
+        if (lockOwner(trash) != owner) {
+            trash.renameTo(lockDir) // lock taken over in the meantime, give it back
+        }
+        trash.deleteDir()
+    }
+}
+
+def lockToken = UUID.randomUUID().toString()
+def ownsLock = { lockOwner(lockDir) == lockToken }
+
+// Single builder per key, the other tasks wait for the READY file
+def venvState = "cache hit"
+while (!ready.exists()) {
+    if (lockDir.mkdir()) {
+        def ownerTemp = new File(lockDir, "owner." + lockToken)
+        ownerTemp.text = lockToken
+        java.nio.file.Files.move(ownerTemp.toPath(), new File(lockDir, "owner").toPath(), java.nio.file.StandardCopyOption.ATOMIC_MOVE)
+        def heartbeat = new Thread({
+            try {
+                while (ownsLock()) {
+                    lockDir.setLastModified(System.currentTimeMillis())
+                    Thread.sleep(30000)
+                }
+            } catch (InterruptedException e) {
+                // build finished
+            }
+        })
+        heartbeat.setDaemon(true)
+        heartbeat.start()
+        try {
+            if (!ready.exists()) {
+                venvState = "built"
+                envDir.deleteDir() // partial environment of a failed builder
+                envRoot.mkdirs()
+                def log = new File(envRoot, "build.log")
+                log.text = "Building " + venvRequirements.join(" ") + " for " + pythonTag + " on " + InetAddress.localHost.hostName + "\n"
+                runCommand([VENV_CACHE_PYTHON, "-m", "venv", envDir.path], log)
+                runCommand([new File(envDir, "bin/python").path, "-m", "pip", "install", "py4j"] + venvRequirements, log)
+                new File(envRoot, "requirements.txt").text = venvRequirements.join("\n") + "\n"
+                if (ownsLock()) {
+                    def readyTemp = new File(envRoot, "READY." + UUID.randomUUID())
+                    readyTemp.text = pythonTag
+                    java.nio.file.Files.move(readyTemp.toPath(), ready.toPath(), java.nio.file.StandardCopyOption.ATOMIC_MOVE)
+                } else {
+                    println "The lock " + lockDir + " was taken over, waiting for the new builder"
+                    venvState = "waited for the builder"
+                }
+            }
+        } finally {
+            heartbeat.interrupt()
+            releaseLock(lockToken)
+        }
+    } else {
+        if (venvState == "cache hit") {
+            venvState = "waited for the builder"
+        }
+        def owner = lockOwner(lockDir)
+        if (lockDir.exists() && System.currentTimeMillis() - lockDir.lastModified() > VENV_CACHE_LOCK_TIMEOUT_SECONDS * 1000) {
+            println "Taking over the abandoned lock " + lockDir
+            releaseLock(owner)
+        } else {
+            Thread.sleep(2000)
+        }
+    }
+}
+envRoot.setLastModified(System.currentTimeMillis())
+
+def link = new File(localspace, VENV_CACHE_NAME).toPath()
+java.nio.file.Files.deleteIfExists(link)
+java.nio.file.Files.createSymbolicLink(link, envDir.toPath())
+println "Virtual environment " + key + " (" + pythonTag + "): " + venvState + " in " + (System.currentTimeMillis() - venvStart) / 1000.0 + " s"
+
+// Garbage collection of the unused environments, at most once per hour
+def gcMarker = new File(baseDir, ".gc")
+def gcLock = new File(baseDir, ".gc.lock")
+if (gcLock.exists() && System.currentTimeMillis() - gcLock.lastModified() > 3600 * 1000) {
+    gcLock.deleteDir() // lock of an interrupted garbage collection
+}
+if (System.currentTimeMillis() - gcMarker.lastModified() > 3600 * 1000 && gcLock.mkdir()) {
+    try {
+        def now = System.currentTimeMillis()
+        def environments = baseDir.listFiles().findAll { new File(it, "READY").exists() }.collect { dir ->
+            [dir: dir, lastUsed: dir.lastModified()]
+        }.sort { -it.lastUsed }
+        environments.eachWithIndex { environment, index ->
+            def idle = now - environment.lastUsed
+            def expired = idle > VENV_CACHE_MAX_IDLE_DAYS * 24 * 3600 * 1000
+            def extra = index >= VENV_CACHE_MAX_ENVS && idle > 3600 * 1000
+            if (environment.dir.name != key && (expired || extra)) {
+                println "Removing the unused virtual environment " + environment.dir.name
+                removeDirectory(environment.dir)
+            }
+        }
+        gcMarker.text = String.valueOf(now)
+    } finally {
+        gcLock.deleteDir()
+    }
+}